@@ -5,6 +5,14 @@ from sqlalchemy import pool
 
 from alembic import context
 
+from app.core.config import settings
+from app.db.base import Base
+from app.models import (  # noqa: F401  (registers every table on Base.metadata)
+    address, attributes, cache_version, cart, categories, email_outbox, inquiry,
+    order_stats, orders, otp_verification, payment, product, services,
+    stock_reservation, sub_categories, users,
+)
+
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
 config = context.config
@@ -14,11 +22,14 @@ config = context.config
 if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
+# the database URL comes from the same settings the app uses
+config.set_main_option("sqlalchemy.url", settings.DATABASE_URL.replace("%", "%%"))
+
 # add your model's MetaData object here
 # for 'autogenerate' support
 # from myapp import mymodel
 # target_metadata = mymodel.Base.metadata
-target_metadata = None
+target_metadata = Base.metadata
 
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
@@ -0,0 +1,44 @@
+"""inventory product index
+
+Indexes inventory.product_id, joined by the single-query product detail.
+
+Revision ID: 0f76fcdf5361
+Revises: 0fde8791eaa4
+Create Date: 2026-10-18 13:09:07.359684
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0f76fcdf5361'
+down_revision: Union[str, Sequence[str], None] = '0fde8791eaa4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_inventory_product_id",
+            "inventory",
+            ["product_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_inventory_product_id",
+            table_name="inventory",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
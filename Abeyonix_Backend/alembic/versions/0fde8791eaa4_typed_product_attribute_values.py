@@ -0,0 +1,102 @@
+"""typed product attribute values
+
+Adds numeric / boolean / normalized text columns to
+product_attribute_values, backfills them from `value` by the attribute's
+data_type and indexes each one with attribute_id for shop filters.
+
+Revision ID: 0fde8791eaa4
+Revises: 7bc6365e0d75
+Create Date: 2026-10-18 13:07:19.072317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0fde8791eaa4'
+down_revision: Union[str, Sequence[str], None] = '7bc6365e0d75'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+
+# Mirrors app.services.attribute_values.typed_values
+BACKFILL_SQL = """
+UPDATE product_attribute_values v SET
+    numeric_value = CASE
+        -- numeric(18, 6) holds 12 integer digits; larger numbers (barcodes,
+        -- serials) stay text only, like NUMERIC_VALUE_LIMIT at runtime
+        WHEN lower(a.data_type) = 'number'
+         AND abs(round(substring(v.value FROM '^\\s*(-?[0-9]+(?:\\.[0-9]+)?)')::numeric, 6)) < 1e12
+        THEN substring(v.value FROM '^\\s*(-?[0-9]+(?:\\.[0-9]+)?)')::numeric(18, 6)
+    END,
+    boolean_value = CASE
+        WHEN lower(a.data_type) = 'boolean' AND lower(trim(v.value)) IN ('true', 'yes', 'y', '1') THEN true
+        WHEN lower(a.data_type) = 'boolean' AND lower(trim(v.value)) IN ('false', 'no', 'n', '0') THEN false
+    END,
+    text_value = left(lower(trim(v.value)), 255)
+FROM attributes a
+WHERE a.id = v.attribute_id
+"""
+
+COLUMNS = [
+    sa.Column("numeric_value", sa.Numeric(18, 6), nullable=True),
+    sa.Column("boolean_value", sa.Boolean(), nullable=True),
+    sa.Column("text_value", sa.String(255), nullable=True),
+]
+
+INDEXES = [
+    ("idx_pav_attribute_numeric", ["attribute_id", "numeric_value"]),
+    ("idx_pav_attribute_text", ["attribute_id", "text_value"]),
+    ("idx_pav_attribute_boolean", ["attribute_id", "boolean_value"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for column in COLUMNS:
+        op.add_column("product_attribute_values", column.copy(), if_not_exists=True)
+
+    op.execute(BACKFILL_SQL)
+
+    with op.get_context().autocommit_block():
+        # superseded by idx_pav_attribute_text
+        op.drop_index(
+            "idx_pav_attribute_value",
+            table_name="product_attribute_values",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        for name, columns in INDEXES:
+            op.create_index(
+                name,
+                "product_attribute_values",
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name="product_attribute_values",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
+        op.create_index(
+            "idx_pav_attribute_value",
+            "product_attribute_values",
+            ["attribute_id", "value"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+    for column in reversed(COLUMNS):
+        op.drop_column("product_attribute_values", column.name, if_exists=True)
@@ -0,0 +1,61 @@
+"""email outbox
+
+Mail queued in the same transaction as the change it announces, sent
+by the email dispatcher. The partial index finds due PENDING rows.
+
+Revision ID: 25dc3794ce03
+Revises: 336455f0b8b5
+Create Date: 2026-10-18 13:37:36.298169
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '25dc3794ce03'
+down_revision: Union[str, Sequence[str], None] = '336455f0b8b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE SEQUENCE IF NOT EXISTS email_outbox_id_seq")
+
+    op.create_table(
+        "email_outbox",
+        sa.Column(
+            "id",
+            sa.BigInteger(),
+            sa.Sequence("email_outbox_id_seq"),
+            server_default=sa.text("nextval('email_outbox_id_seq')"),
+            primary_key=True,
+        ),
+        sa.Column("to_email", sa.String(255), nullable=False),
+        sa.Column("subject", sa.String(300), nullable=False),
+        sa.Column("html_content", sa.Text(), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("attempts", sa.Integer(), nullable=False),
+        sa.Column("last_error", sa.String(500), nullable=True),
+        sa.Column("next_attempt_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+        if_not_exists=True,
+    )
+
+    op.create_index(
+        "idx_email_outbox_pending_next_attempt",
+        "email_outbox",
+        ["next_attempt_at"],
+        postgresql_where=sa.text("status = 'PENDING'"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("email_outbox", if_exists=True)
+    op.execute("DROP SEQUENCE IF EXISTS email_outbox_id_seq")
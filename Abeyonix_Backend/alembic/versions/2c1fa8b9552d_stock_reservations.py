@@ -0,0 +1,65 @@
+"""stock reservations
+
+Adds stock_reservations: stock held per payment session during the
+PhonePe payment window, with partial indexes over active (HELD) holds.
+
+Revision ID: 2c1fa8b9552d
+Revises: 0f76fcdf5361
+Create Date: 2026-10-18 13:15:09.606293
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c1fa8b9552d'
+down_revision: Union[str, Sequence[str], None] = '0f76fcdf5361'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "stock_reservations",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=False),
+        sa.Column("product_id", sa.BigInteger(), sa.ForeignKey("products.id"), nullable=False),
+        sa.Column("payment_session_id", sa.BigInteger(), sa.ForeignKey("payment_sessions.id"), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+        if_not_exists=True,
+    )
+
+    op.create_index(
+        "ix_stock_reservations_payment_session_id",
+        "stock_reservations",
+        ["payment_session_id"],
+        if_not_exists=True,
+    )
+    op.create_index(
+        "idx_stock_reservation_held_product",
+        "stock_reservations",
+        ["product_id", "expires_at"],
+        postgresql_include=["quantity"],
+        postgresql_where=sa.text("status = 'HELD'"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "idx_stock_reservation_held_expires",
+        "stock_reservations",
+        ["expires_at"],
+        postgresql_where=sa.text("status = 'HELD'"),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("stock_reservations", if_exists=True)
@@ -0,0 +1,47 @@
+"""order row id sequences
+
+order_items, order_tracking and payments take their ids from sequences
+instead of the app, so order rows can be bulk inserted with RETURNING.
+Each sequence starts after the highest existing id.
+
+Revision ID: 2fa21bbe0ef4
+Revises: 5f7fe360246f
+Create Date: 2026-10-18 13:22:29.339759
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2fa21bbe0ef4'
+down_revision: Union[str, Sequence[str], None] = '5f7fe360246f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEQUENCES = (
+    ("order_items", "order_items_id_seq"),
+    ("order_tracking", "order_tracking_id_seq"),
+    ("payments", "payments_id_seq"),
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table, sequence in SEQUENCES:
+        op.execute(f"CREATE SEQUENCE IF NOT EXISTS {sequence}")
+        op.execute(
+            f"SELECT setval('{sequence}', COALESCE((SELECT MAX(id) FROM {table}), 0) + 1, false)"
+        )
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{sequence}')")
+        op.execute(f"ALTER SEQUENCE {sequence} OWNED BY {table}.id")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, sequence in SEQUENCES:
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN id DROP DEFAULT")
+        op.execute(f"DROP SEQUENCE IF EXISTS {sequence}")
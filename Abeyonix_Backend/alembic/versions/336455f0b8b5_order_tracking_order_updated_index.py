@@ -0,0 +1,57 @@
+"""order tracking order updated index
+
+Reads one order's tracking timeline in order straight from the index.
+It replaces the single-column order_id index, which it covers.
+
+Revision ID: 336455f0b8b5
+Revises: c15814d7840b
+Create Date: 2026-10-18 13:34:50.068608
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '336455f0b8b5'
+down_revision: Union[str, Sequence[str], None] = 'c15814d7840b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_order_tracking_order_updated",
+            "order_tracking",
+            ["order_id", "updated_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "ix_order_tracking_order_id",
+            table_name="order_tracking",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_order_tracking_order_id",
+            "order_tracking",
+            ["order_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            "idx_order_tracking_order_updated",
+            table_name="order_tracking",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
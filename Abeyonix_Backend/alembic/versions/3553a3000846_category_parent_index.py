@@ -0,0 +1,44 @@
+"""category parent index
+
+Indexes categories.parent_id for the recursive subtree lookup in
+Category.subtree_ids.
+
+Revision ID: 3553a3000846
+Revises: e74063d7b196
+Create Date: 2026-10-18 13:01:33.300353
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3553a3000846'
+down_revision: Union[str, Sequence[str], None] = 'e74063d7b196'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_categories_parent_id",
+            "categories",
+            ["parent_id"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_categories_parent_id",
+            table_name="categories",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
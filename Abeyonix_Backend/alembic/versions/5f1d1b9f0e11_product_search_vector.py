@@ -0,0 +1,90 @@
+"""product search vector
+
+Adds products.search_vector (weighted tsvector over name, brand, category
+names, short description and attribute values), backfills it, and builds
+the GIN full-text and pg_trgm name indexes used by product search.
+
+Revision ID: 5f1d1b9f0e11
+Revises: 3553a3000846
+Create Date: 2026-10-18 13:03:07.587677
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f1d1b9f0e11'
+down_revision: Union[str, Sequence[str], None] = '3553a3000846'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Mirrors app.services.product_search._search_document
+BACKFILL_SQL = """
+UPDATE products p SET search_vector =
+    setweight(to_tsvector('simple', coalesce(p.name, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(p.brand, '')), 'B') ||
+    setweight(to_tsvector('simple', concat_ws(' ',
+        (SELECT c.name FROM categories c WHERE c.id = p.category_id),
+        (SELECT sc.name FROM sub_categories sc WHERE sc.id = p.sub_category_id)
+    )), 'C') ||
+    setweight(to_tsvector('simple', concat_ws(' ',
+        p.short_description,
+        (SELECT string_agg(v.value, ' ') FROM product_attribute_values v
+         WHERE v.product_id = p.id)
+    )), 'D')
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.add_column(
+        "products",
+        sa.Column("search_vector", postgresql.TSVECTOR(), nullable=True),
+        if_not_exists=True,
+    )
+    op.execute(BACKFILL_SQL)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_product_search_vector",
+            "products",
+            ["search_vector"],
+            postgresql_using="gin",
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "idx_product_name_trgm",
+            "products",
+            ["name"],
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_product_name_trgm",
+            table_name="products",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "idx_product_search_vector",
+            table_name="products",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+    op.drop_column("products", "search_vector", if_exists=True)
@@ -0,0 +1,44 @@
+"""payment session status index
+
+Lets the reconciliation worker find stale INITIATED payment sessions,
+oldest first, without scanning the table.
+
+Revision ID: 5f7fe360246f
+Revises: fec3a1fabd1c
+Create Date: 2026-10-18 13:19:23.786600
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5f7fe360246f'
+down_revision: Union[str, Sequence[str], None] = 'fec3a1fabd1c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_payment_session_status_created",
+            "payment_sessions",
+            ["status", "created_at"],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_payment_session_status_created",
+            table_name="payment_sessions",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,44 @@
+"""orders user created index
+
+Serves the keyset-paginated user order history: one user's orders,
+newest first, on (created_at, id).
+
+Revision ID: 77b1c2e502ca
+Revises: 2fa21bbe0ef4
+Create Date: 2026-10-18 13:28:27.650759
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '77b1c2e502ca'
+down_revision: Union[str, Sequence[str], None] = '2fa21bbe0ef4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "idx_orders_user_created",
+            "orders",
+            ["user_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_orders_user_created",
+            table_name="orders",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
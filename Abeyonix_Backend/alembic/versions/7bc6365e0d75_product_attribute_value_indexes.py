@@ -0,0 +1,52 @@
+"""product attribute value indexes
+
+Indexes product_attribute_values for shop attribute filters and facet
+counts.
+
+Revision ID: 7bc6365e0d75
+Revises: 5f1d1b9f0e11
+Create Date: 2026-10-18 13:05:32.927034
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7bc6365e0d75'
+down_revision: Union[str, Sequence[str], None] = '5f1d1b9f0e11'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ("idx_pav_product_id", "product_attribute_values", ["product_id"]),
+    ("idx_pav_attribute_value", "product_attribute_values", ["attribute_id", "value"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
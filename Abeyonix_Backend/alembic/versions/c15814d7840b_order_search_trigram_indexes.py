@@ -0,0 +1,71 @@
+"""order search trigram indexes
+
+GIN trigram indexes behind the admin order search: order number,
+customer email and full name, product name and SKU of the order items.
+Each one lets a substring ILIKE skip the sequential scan.
+
+Revision ID: c15814d7840b
+Revises: 13d2f7a9897f
+Create Date: 2026-10-18 13:32:08.134135
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c15814d7840b'
+down_revision: Union[str, Sequence[str], None] = '13d2f7a9897f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TRGM_INDEXES = [
+    ("idx_order_number_trgm", "orders", "order_number"),
+    ("idx_order_item_product_name_trgm", "order_items", "product_name"),
+    ("idx_order_item_sku_trgm", "order_items", "sku"),
+    ("idx_user_email_trgm", "users", "email"),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    with op.get_context().autocommit_block():
+        for name, table, column in TRGM_INDEXES:
+            op.create_index(
+                name,
+                table,
+                [column],
+                postgresql_using="gin",
+                postgresql_ops={column: "gin_trgm_ops"},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+        op.execute(
+            "CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_full_name_trgm "
+            "ON users USING gin ((first_name || ' ' || last_name) gin_trgm_ops)"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "idx_user_full_name_trgm",
+            table_name="users",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+        for name, table, _ in reversed(TRGM_INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
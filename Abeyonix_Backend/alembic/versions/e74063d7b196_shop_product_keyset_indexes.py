@@ -0,0 +1,55 @@
+"""shop product keyset indexes
+
+Composite indexes behind the keyset-paginated /shop/products listing.
+Tables are still created by Base.metadata.create_all, so indexes are
+created with IF NOT EXISTS, and CONCURRENTLY so live tables stay writable.
+
+Revision ID: e74063d7b196
+Revises:
+Create Date: 2026-10-18 12:58:38.020532
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e74063d7b196'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = [
+    ("idx_product_active_id", "products", ["is_active", "id"]),
+    ("idx_product_active_category_id", "products", ["is_active", "category_id", "id"]),
+    ("idx_product_active_sub_category_id", "products", ["is_active", "sub_category_id", "id"]),
+    ("idx_pricing_product_id", "pricing", ["product_id"]),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,42 @@
+"""payment session callback result
+
+Stores the outcome of the first payment callback on payment_sessions so
+gateway retries get the same answer without creating another order.
+
+Revision ID: fec3a1fabd1c
+Revises: 2c1fa8b9552d
+Create Date: 2026-10-18 13:16:16.095796
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'fec3a1fabd1c'
+down_revision: Union[str, Sequence[str], None] = '2c1fa8b9552d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "payment_sessions",
+        sa.Column("callback_result", sa.JSON(), nullable=True),
+        if_not_exists=True,
+    )
+    op.add_column(
+        "payment_sessions",
+        sa.Column("processed_at", sa.DateTime(timezone=True), nullable=True),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("payment_sessions", "processed_at", if_exists=True)
+    op.drop_column("payment_sessions", "callback_result", if_exists=True)
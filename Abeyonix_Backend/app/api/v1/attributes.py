@@ -5,6 +5,8 @@ from typing import List,Optional
 from app.db.base import Base
 from app.db.session import get_db  # Your DB session dependency
 from app.models.attributes import Attribute, CategoryAttribute
+from app.models.categories import Category
+from app.services.attribute_values import retype_attribute_values
 from app.schemas.attributes import (
     AttributeCreate,
     AttributeUpdate,
@@ -49,9 +51,18 @@ def update_attribute(attribute_id: int, payload: AttributeUpdate, db: Session =
     if not attribute:
         raise HTTPException(status_code=404, detail="Attribute not found")
     
-    for key, value in payload.model_dump(exclude_unset=True).items():
+    changes = payload.model_dump(exclude_unset=True)
+    data_type_changed = (
+        "data_type" in changes and changes["data_type"] != attribute.data_type
+    )
+
+    for key, value in changes.items():
         setattr(attribute, key, value)
 
+    # ✅ Keep typed value columns in line with the new data type
+    if data_type_changed:
+        retype_attribute_values(db, attribute)
+
     db.commit()
     db.refresh(attribute)
     return attribute
@@ -99,6 +110,7 @@ def create_category_attribute(
 def get_category_attributes(
     category_id: Optional[int] = FastQuery(None),
     sub_category_id: Optional[int] = FastQuery(None),
+    include_descendants: bool = FastQuery(False),
     db: Session = Depends(get_db)
 ):
     query = (
@@ -111,7 +123,11 @@ def get_category_attributes(
     )
 
     # ✅ Apply filters dynamically
-    if category_id:
+    if category_id and include_descendants:
+        query = query.filter(
+            CategoryAttribute.category_id.in_(Category.subtree_ids(category_id))
+        )
+    elif category_id:
         query = query.filter(CategoryAttribute.category_id == category_id)
 
     if sub_category_id:
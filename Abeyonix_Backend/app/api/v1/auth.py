@@ -7,7 +7,7 @@ from app.models.users import Role, User
 from app.models.otp_verification import OTPVerification
 from app.schemas.auth import *
 from app.utils.security import hash_password, verify_password, create_access_token
-from app.utils.email_service import send_email
+from app.services.email_outbox import enqueue_email
 from app.utils.otp import generate_otp, otp_expiry
 from datetime import datetime
 import uuid
@@ -82,14 +82,17 @@ def register_user(payload: UserRegisterRequest, db: Session = Depends(get_db)):
         )
 
         db.add(otp_entry)
-        db.commit()
 
-        send_email(
+        # 📧 sent by the email dispatcher once this commits
+        enqueue_email(
+            db,
             to_email=user.email,
             subject="Verify Your Account - OTP",
             html_content=registration_otp_email(user.first_name, otp)
         )
 
+        db.commit()
+
     return user
 
 
@@ -148,17 +151,16 @@ def resend_registration_otp(
     )
 
     db.add(new_otp)
-    db.commit()
 
-    # 📧 Send email
-    email_sent = send_email(
+    # 📧 Queue email with the OTP
+    enqueue_email(
+        db,
         to_email=user.email,
         subject="Your Abeyonix verification code",
         html_content=registration_otp_email(user.first_name, otp)
     )
 
-    if not email_sent:
-        raise HTTPException(500, "Failed to send OTP email")
+    db.commit()
 
     return {"message": "OTP has been resent successfully"}
 
@@ -341,20 +343,16 @@ def send_forgot_password_otp(user_email: str, db: Session):
     )
 
     db.add(otp_entry)
-    db.commit()
 
-    # 📧 Send Email
-    email_sent = send_email(
+    # 📧 Queue email with the OTP
+    enqueue_email(
+        db,
         to_email=user.email,
         subject="Reset Your Password - OTP",
         html_content=forgot_password_otp_email(user.first_name, otp)
     )
 
-    if not email_sent:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to send OTP email"
-        )
+    db.commit()
 
     return {
         "message": "OTP sent to your email for password reset"
@@ -12,6 +12,9 @@ from app.schemas.categories import (
 )
 from app.utils.media import save_image, delete_image
 from app.utils.slug import generate_slug
+from app.services.category_tree import invalidate_category_tree
+from app.services.product_search import refresh_product_search_vectors
+from app.services.product_suggest import suggest_index, invalidate_product_suggestions
 
 router = APIRouter(prefix="/api/v1/categories", tags=["Categories"])
 
@@ -40,7 +43,10 @@ def create_category(
     )
 
     db.add(category)
+    invalidate_category_tree(db)
+    invalidate_product_suggestions(db)
     db.commit()
+    suggest_index.mark_stale()
     db.refresh(category)
     return category
 
@@ -79,6 +85,9 @@ def update_category(
         category.name = name
         category.slug = generate_slug(name)
 
+        # names are part of every product's search document
+        refresh_product_search_vectors(db, category_id=category_id)
+
     if description is not None:
         category.description = description
 
@@ -95,7 +104,10 @@ def update_category(
 
         category.image_path = save_image(image, "categories")
 
+    invalidate_category_tree(db)
+    invalidate_product_suggestions(db)
     db.commit()
+    suggest_index.mark_stale()
     db.refresh(category)
     return category
 
@@ -113,7 +125,10 @@ def delete_category(category_id: int, db: Session = Depends(get_db)):
         delete_image(category.image_path)
 
     db.delete(category)
+    invalidate_category_tree(db)
+    invalidate_product_suggestions(db)
     db.commit()
+    suggest_index.mark_stale()
 
     return {"message": "Category deleted successfully."}
 
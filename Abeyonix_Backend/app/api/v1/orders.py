@@ -1,10 +1,11 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query as FastQuery
-from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session, joinedload, selectinload
 from sqlalchemy.sql import func
 from decimal import Decimal
 import uuid
 import json
-from fastapi import BackgroundTasks
+from datetime import date, datetime, timedelta, timezone
 from app.core.config import *
 from app.utils.phonepe import *
 from app.utils.order_no_generator import *
@@ -18,7 +19,13 @@ from app.models.payment import PaymentSession, Payment
 from app.schemas.orders import *
 from app.utils.email_templates import order_notification_email
 from app.services.user_service import get_admin_emails
-from app.utils.email_service import send_email
+from app.services.email_outbox import enqueue_emails
+from app.services.checkout import calculate_totals, load_checkout_lines
+from app.services.order_service import OrderService
+from app.services.order_stats import get_daily_order_stats, get_order_widgets
+from app.services.order_tracking import apply_tracking_events
+from app.services.order_search import matching_order_ids, search_orders
+from app.utils.cursor import decode_keyset_cursor, encode_keyset_cursor
 
 router = APIRouter(prefix="/api/v1/orders", tags=["Orders"])
 
@@ -57,107 +64,44 @@ def get_checkout_page_data(
             "is_default": addr.is_default  # ⭐ important for UI
         })
 
-    products_data = []
-    subtotal = Decimal("0.00")
+    # 3️⃣ Lines: product, image, current price and stock in one query
+    products_data = load_checkout_lines(db, user_id, product_id, quantity)
 
-    # ================= CART FLOW =================
-    if product_id is None:
-        cart_items = db.query(CartItem).filter(
-            CartItem.user_id == user_id,
-            CartItem.is_active == True
-        ).all()
-
-        if not cart_items:
-            raise HTTPException(400, "Cart is empty")
-
-        for item in cart_items:
-            primary_image = db.query(ProductMedia.url).filter(
-                ProductMedia.product_id == item.product_id,
-                ProductMedia.is_primary == True
-            ).scalar()
-
-            line_total = item.unit_price * item.quantity
-            subtotal += line_total
-
-            products_data.append({
-                "product_id": item.product_id,
-                "product_name": item.product.name,
-                "sku": item.product.sku,
-                "unit_price": item.unit_price,
-                "quantity": item.quantity,
-                "total_price": line_total,
-                "primary_image": primary_image
-            })
-
-    # ================= BUY NOW FLOW =================
-    else:
-        product = db.query(Product).filter(
-            Product.id == product_id
-        ).first()
-
-        if not product:
-            raise HTTPException(404, "Product not found")
-
-        pricing = db.query(Pricing).filter(
-            Pricing.product_id == product.id
-        ).first()
-
-        unit_price = pricing.discount_price or pricing.price
-
-        primary_image = db.query(ProductMedia.url).filter(
-            ProductMedia.product_id == product.id,
-            ProductMedia.is_primary == True
-        ).scalar()
-
-        line_total = unit_price * quantity
-        subtotal += line_total
-
-        products_data.append({
-            "product_id": product.id,
-            "product_name": product.name,
-            "sku": product.sku,
-            "unit_price": unit_price,
-            "quantity": quantity,
-            "total_price": line_total,
-            "primary_image": primary_image
-        })
-
-    # 3️⃣ Totals
-    tax = subtotal * Decimal("0.00")
-    shipping = Decimal("50.00")
-    total_amount = subtotal + tax + shipping
+    # 4️⃣ Totals
+    totals = calculate_totals(products_data)
 
     return {
         "user": user,
         "address": address_data,
         "products": products_data,
-        "subtotal": subtotal,
-        "tax": tax,
-        "shipping": shipping,
-        "total_amount": total_amount
+        "subtotal": totals["subtotal"],
+        "tax": totals["tax"],
+        "shipping": totals["shipping"],
+        "total_amount": totals["total_amount"]
     }
 
 #---------------------------------------------------
 #
 # --------------------------------------------------
 
-def send_order_emails(db: Session, order, order_items, user):
+def queue_order_emails(db: Session, order, order_items, user):
     admin_emails = get_admin_emails(db)
 
     if admin_emails:
         html_content = order_notification_email(order, order_items, user)
 
-        for email in admin_emails:
-            send_email(
-                to_email=email,
-                subject=f"New Order Received - {order.order_number}",
-                html_content=html_content
-            )
+        enqueue_emails(db, [
+            {
+                "to_email": email,
+                "subject": f"New Order Received - {order.order_number}",
+                "html_content": html_content
+            }
+            for email in admin_emails
+        ])
 
 @router.post("/place-order", response_model=PlaceOrderResponse)
 def place_order(
     request: PlaceOrderRequest,
-    background_tasks: BackgroundTasks, 
     db: Session = Depends(get_db)
 ):
 
@@ -174,153 +118,28 @@ def place_order(
     if not address:
         raise HTTPException(400, "Invalid address")
 
-    order_items = []
-    subtotal = Decimal("0.00")
-
-    # ================= CART FLOW =================
-    if request.product_id is None:
-
-        cart_items = db.query(CartItem).filter(
-            CartItem.user_id == request.user_id,
-            CartItem.is_active == True
-        ).all()
-
-        if not cart_items:
-            raise HTTPException(400, "Cart is empty")
-
-        for item in cart_items:
-            inventory = db.query(Inventory).filter(
-                Inventory.product_id == item.product_id
-            ).with_for_update().first()   # 🔒 LOCK ROW
-
-            if not inventory or inventory.quantity < item.quantity:
-                raise HTTPException(
-                    400,
-                    f"Insufficient stock for {item.product.name}"
-                )
-
-            # ✅ Reduce stock
-            inventory.quantity -= item.quantity
-
-            line_total = item.unit_price * item.quantity
-            subtotal += line_total
-
-            order_items.append({
-                "product_id": item.product_id,
-                "product_name": item.product.name,
-                "sku": item.product.sku,
-                "unit_price": item.unit_price,
-                "quantity": item.quantity,
-                "total_price": line_total
-            })
-
-    # ================= BUY NOW FLOW =================
-    else:
-
-        product = db.query(Product).filter(
-            Product.id == request.product_id
-        ).first()
-
-        if not product:
-            raise HTTPException(404, "Product not found")
-
-        pricing = db.query(Pricing).filter(
-            Pricing.product_id == product.id
-        ).first()
-
-        if not pricing:
-            raise HTTPException(400, "Pricing not found")
-        
-        inventory = db.query(Inventory).filter(
-            Inventory.product_id == product.id
-        ).with_for_update().first()
-
-        if not inventory or inventory.quantity < request.quantity:
-            raise HTTPException(400, "Insufficient stock")
-
-        # ✅ Reduce stock
-        inventory.quantity -= request.quantity
-
-        unit_price = pricing.discount_price or pricing.price
+    # ================= LINES =================
 
-        line_total = unit_price * request.quantity
-        subtotal += line_total
-
-        order_items.append({
-            "product_id": product.id,
-            "product_name": product.name,
-            "sku": product.sku,
-            "unit_price": unit_price,
-            "quantity": request.quantity,
-            "total_price": line_total
-        })
-
-    # ================= TOTAL CALCULATION =================
-
-    tax = subtotal * Decimal("0.00")
-    shipping = Decimal("50.00")
-    total_amount = subtotal + tax + shipping
+    # cart or buy-now lines, priced like the checkout page
+    order_items = load_checkout_lines(db, request.user_id, request.product_id, request.quantity)
 
     # ================= CREATE ORDER =================
 
-    order = Order(
+    # stock, order, items, tracking and cart clearing in one transaction
+    order = OrderService(db).create_order(
         user_id=request.user_id,
-        order_number=generate_order_number(),
-        subtotal_amount=subtotal,
-        discount_amount=Decimal("0.00"),
-        tax_amount=tax,
-        shipping_amount=shipping,
-        total_amount=total_amount,
-        order_status="PLACED",
-        payment_status="PENDING",
-        shipping_address_id=request.address_id
+        shipping_address_id=request.address_id,
+        lines=order_items,
+        clear_cart=request.product_id is None,
     )
 
-    db.add(order)
-    db.flush()  # get order.id
-
-    # ================= CREATE ORDER ITEMS =================
-
-    for item in order_items:
-        db.add(OrderItem(
-            order_id=order.id,
-            product_id=item["product_id"],
-            product_name=item["product_name"],
-            sku=item["sku"],
-            unit_price=item["unit_price"],
-            quantity=item["quantity"],
-            total_price=item["total_price"]
-        ))
+    # ================= EMAIL TO ADMINS =================
 
-    # ================= ORDER TRACKING =================
-
-    db.add(OrderTracking(
-        order_id=order.id,
-        status="PLACED",
-        description="Order successfully placed"
-    ))
-
-    # ================= CLEAR CART =================
-
-    if request.product_id is None:
-        db.query(CartItem).filter(
-            CartItem.user_id == request.user_id,
-            CartItem.is_active == True
-        ).update({"is_active": False})
+    # ✅ queued with the order, sent by the email dispatcher after commit
+    queue_order_emails(db, order, order_items, user)
 
     db.commit()
 
-    # ================= SEND EMAIL TO ADMINS =================
-
-    # ✅ NON-BLOCKING
-    background_tasks.add_task(
-        send_order_emails,
-        db,
-        order,
-        order_items,
-        user
-    )
-
     return {
         "order_id": order.id,
         "order_number": order.order_number,
@@ -329,203 +148,6 @@ def place_order(
     }
 
 
-#---------------------------------------------------
-#
-# --------------------------------------------------
-
-
-def create_order_from_cart(session: PaymentSession, db: Session):
-    payload = session.payload
-    user_id = session.user_id
-    shipping_address_id = payload["shipping_address_id"]
-
-    # 1️⃣ Get all active cart items
-    cart_items = db.query(CartItem).filter(
-        CartItem.user_id == user_id,
-        CartItem.is_active == True
-    ).all()
-
-    if not cart_items:
-        raise HTTPException(400, "Cart is empty")
-
-    subtotal = Decimal("0.00")
-    order_items_data = []
-
-    # 2️⃣ Stock check + calculation
-    for item in cart_items:
-        inventory = db.query(Inventory).filter(
-            Inventory.product_id == item.product_id
-        ).first()
-
-        if not inventory or inventory.quantity < item.quantity:
-            raise HTTPException(
-                400,
-                f"Insufficient stock for product {item.product.name}"
-            )
-
-        line_total = item.quantity * item.unit_price
-        subtotal += line_total
-
-        order_items_data.append({
-            "product_id": item.product_id,
-            "product_name": item.product.name,
-            "sku": item.product.sku,
-            "unit_price": item.unit_price,
-            "quantity": item.quantity,
-            "total_price": line_total,
-        })
-
-    # 3️⃣ Calculate final amounts (dummy logic for now)
-    discount = Decimal("0.00")
-    tax = subtotal * Decimal("0.05")  # 5% tax example
-    shipping = Decimal("50.00")
-
-    total_amount = subtotal - discount + tax + shipping
-
-    # 4️⃣ Create Order
-    order = Order(
-        user_id=user_id,
-        order_number=str(uuid.uuid4())[:10].upper(),
-        subtotal_amount=subtotal,
-        discount_amount=discount,
-        tax_amount=tax,
-        shipping_amount=shipping,
-        total_amount=total_amount,
-        shipping_address_id=shipping_address_id,
-    )
-
-    db.add(order)
-    db.flush()  # get order.id before commit
-
-    # 5️⃣ Create Order Items + Reduce Inventory
-    for data in order_items_data:
-        order_item = OrderItem(
-            order_id=order.id,
-            **data
-        )
-        db.add(order_item)
-
-        # Reduce stock
-        inventory = db.query(Inventory).filter(
-            Inventory.product_id == data["product_id"]
-        ).first()
-        inventory.quantity -= data["quantity"]
-
-    # 6️⃣ Clear cart
-    for item in cart_items:
-        item.is_active = False
-
-    db.commit()
-    db.refresh(order)
-
-    payment = Payment(
-        order_id=order.id,
-        payment_method="UPI",
-        payment_gateway="PHONEPE",
-        transaction_id=session.transaction_id,
-        amount=session.amount,
-        payment_status="SUCCESS",
-        paid_at=datetime.utcnow()
-    )
-    db.add(payment)
-
-    order.payment_status = "SUCCESS"
-
-    return {
-        "order_id": order.id,
-        "order_number": order.order_number,
-        "total_amount": order.total_amount,
-        "items": order.items
-    }
-
-
-def create_order_from_buy_now(session: PaymentSession, db: Session):
-    payload = session.payload
-    user_id = session.user_id
-    shipping_address_id = payload["shipping_address_id"]
-    product_id = payload["product_id"]
-    quantity = payload["quantity"]
-
-    # 1️⃣ Get product
-    product = db.query(Product).filter(Product.id == product_id).first()
-    if not product:
-        raise HTTPException(404, "Product not found")
-
-    # 2️⃣ Check inventory
-    inventory = db.query(Inventory).filter(
-        Inventory.product_id == product_id
-    ).first()
-
-    if not inventory or inventory.quantity < quantity:
-        raise HTTPException(400, "Insufficient stock")
-
-    # 3️⃣ Calculate amounts
-    unit_price = product.price
-    subtotal = unit_price * quantity
-
-    discount = Decimal("0.00")
-    tax = subtotal * Decimal("0.00")
-    shipping = Decimal("50.00")
-    total_amount = subtotal - discount + tax + shipping
-
-    # 4️⃣ Create Order
-    order = Order(
-        user_id=user_id,
-        order_number=str(uuid.uuid4())[:10].upper(),
-        subtotal_amount=subtotal,
-        discount_amount=discount,
-        tax_amount=tax,
-        shipping_amount=shipping,
-        total_amount=total_amount,
-        shipping_address_id=shipping_address_id,
-    )
-
-    db.add(order)
-    db.flush()
-
-    # 5️⃣ Create single Order Item
-    order_item = OrderItem(
-        order_id=order.id,
-        product_id=product.id,
-        product_name=product.name,
-        sku=product.sku,
-        unit_price=unit_price,
-        quantity=quantity,
-        total_price=subtotal,
-    )
-    db.add(order_item)
-
-    # 6️⃣ Reduce inventory
-    inventory.quantity -= quantity
-
-    db.commit()
-    db.refresh(order)
-
-    payment = Payment(
-        order_id=order.id,
-        payment_method="UPI",
-        payment_gateway="PHONEPE",
-        transaction_id=session.transaction_id,
-        amount=session.amount,
-        payment_status="SUCCESS",
-        paid_at=datetime.utcnow()
-    )
-    db.add(payment)
-
-    order.payment_status = "SUCCESS"
-
-    return {
-        "order_id": order.id,
-        "order_number": order.order_number,
-        "total_amount": order.total_amount,
-        "items": order.items
-    }
-
-
-
-
-
-
 @router.get("/{order_id}", response_model=OrderDetailsResponse)
 def get_order_details(order_id: int, db: Session = Depends(get_db)):
 
@@ -581,90 +203,128 @@ def get_order_details(order_id: int, db: Session = Depends(get_db)):
 
 
 
-@router.get("/user/{user_id}", response_model=UserOrderListResponse)
-def get_user_orders(user_id: int, db: Session = Depends(get_db)):
+USER_ORDER_EXPANSIONS = {"items", "tracking"}
 
-    # Load orders with items in single go
-    orders = (
-        db.query(Order)
-        .options(joinedload(Order.items))
-        .filter(Order.user_id == user_id)
-        .order_by(Order.created_at.desc())
-        .all()
-    )
-
-    # Get all product_ids from all items
-    product_ids = {
-        item.product_id
-        for order in orders
-        for item in order.items
-    }
-
-    # Fetch all primary images in one query
-    media_rows = (
-        db.query(ProductMedia.product_id, ProductMedia.url)
-        .filter(
-            ProductMedia.product_id.in_(product_ids),
-            ProductMedia.is_primary == True
-        )
-        .all()
-    )
 
-    # Map: product_id -> image
-    image_map = {pid: url for pid, url in media_rows}
+def _order_rows(db: Session, orders, items: bool = True, tracking: bool = True) -> list:
+    """
+    Response rows for already loaded orders. Items and tracking come from
+    the (selectin-loaded) relationships; the primary images of all items
+    are fetched in one query.
+    """
+    image_map = {}
 
-     # ================= TRACKING =================
+    if items:
+        product_ids = {
+            item.product_id
+            for order in orders
+            for item in order.items
+        }
 
-    order_ids = [order.id for order in orders]
-
-    tracking_rows = (
-        db.query(OrderTracking)
-        .filter(OrderTracking.order_id.in_(order_ids))
-        .order_by(OrderTracking.updated_at.asc())
-        .all()
-    )
-
-    # Map: order_id -> list of tracking
-    tracking_map = {}
+        if product_ids:
+            media_rows = (
+                db.query(ProductMedia.product_id, ProductMedia.url)
+                .filter(
+                    ProductMedia.product_id.in_(product_ids),
+                    ProductMedia.is_primary == True
+                )
+                .all()
+            )
 
-    for row in tracking_rows:
-        tracking_map.setdefault(row.order_id, []).append({
-            "status": row.status,
-            "description": row.description,
-            "location": row.location,
-            "updated_at": row.updated_at
-        })
+            image_map = {pid: url for pid, url in media_rows}
 
     order_list = []
 
     for order in orders:
-        item_list = []
-
-        for item in order.items:
-            item_list.append({
-                "product_id": item.product_id,
-                "product_name": item.product_name,
-                "sku": item.sku,
-                "quantity": item.quantity,
-                "unit_price": item.unit_price,
-                "total_price": item.total_price,
-                "primary_image": image_map.get(item.product_id)
-            })
-
-        order_list.append({
+        data = {
             "order_id": order.id,
             "order_number": order.order_number,
             "order_status": order.order_status,
             "payment_status": order.payment_status,
             "total_amount": order.total_amount,
             "created_at": order.created_at,
-            "items": item_list,
-            "tracking": tracking_map.get(order.id, [])
-        })
+        }
+
+        if items:
+            data["items"] = [
+                {
+                    "product_id": item.product_id,
+                    "product_name": item.product_name,
+                    "sku": item.sku,
+                    "quantity": item.quantity,
+                    "unit_price": item.unit_price,
+                    "total_price": item.total_price,
+                    "primary_image": image_map.get(item.product_id)
+                }
+                for item in order.items
+            ]
+
+        if tracking:
+            data["tracking"] = [
+                {
+                    "status": row.status,
+                    "description": row.description,
+                    "location": row.location,
+                    "updated_at": row.updated_at
+                }
+                for row in order.tracking
+            ]
+
+        order_list.append(data)
+
+    return order_list
+
+
+@router.get("/user/{user_id}", response_model=UserOrderListResponse)
+def get_user_orders(
+    user_id: int,
+    cursor: Optional[str] = FastQuery(None),
+    limit: int = FastQuery(20, ge=1, le=100),
+    expand: Optional[str] = FastQuery(None),   # "items,tracking"
+    db: Session = Depends(get_db)
+):
+    expansions = {e.strip() for e in (expand or "").split(",") if e.strip()}
+    unknown = expansions - USER_ORDER_EXPANSIONS
+    if unknown:
+        raise HTTPException(400, f"Unknown expand: {', '.join(sorted(unknown))}")
+
+    # ⚡ Keyset page on idx_orders_user_created, newest first
+    query = db.query(Order).filter(Order.user_id == user_id)
+
+    if cursor:
+        created_at, order_id = decode_keyset_cursor(cursor)
+        query = query.filter(
+            tuple_(Order.created_at, Order.id) < (created_at, order_id)
+        )
+
+    # details only for the orders in this page, one IN query each
+    if "items" in expansions:
+        query = query.options(selectinload(Order.items))
+    if "tracking" in expansions:
+        query = query.options(selectinload(Order.tracking))
+
+    orders = (
+        query
+        .order_by(Order.created_at.desc(), Order.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+
+    has_more = len(orders) > limit
+    orders = orders[:limit]
+
+    order_list = _order_rows(
+        db,
+        orders,
+        items="items" in expansions,
+        tracking="tracking" in expansions,
+    )
 
     return {
         "total_orders": len(order_list),
-        "orders": order_list
+        "orders": order_list,
+        "next_cursor": encode_keyset_cursor(orders[-1].created_at, orders[-1].id) if has_more else None,
+        "has_more": has_more
     }
 
 
@@ -680,150 +340,122 @@ def get_all_orders(
     query = db.query(Order)
 
     # ================= SEARCH =================
-    if search:
-        query = query.filter(
-            (Order.order_number.ilike(f"%{search}%")) |
-            (Order.id == search if search.isdigit() else False)
-        )
+    # order number, customer or product, through the trigram indexes
+    if search and search.strip():
+        query = query.filter(Order.id.in_(matching_order_ids(search)))
+
+    # ================= WIDGETS =================
+    # from the order_stats counters, not full-table counts
+    widgets = get_order_widgets(db)
 
     # ================= TOTAL COUNT =================
-    total_count = query.count()
+    total_count = query.count() if search and search.strip() else widgets["total_orders"]
 
     # ================= PAGINATION =================
     orders = (
         query
-        .options(joinedload(Order.items))
+        .options(selectinload(Order.items), selectinload(Order.tracking))
         .order_by(Order.created_at.desc())
         .offset((page - 1) * page_size)
         .limit(page_size)
         .all()
     )
 
-    # ================= PRODUCT IDS =================
-    product_ids = {
-        item.product_id
-        for order in orders
-        for item in order.items
-    }
+    # ================= BUILD RESPONSE =================
+    order_list = _order_rows(db, orders)
 
-    # ================= MEDIA =================
-    media_rows = (
-        db.query(ProductMedia.product_id, ProductMedia.url)
-        .filter(
-            ProductMedia.product_id.in_(product_ids),
-            ProductMedia.is_primary == True
-        )
-        .all()
-    )
+    return {
+        "total_orders": len(order_list),
+        "page": page,
+        "page_size": page_size,
+        "total_count": total_count,
+        "widgets": widgets,
+        "orders": order_list
+    }
 
-    image_map = {pid: url for pid, url in media_rows}
 
-    # ================= TRACKING =================
-    order_ids = [order.id for order in orders]
 
-    tracking_rows = (
-        db.query(OrderTracking)
-        .filter(OrderTracking.order_id.in_(order_ids))
-        .order_by(OrderTracking.updated_at.asc())
-        .all()
-    )
 
-    tracking_map = {}
 
-    for row in tracking_rows:
-        tracking_map.setdefault(row.order_id, []).append({
-            "status": row.status,
-            "description": row.description,
-            "location": row.location,
-            "updated_at": row.updated_at
-        })
+@router.get("/admin/search", response_model=AdminOrderSearchResponse)
+def search_admin_orders(
+    q: str = FastQuery(..., min_length=1),
+    cursor: Optional[str] = FastQuery(None),
+    limit: int = FastQuery(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """
+    Orders by order number, customer email / name or product name / SKU,
+    newest first. Keyset-paginated: pass `next_cursor` back as `cursor`.
+    """
+    orders, next_cursor = search_orders(db, q, cursor, limit)
 
-    # ================= BUILD RESPONSE =================
-    order_list = []
+    return {
+        "orders": _order_rows(db, orders),
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None
+    }
 
-    for order in orders:
-        items = []
-
-        for item in order.items:
-            items.append({
-                "product_id": item.product_id,
-                "product_name": item.product_name,
-                "sku": item.sku,
-                "quantity": item.quantity,
-                "unit_price": item.unit_price,
-                "total_price": item.total_price,
-                "primary_image": image_map.get(item.product_id)
-            })
-
-        order_list.append({
-            "order_id": order.id,
-            "order_number": order.order_number,
-            "order_status": order.order_status,
-            "payment_status": order.payment_status,
-            "total_amount": order.total_amount,
-            "created_at": order.created_at,
-            "items": items,
-            "tracking": tracking_map.get(order.id, [])
-        })
 
-    # ================= WIDGETS =================
-    total_orders = db.query(Order).count()
 
-    delivered_orders = db.query(Order).filter(
-        Order.order_status == "DELIVERED"
-    ).count()
 
-    active_orders = db.query(Order).filter(
-        Order.order_status.notin_(["DELIVERED", "CANCELLED"])
-    ).count()
+@router.get("/admin/stats", response_model=OrderStatsResponse)
+def get_order_stats(
+    date_from: Optional[date] = FastQuery(None),
+    date_to: Optional[date] = FastQuery(None),
+    db: Session = Depends(get_db)
+):
+    """
+    Per-day order counts and amounts by (order_status, payment_status),
+    UTC days, last 30 days by default.
+    """
+    date_to = date_to or datetime.now(timezone.utc).date()
+    date_from = date_from or date_to - timedelta(days=29)
 
-    widgets = {
-        "total_orders": total_orders,
-        "active_orders": active_orders,
-        "delivered_orders": delivered_orders
-    }
+    if date_from > date_to:
+        raise HTTPException(400, "date_from must be before date_to")
 
     return {
-        "total_orders": len(order_list),
-        "page": page,
-        "page_size": page_size,
-        "total_count": total_count,
-        "widgets": widgets,
-        "orders": order_list
+        "date_from": date_from,
+        "date_to": date_to,
+        "widgets": get_order_widgets(db),
+        "days": get_daily_order_stats(db, date_from, date_to)
     }
 
 
 
-
-
 @router.post("/update-tracking", status_code=200)
 def update_order_tracking(
     request: UpdateOrderTrackingRequest,
     db: Session = Depends(get_db)
 ):
-    # 🔍 Check order exists
-    order = db.query(Order).filter(Order.id == request.order_id).first()
+    # 📝 Add tracking record and move the order to its latest status
+    statuses = apply_tracking_events(db, [request.model_dump()])
 
-    if not order:
-        raise HTTPException(status_code=404, detail="Order not found")
-
-    # 📝 Add tracking record
-    tracking = OrderTracking(
-        order_id=request.order_id,
-        status=request.status,
-        description=request.description,
-        location=request.location
-    )
+    db.commit()
+
+    return {
+        "message": "Order tracking updated successfully",
+        "order_id": request.order_id,
+        "current_status": statuses[request.order_id]
+    }
 
-    db.add(tracking)
 
-    # 🔄 Update order status (latest status)
-    order.order_status = request.status
+@router.post("/update-tracking/batch", response_model=BatchOrderTrackingResponse)
+def update_order_tracking_batch(
+    request: BatchOrderTrackingRequest,
+    db: Session = Depends(get_db)
+):
+    """
+    Many tracking events at once (warehouse scans). Events apply in
+    order; if any is invalid nothing is saved.
+    """
+    statuses = apply_tracking_events(db, [event.model_dump() for event in request.events])
 
     db.commit()
 
     return {
         "message": "Order tracking updated successfully",
-        "order_id": order.id,
-        "current_status": order.order_status
-    }
\ No newline at end of file
+        "events": len(request.events),
+        "orders": statuses
+    }
@@ -4,107 +4,133 @@ from sqlalchemy.sql import func
 from decimal import Decimal
 import uuid
 import json
-import httpx
+from starlette.concurrency import run_in_threadpool
 from app.core.config import *
 from app.utils.phonepe import *
 from app.db.session import get_db
 from app.models.orders import Order, OrderItem
 from app.models.cart import CartItem
 from app.models.payment import PaymentSession, Payment
+from app.models.product import Product
 from app.schemas.payment import *
-from app.api.v1.orders import create_order_from_cart, create_order_from_buy_now
+from app.services.inventory import hold_inventory, release_holds
+from app.services.checkout import load_buy_now_lines, load_cart_lines
+from app.services.payment_sessions import finalize_payment_session
+from app.workers.payment_reconciler import reconciler_metrics
 
 router = APIRouter(prefix="/api/v1", tags=["Payment"])
 
 
+def _session_lines(db: Session, user_id: int, flow_type: str, payload: dict) -> list[dict]:
+    """
+    Products and quantities a payment session is for, to hold stock.
+    """
+    if flow_type == "CART":
+        return load_cart_lines(db, user_id)
+
+    if flow_type == "BUY_NOW":
+        return load_buy_now_lines(db, payload.get("product_id"), int(payload.get("quantity") or 1))
+
+    raise HTTPException(400, "Invalid flow type")
+
+
+def _create_payment_session(db: Session, req: InitiatePaymentRequest, transaction_id: str, amount_in_paise: int) -> PaymentSession:
+    session = PaymentSession(
+        transaction_id=transaction_id,
+        user_id=req.user_id,
+        flow_type=req.flow_type,
+        payload=req.payload ,
+        amount=amount_in_paise,
+    )
+    db.add(session)
+    db.flush()
+
+    try:
+        # 🔒 hold stock for the payment window (released if it expires)
+        lines = _session_lines(db, req.user_id, req.flow_type, req.payload)
+        hold_inventory(db, lines, session.id)
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return session
+
+
 @router.post("/payment/initiate")
 async def initiate_payment(req: InitiatePaymentRequest, db: Session = Depends(get_db)):
+    transaction_id = str(uuid.uuid4())
+    amount_in_paise = int(req.amount * 100)
+
+    # 1️⃣ store session first (sync DB work runs off the event loop)
     try:
-        transaction_id = str(uuid.uuid4())
-
-        amount_in_paise = int(req.amount * 100)
-        # 1️⃣ store session first
-        session = PaymentSession(
-            transaction_id=transaction_id,
-            user_id=req.user_id,
-            flow_type=req.flow_type,
-            payload=req.payload ,
-            amount=amount_in_paise,
+        session = await run_in_threadpool(
+            _create_payment_session, db, req, transaction_id, amount_in_paise
         )
-        db.add(session)
-        db.commit()
-
-        # 2️⃣ call phonepe
-
-        payload = {
-            "merchantId": MERCHANT_ID,
-            "merchantTransactionId": transaction_id,
-            "merchantUserId": "USER_123",
-            "amount": amount_in_paise,  # paise
-            "redirectUrl": "http://192.168.1.7:8080/payment-status",
-            "redirectMode": "GET",
-            "callbackUrl": "https://appropriative-carie-unusuriously.ngrok-free.dev/api/v1/payment/callback",
-            "mobileNumber": "9999999999",
-            "paymentInstrument": {
-                "type": "PAY_PAGE"
-            },
-        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(500, str(e))
 
-        base64_payload, x_verify = generate_x_verify(payload)
+    # 2️⃣ call phonepe
+
+    payload = {
+        "merchantId": MERCHANT_ID,
+        "merchantTransactionId": transaction_id,
+        "merchantUserId": "USER_123",
+        "amount": amount_in_paise,  # paise
+        "redirectUrl": "http://192.168.1.7:8080/payment-status",
+        "redirectMode": "GET",
+        "callbackUrl": "https://appropriative-carie-unusuriously.ngrok-free.dev/api/v1/payment/callback",
+        "mobileNumber": "9999999999",
+        "paymentInstrument": {
+            "type": "PAY_PAGE"
+        },
+    }
 
-        headers = {
-            "Content-Type": "application/json",
-            "X-VERIFY": x_verify,
+    try:
+        data = await get_payment_gateway().pay(payload)
+    except PaymentGatewayError as e:
+        await run_in_threadpool(_release_session_holds, db, session)
+        raise HTTPException(502, str(e))
+
+    if data.get("success"):
+        pay_url = data["data"]["instrumentResponse"]["redirectInfo"]["url"]
+        return {
+            "transactionId": transaction_id,
+            "paymentUrl": pay_url,
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                PHONEPE_BASE_URL + PAY_ENDPOINT,
-                json={"request": base64_payload},
-                headers=headers,
-            )
+    await run_in_threadpool(_release_session_holds, db, session)
+    raise HTTPException(400, detail=data)
 
-        data = response.json()
-
-        if data.get("success"):
-            pay_url = data["data"]["instrumentResponse"]["redirectInfo"]["url"]
-            return {
-                "transactionId": transaction_id,
-                "paymentUrl": pay_url,
-            }
-        else:
-            raise HTTPException(400, detail=data)
 
+def _release_session_holds(db: Session, session: PaymentSession):
+    try:
+        release_holds(db, session.id)
+        session.status = "FAILED"
+        db.commit()
     except Exception as e:
-        raise HTTPException(500, str(e))
-    
-
+        db.rollback()
+        print(f"Could not release holds for session {session.id}: {e}")
 
 
 @router.post("/payment/callback")
 def payment_callback(response: dict, db: Session = Depends(get_db)):
 
     transaction_id = response.get("transactionId")
-
-    session = db.query(PaymentSession).filter_by(
-        transaction_id=transaction_id
-    ).first()
-
-    if not session:
-        raise HTTPException(404, "Session not found")
-
-    if session.status == "SUCCESS":
-        return {"message": "Already processed"}
+    if not transaction_id:
+        raise HTTPException(400, "transactionId is required")
 
     # verify phonepe success here
 
-    session.status = "SUCCESS"
-
-    if session.flow_type == "CART":
-        create_order_from_cart(session, db)
+    return finalize_payment_session(db, transaction_id)
 
-    elif session.flow_type == "BUY_NOW":
-        create_order_from_buy_now(session, db)
 
-    db.commit()
-    return {"message": "Order created"}
\ No newline at end of file
+@router.get("/payment/reconciliation/metrics")
+def payment_reconciliation_metrics():
+    """
+    Counters of this app worker's reconciliation loop.
+    """
+    return reconciler_metrics()
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, Form, File, UploadFile, HTTPException
+from fastapi import APIRouter, Depends, Form, File, UploadFile, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy import or_
 from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
@@ -13,6 +14,16 @@ from app.models.product import ProductMedia, ProductAttributeValue, Pricing, Inv
 from app.utils.media import delete_image, save_image
 from app.schemas.product import *
 from app.utils.slug import generate_slug, generate_sku
+from app.services.product_search import product_search_clause, refresh_product_search_vectors
+from app.services.product_suggest import suggest_index, invalidate_product_suggestions
+from app.services.attribute_values import build_attribute_values
+from app.services.product_export import stream_product_export
+from app.services.product_import import import_products as run_product_import, ImportFileError
+from app.services.product_detail import (
+    get_product_detail,
+    get_product_detail_by_slug,
+    invalidate_product_detail,
+)
 
 router = APIRouter(prefix="/api/v1/products", tags=["Products"])
 
@@ -80,14 +91,7 @@ def create_product(
         # ---------- Attributes ----------
         attribute_list = json.loads(attributes)
 
-        for attr in attribute_list:
-            db.add(
-                ProductAttributeValue(
-                    product_id=product.id,
-                    attribute_id=attr["attribute_id"],
-                    value=attr["value"],
-                )
-            )
+        db.add_all(build_attribute_values(db, product.id, attribute_list))
 
         # ---------- Media (using save_image) ----------
         for index, image in enumerate(images):
@@ -102,8 +106,13 @@ def create_product(
                 )
             )
 
+        refresh_product_search_vectors(db, product_ids=[product.id])
+        suggest_version = invalidate_product_suggestions(db)
+
         db.commit()
 
+        suggest_index.apply_product(product, suggest_version)
+
         return {
             "message": "Product created successfully",
             "product_id": product.id
@@ -116,6 +125,29 @@ def create_product(
 
 
 
+@router.post("/import", status_code=200)
+def import_products(
+    file: UploadFile = File(...),  # .csv or .xlsx
+    db: Session = Depends(get_db),
+):
+    """
+    Bulk import. Columns: name, category_id, sub_category_id, sku, brand,
+    short_description, long_description, is_active, price, discount_price,
+    quantity, low_quantity_alert_at and one attr[<attribute_id>] per attribute.
+    """
+    try:
+        report = run_product_import(db, file.file, file.filename)
+    except ImportFileError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return {
+        "message": f"Imported {report['imported']} of {report['total_rows']} products",
+        **report,
+    }
+
+
+
+
 @router.get("/", response_model=PaginatedProductResponse)
 def get_products(
     category_id: Optional[int] = None,
@@ -135,20 +167,17 @@ def get_products(
 
     # -------- Filters --------
     if category_id:
-        query = query.filter(Product.category_id == category_id)
+        query = query.filter(
+            Product.category_id.in_(Category.subtree_ids(category_id))
+        )
 
     if sub_category_id:
         query = query.filter(Product.sub_category_id == sub_category_id)
 
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            or_(
-                Product.name.ilike(search_term),
-                Category.name.ilike(search_term),
-                SubCategory.name.ilike(search_term),
-            )
-        )
+    rank = None
+    if search and search.strip():
+        search_filter, rank = product_search_clause(search)
+        query = query.filter(search_filter)
 
     total = query.count()
 
@@ -160,7 +189,10 @@ def get_products(
             joinedload(Product.category),
             joinedload(Product.sub_category),
         )
-        .order_by(Product.created_at.desc())
+        .order_by(
+            *([rank.desc()] if rank is not None else []),
+            Product.created_at.desc()
+        )
         .offset(offset)
         .limit(page_size)
         .all()
@@ -272,86 +304,52 @@ def get_products(
 
 
 
-@router.get("/{product_id}", response_model=ProductDetailResponse)
-def get_product(product_id: int, db: Session = Depends(get_db)):
-    product = (
-        db.query(Product)
-        .options(
-            joinedload(Product.category),
-            joinedload(Product.sub_category),
-        )
-        .filter(Product.id == product_id)
-        .first()
-    )
+@router.get("/export")
+def export_products(
+    format: str = Query("csv", pattern="^(csv|xlsx|ndjson)$"),
+    is_active: Optional[bool] = None,
+    category_id: Optional[int] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Full catalog dump with pricing, inventory, primary image and
+    attributes, streamed from a server-side cursor.
+    """
+    filters = []
 
-    if not product:
-        raise HTTPException(status_code=404, detail="Product not found")
-    
-    pricing = (
-        db.query(Pricing)
-        .filter(Pricing.product_id == product.id)
-        .first()
-    )
+    if is_active is not None:
+        filters.append(Product.is_active == is_active)
 
-    inventory = (
-        db.query(Inventory)
-        .filter(Inventory.product_id == product.id)
-        .first()
-    )
+    if category_id:
+        filters.append(Product.category_id.in_(Category.subtree_ids(category_id)))
 
-    media = (
-        db.query(ProductMedia)
-        .filter(ProductMedia.product_id == product.id)
-        .all()
-    )
+    chunks, media_type, filename = stream_product_export(db, format, filters)
 
-    attributes = (
-        db.query(
-            ProductAttributeValue.attribute_id,
-            Attribute.name.label("attribute_name"),
-            Attribute.unit,
-            ProductAttributeValue.value
-        )
-        .join(Attribute, Attribute.id == ProductAttributeValue.attribute_id)
-        .filter(ProductAttributeValue.product_id == product.id)
-        .all()
+    return StreamingResponse(
+        chunks,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
     )
 
-    attribute_response = [
-        {
-            "attribute_id": a.attribute_id,
-            "attribute_name": a.attribute_name,
-            "unit": a.unit,
-            "value": a.value
-        }
-        for a in attributes
-    ]
 
-    return {
-        "id": product.id,
-        "name": product.name,
-        "sku": product.sku,
-        "slug": product.slug,
+@router.get("/by-slug/{slug}", response_model=ProductDetailResponse)
+def get_product_by_slug(slug: str, db: Session = Depends(get_db)):
+    product = get_product_detail_by_slug(db, slug)
 
-        "category_id": product.category_id,
-        "category_name": product.category_name,
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
 
-        "sub_category_id": product.sub_category_id,
-        "sub_category_name": product.sub_category_name,
+    return product
 
-        "brand": product.brand,
-        "short_description": product.short_description,
-        "long_description": product.long_description,
 
-        "is_active": product.is_active,
-        "created_at": product.created_at,
-        "updated_at": product.updated_at,
+@router.get("/{product_id}", response_model=ProductDetailResponse)
+def get_product(product_id: int, db: Session = Depends(get_db)):
+    product = get_product_detail(db, product_id)
+
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
 
-        "pricing": pricing,
-        "inventory": inventory,
-        "attributes": attribute_response,
-        "media": media,
-    }
+    return product
 
 
 
@@ -436,14 +434,7 @@ def update_product(
         ).delete()
 
         attribute_list = json.loads(attributes)
-        for attr in attribute_list:
-            db.add(
-                ProductAttributeValue(
-                    product_id=product_id,
-                    attribute_id=attr["attribute_id"],
-                    value=attr["value"],
-                )
-            )
+        db.add_all(build_attribute_values(db, product_id, attribute_list))
 
         # ---------- Media ----------
         keep_media_ids = json.loads(existing_media_ids) if existing_media_ids else None
@@ -489,8 +480,14 @@ def update_product(
         if 0 <= primary_image_index < len(all_media):
             all_media[primary_image_index].is_primary = True
 
+        refresh_product_search_vectors(db, product_ids=[product_id])
+        suggest_version = invalidate_product_suggestions(db)
+
         db.commit()
 
+        invalidate_product_detail(product_id)
+        suggest_index.apply_product(product, suggest_version)
+
         return {
             "message": "Product updated successfully",
             "product_id": product_id
@@ -515,9 +512,13 @@ def delete_product(
 
     # ✅ Soft delete
     product.is_active = False
+    suggest_version = invalidate_product_suggestions(db)
 
     db.commit()
 
+    invalidate_product_detail(product.id)
+    suggest_index.apply_product(product, suggest_version)
+
     return {
         "message": "Product deleted successfully (soft delete)",
         "product_id": product.id
@@ -537,9 +538,13 @@ def update_product_status(
         raise HTTPException(status_code=404, detail="Product not found")
 
     product.is_active = is_active
+    suggest_version = invalidate_product_suggestions(db)
 
     db.commit()
 
+    invalidate_product_detail(product.id)
+    suggest_index.apply_product(product, suggest_version)
+
     return {
         "message": f"Product {'activated' if is_active else 'deactivated'} successfully",
         "product_id": product.id,
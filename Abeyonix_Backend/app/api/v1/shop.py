@@ -1,6 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query as FastQuery
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response, Query as FastQuery
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, func
+from sqlalchemy import and_, func, select
 from typing import List
 
 from app.db.base import Base
@@ -9,6 +9,14 @@ from app.models.categories import Category
 from app.models.sub_categories import SubCategory
 from app.models.product import *
 from app.schemas.shop import *
+from app.services.category_tree import get_category_tree_payload, etag_matches
+from app.services.product_search import product_search_clause
+from app.services.product_suggest import suggest_index
+from app.services.product_facets import (
+    parse_attribute_filters,
+    attribute_filter_clauses,
+    compute_facets,
+)
 
 router = APIRouter(
     prefix="/api/v1",
@@ -18,65 +26,16 @@ router = APIRouter(
 
 
 @router.get("/category-tree", response_model=List[CategoryTreeResponse])
-def get_category_subcategory_tree(db: Session = Depends(get_db)):
-    categories = (
-        db.query(Category)
-        .filter(Category.is_active == True)
-        .all()
-    )
+def get_category_subcategory_tree(request: Request, db: Session = Depends(get_db)):
+    # Served from the per-worker cache, rebuilt only after a category change
+    body, etag = get_category_tree_payload(db)
 
-    sub_categories = (
-        db.query(SubCategory)
-        .filter(SubCategory.is_active == True)
-        .all()
-    )
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
 
-    # ----------------------------
-    # Lookup maps
-    # ----------------------------
-    category_children_map = {}
-    subcategory_map = {}
-
-    for cat in categories:
-        category_children_map.setdefault(cat.parent_id, []).append(cat)
-
-    for sub in sub_categories:
-        subcategory_map.setdefault(sub.category_id, []).append(sub)
-
-    # ----------------------------
-    # Recursive tree builder
-    # ----------------------------
-    def build_category_tree(category):
-        return {
-            "id": category.id,
-            "name": category.name,
-            "slug": category.slug,
-            "image_path": category.image_path,
-            "children": [
-                build_category_tree(child)
-                for child in category_children_map.get(category.id, [])
-            ],
-            "sub_categories": [
-                {
-                    "id": sub.id,
-                    "name": sub.name,
-                    "slug": sub.slug,
-                    "image_path": sub.image_path,
-                    "category_name": sub.category_name,
-                }
-                for sub in subcategory_map.get(category.id, [])
-            ]
-        }
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
 
-    # ----------------------------
-    # Root categories
-    # ----------------------------
-    tree = [
-        build_category_tree(cat)
-        for cat in category_children_map.get(None, [])
-    ]
-
-    return tree
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 
@@ -86,112 +45,123 @@ def get_category_subcategory_tree(db: Session = Depends(get_db)):
 
 @router.get("/shop/products", response_model=ShopProductScrollResponse)
 def get_shop_products(
+    request: Request,
     category_id: Optional[int] = None,
     sub_category_id: Optional[int] = None,
 
     last_id: Optional[int] = None,
-    limit: int = 12,
+    limit: int = FastQuery(12, ge=1, le=100),
 
     db: Session = Depends(get_db),
 ):
-    query = (
-        db.query(Product)
-        .join(Category, Product.category_id == Category.id)
-        .outerjoin(SubCategory, Product.sub_category_id == SubCategory.id)
-        .filter(Product.is_active == True)
-    )
-
     # -------- Filters --------
+    filters = [Product.is_active == True]
+
     # ✅ Subcategory filter (PRIORITY)
     if sub_category_id:
-        query = query.filter(Product.sub_category_id == sub_category_id)
+        filters.append(Product.sub_category_id == sub_category_id)
 
     # ✅ Category filter (only if subcategory NOT provided)
+    # 👉 Whole subtree: the category itself, children, grandchildren...
     elif category_id:
+        filters.append(
+            Product.category_id.in_(Category.subtree_ids(category_id))
+        )
 
-        # Get category
-        category = db.query(Category).filter(Category.id == category_id).first()
+    # ✅ Attribute filters: ?attr[<id>]=value or ?attr[<id>]=min..max
+    filters.extend(
+        attribute_filter_clauses(
+            db,
+            parse_attribute_filters(request.query_params),
+            Product.id,
+        )
+    )
 
-        if category:
-            # Check if it has children
-            child_categories = db.query(Category.id).filter(
-                Category.parent_id == category_id
-            ).all()
+    # One primary image per product, even if several are flagged, so a
+    # product can't show up twice in a page
+    primary_image = (
+        select(ProductMedia.url)
+        .where(
+            ProductMedia.product_id == Product.id,
+            ProductMedia.is_primary == True,
+        )
+        .order_by(ProductMedia.id)
+        .limit(1)
+        .correlate(Product)
+        .scalar_subquery()
+    )
 
-            child_ids = [c.id for c in child_categories]
+    # Single round trip: product + names + pricing + primary image
+    query = (
+        db.query(
+            Product.id,
+            Product.name,
+            Product.slug,
+            Product.sku,
+            Product.category_id,
+            Category.name.label("category_name"),
+            Product.sub_category_id,
+            SubCategory.name.label("sub_category_name"),
+            Product.brand,
+            Pricing.price,
+            Pricing.discount_price,
+            primary_image.label("primary_image"),
+        )
+        .join(Category, Product.category_id == Category.id)
+        .outerjoin(SubCategory, Product.sub_category_id == SubCategory.id)
+        .outerjoin(Pricing, Pricing.product_id == Product.id)
+        .filter(*filters)
+    )
 
-            if child_ids:
-                # 👉 Parent category → include children + itself
-                query = query.filter(
-                    Product.category_id.in_([category_id] + child_ids)
-                )
-            else:
-                # 👉 Leaf category
-                query = query.filter(Product.category_id == category_id)
+    # -------- Keyset pagination --------
+    # Served by idx_product_active_(sub_)category_id: page N costs the same as page 1
+    if last_id:
+        query = query.filter(Product.id < last_id)
 
-    products = (
+    rows = (
         query
-        .options(
-            joinedload(Product.category),
-            joinedload(Product.sub_category),
-        )
         .order_by(Product.id.desc())
         .limit(limit + 1)   # fetch one extra
         .all()
     )
 
-    has_more = len(products) > limit
-    products = products[:limit]
-
-    product_ids = [p.id for p in products]
-
-    # -------- Pricing --------
-    pricing_map = {
-        p.product_id: p
-        for p in db.query(Pricing)
-        .filter(Pricing.product_id.in_(product_ids))
-        .all()
-    }
-
-    # -------- Primary Image --------
-    media_map = {
-        m.product_id: m.url
-        for m in db.query(ProductMedia)
-        .filter(
-            ProductMedia.product_id.in_(product_ids),
-            ProductMedia.is_primary == True
-        )
-        .all()
-    }
+    has_more = len(rows) > limit
+    rows = rows[:limit]
 
-    items = []
-    for product in products:
-        pricing = pricing_map.get(product.id)
+    items = [
+        {
+            "id": row.id,
+            "name": row.name,
+            "slug": row.slug,
+            "sku": row.sku,
 
-        items.append({
-            "id": product.id,
-            "name": product.name,
-            "slug": product.slug,
-            "sku": product.sku,
+            "category_id": row.category_id,
+            "category_name": row.category_name,
 
-            "category_id": product.category_id,
-            "category_name": product.category_name,
+            "sub_category_id": row.sub_category_id,
+            "sub_category_name": row.sub_category_name,
 
-            "sub_category_id": product.sub_category_id,
-            "sub_category_name": product.sub_category_name,
+            "brand": row.brand,
 
-            "brand": product.brand,
+            "price": float(row.price) if row.price is not None else None,
+            "discount_price": float(row.discount_price) if row.discount_price else None,
 
-            "price": float(pricing.price) if pricing else None,
-            "discount_price": float(pricing.discount_price) if pricing and pricing.discount_price else None,
+            "primary_image": row.primary_image,
+        }
+        for row in rows
+    ]
 
-            "primary_image": media_map.get(product.id),
-        })
+    # -------- Facets (first page only) --------
+    # Value counts over the whole filtered result set, one aggregated query
+    facets = None
+    if not last_id:
+        facets = compute_facets(db, select(Product.id).where(*filters))
 
     return {
         "items": items,
         "last_id": items[-1]["id"] if items else None,
-        "has_more": has_more
+        "has_more": has_more,
+        "facets": facets
     }
 
 @router.get("/product/search", response_model=ProductSearchResponse)
@@ -222,18 +192,33 @@ def search_products(
             Pricing.product_id == Product.id,
         )
         .filter(Product.is_active == True)
-        .order_by(Product.id)
     )
 
-    # 🔍 Search by name
-    if search:
-        query = query.filter(Product.name.ilike(f"%{search}%"))
+    # 🔍 Ranked full-text / trigram search
+    # cursor = number of ranked rows already returned
+    if search and search.strip():
+        search_filter, rank = product_search_clause(search)
+
+        offset = cursor or 0
+        results = (
+            query
+            .filter(search_filter)
+            .order_by(rank.desc(), Product.id.desc())
+            .offset(offset)
+            .limit(limit)
+            .all()
+        )
+
+        next_cursor = offset + len(results) if len(results) == limit else None
+
+    # ⚡ Scroll pagination (cursor = last product id)
+    else:
+        if cursor:
+            query = query.filter(Product.id > cursor)
 
-    # ⚡ Scroll pagination
-    if cursor:
-        query = query.filter(Product.id > cursor)
+        results = query.order_by(Product.id).limit(limit).all()
 
-    results = query.limit(limit).all()
+        next_cursor = results[-1].id if results else None
 
     items = [
         ProductSearchItem(
@@ -245,9 +230,20 @@ def search_products(
         for row in results
     ]
 
-    next_cursor = results[-1].id if results else None
-
     return ProductSearchResponse(
         next_cursor=next_cursor,
         items=items,
     )
+
+
+@router.get("/product/suggest", response_model=ProductSuggestResponse)
+def suggest_products(
+    q: str = FastQuery(..., min_length=1, max_length=100),
+    limit: int = FastQuery(8, ge=1, le=20),
+    db: Session = Depends(get_db),
+):
+    # ⚡ In-memory prefix index; the DB is only asked for the catalog version
+    # every few seconds, or for a full load after another worker's change
+    suggest_index.ensure_fresh(db)
+
+    return {"items": suggest_index.suggest(q, limit)}
@@ -13,6 +13,8 @@ from app.schemas.sub_categories import (
 
 from app.utils.media import save_image, delete_image
 from app.utils.slug import generate_slug
+from app.services.category_tree import invalidate_category_tree
+from app.services.product_search import refresh_product_search_vectors
 
 router = APIRouter(prefix="/api/v1/sub-categories", tags=["Sub Categories"])
 
@@ -44,6 +46,7 @@ def create_sub_category(
     )
 
     db.add(sub_category)
+    invalidate_category_tree(db)
     db.commit()
     db.refresh(sub_category)
 
@@ -96,6 +99,9 @@ def update_sub_category(
         sub_category.name = name
         sub_category.slug = generate_slug(name)
 
+        # names are part of every product's search document
+        refresh_product_search_vectors(db, sub_category_id=sub_category_id)
+
     # ✅ Update category
     if category_id is not None:
         category = db.query(Category).filter(Category.id == category_id).first()
@@ -117,6 +123,7 @@ def update_sub_category(
 
         sub_category.image_path = save_image(image, "sub_categories")
 
+    invalidate_category_tree(db)
     db.commit()
     db.refresh(sub_category)
 
@@ -135,6 +142,7 @@ def delete_sub_category(sub_category_id: int, db: Session = Depends(get_db)):
         delete_image(sub_category.image_path)
 
     db.delete(sub_category)
+    invalidate_category_tree(db)
     db.commit()
 
     return {"message": "SubCategory deleted successfully."}
@@ -5,6 +5,7 @@ from app.utils.security import hash_password
 from app.db.base import get_db
 from app.models.users import Role, User
 from app.schemas.users import *
+from app.services.user_service import ADMIN_ROLE_ID, invalidate_admin_emails
 
 router = APIRouter(prefix="/api/v1", tags=["Users Management"])
 
@@ -118,6 +119,11 @@ def create_user(
     )
 
     db.add(user)
+
+    # 📧 new admin gets order notifications
+    if role_id == ADMIN_ROLE_ID:
+        invalidate_admin_emails(db)
+
     db.commit()
     db.refresh(user)
     return user
@@ -166,6 +172,8 @@ def update_user(
     if not user:
         raise HTTPException(404, "User not found")
 
+    was_admin = user.role_id == ADMIN_ROLE_ID
+
     if user_name is not None:
         user.user_name = user_name
     if email is not None:
@@ -188,6 +196,10 @@ def update_user(
     if profile_image:
         user.profile_image_url = f"/uploads/users/{profile_image.filename}"
 
+    # 📧 admin recipients change with role, email or active flag
+    if was_admin or user.role_id == ADMIN_ROLE_ID:
+        invalidate_admin_emails(db)
+
     db.commit()
     db.refresh(user)
     return user
@@ -200,6 +212,9 @@ def delete_user(user_id: int, db: Session = Depends(get_db)):
     if not user:
         raise HTTPException(404, "User not found")
 
+    if user.role_id == ADMIN_ROLE_ID:
+        invalidate_admin_emails(db)
+
     db.delete(user)
     db.commit()
     return {"message" : "User deleted successfully!"}
@@ -20,6 +20,7 @@ class Settings(BaseSettings):
     SMTP_USER:str = os.getenv("SMTP_USER")
     SMTP_PASSWORD:str = os.getenv("SMTP_PASSWORD")
     FROM_EMAIL:str = os.getenv("FROM_EMAIL")
+    SMTP_STARTTLS: bool = os.getenv("SMTP_STARTTLS", "true").lower() != "false"
 
     # RESEND_API_KEY: str = os.getenv("RESEND_API_KEY")
 
@@ -27,6 +28,11 @@ class Settings(BaseSettings):
     PHONEPE_MERCHANT_ID : str = os.getenv("PHONEPE_MERCHANT_ID")
     PHONEPE_MERCHANT_SECRET : str = os.getenv("PHONEPE_MERCHANT_SECRET")
     PHONEPE_CALLBACK_URL : str = os.getenv("PHONEPE_CALLBACK_URL")
+    PAYMENT_GATEWAY : str = os.getenv("PAYMENT_GATEWAY", "phonepe")   # phonepe | fake
+
+    # pod number 0-4, unique per pod; each of its processes claims an id slot
+    # from the DB at startup. Unset = any free slot
+    ID_WORKER_ID : str | None = os.getenv("ID_WORKER_ID")
 
     # s3 bucket 
     AWS_ACCESS_KEY_ID: str = os.getenv("AWS_ACCESS_KEY_ID")
@@ -1,9 +1,17 @@
+from sqlalchemy import DDL, event
 from sqlalchemy.ext.declarative import declarative_base
 from app.db.session import SessionLocal
 
 
 Base = declarative_base()
 
+# pg_trgm backs the trigram search indexes, so it has to exist before create_all
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+)
+
 
 def get_db():
     db = SessionLocal()
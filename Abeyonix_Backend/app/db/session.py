@@ -1,3 +1,5 @@
+from contextlib import contextmanager
+
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
@@ -10,5 +12,24 @@ def get_db():
     db = SessionLocal()
     try:
         yield db
+    finally:
+        db.close()
+
+
+@contextmanager
+def session_scope():
+    """
+    Own short-lived session for work outside a request (worker threads,
+    background jobs): commits on success, rolls back on error, always
+    closes. Hand such work plain ids, never the request's session or its
+    ORM objects - get_db closes that session once the response is sent.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     finally:
         db.close()
\ No newline at end of file
@@ -4,6 +4,11 @@ from fastapi.staticfiles import StaticFiles
 from app.db.session import engine, SessionLocal   
 from app.db.base import Base
 from app.db.seed_roles import seed_default_roles
+from app.workers.reservation_sweeper import start_reservation_sweeper, stop_reservation_sweeper
+from app.workers.payment_reconciler import start_payment_reconciler, stop_payment_reconciler
+from app.workers.email_dispatcher import start_email_dispatcher, stop_email_dispatcher
+from app.utils.phonepe import get_payment_gateway
+from app.utils.id_generator import claim_id_worker
 from app.api.v1 import (
     auth, users, categories,
     sub_categories, attributes,
@@ -26,12 +31,39 @@ app = FastAPI(
 # Add Startup Event
 @app.on_event("startup")
 def startup_event():
+    # fails the worker now if it can't get an id slot
+    claim_id_worker()
+
     db = SessionLocal()
     try:
         seed_default_roles(db)
     finally:
         db.close()
 
+    start_reservation_sweeper()
+    start_email_dispatcher()
+
+
+@app.on_event("startup")
+async def start_payment_gateway():
+    # one pooled HTTP client per worker, reused by every checkout
+    await get_payment_gateway().start()
+
+    # polls PhonePe for sessions whose callback never came
+    start_payment_reconciler()
+
+
+@app.on_event("shutdown")
+def shutdown_event():
+    stop_reservation_sweeper()
+    stop_email_dispatcher()
+
+
+@app.on_event("shutdown")
+async def close_payment_gateway():
+    await stop_payment_reconciler()
+    await get_payment_gateway().close()
+
 
 # CORS Setup
 app.add_middleware(
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, BigInteger, String, DateTime
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class CacheVersion(Base):
+    """
+    Shared version counter for per-worker in-process caches.
+    Writers bump the row inside their own transaction, readers compare
+    it against the version their cached copy was built from.
+    """
+    __tablename__ = "cache_versions"
+
+    name = Column(String(100), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now()
+    )
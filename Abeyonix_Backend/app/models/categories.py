@@ -4,7 +4,8 @@ from sqlalchemy import (
     String,
     Boolean,
     ForeignKey,
-    Text
+    Text,
+    select
 )
 from sqlalchemy.orm import relationship
 from app.db.base import Base
@@ -29,7 +30,8 @@ class Category(Base):
     parent_id = Column(
         BigInteger,
         ForeignKey("categories.id"),
-        nullable=True
+        nullable=True,
+        index=True
     )
 
     parent = relationship(
@@ -38,3 +40,19 @@ class Category(Base):
         backref="children"
     )
 
+    @classmethod
+    def subtree_ids(cls, category_id: int):
+        """
+        SELECT of `category_id` plus every descendant id, resolved by one
+        recursive CTE. UNION (not UNION ALL) stops on accidental cycles.
+        Use as `Product.category_id.in_(Category.subtree_ids(category_id))`.
+        """
+        subtree = (
+            select(cls.id)
+            .where(cls.id == category_id)
+            .cte(name="category_subtree", recursive=True)
+        )
+        subtree = subtree.union(
+            select(cls.id).where(cls.parent_id == subtree.c.id)
+        )
+        return select(subtree.c.id)
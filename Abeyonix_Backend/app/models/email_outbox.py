@@ -0,0 +1,51 @@
+from sqlalchemy import (
+    Column,
+    BigInteger,
+    Integer,
+    String,
+    Text,
+    DateTime,
+    Index,
+    Sequence,
+    text,
+)
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+
+
+class EmailOutbox(Base):
+    """
+    Mail waiting to be sent. Rows are added in the same transaction as
+    the change they announce (a new OTP, an order), so a rolled back
+    request sends nothing and a committed one is never lost. The email
+    dispatcher sends PENDING rows whose next_attempt_at has passed.
+    """
+    __tablename__ = "email_outbox"
+
+    id = Column(
+        BigInteger,
+        Sequence("email_outbox_id_seq"),
+        primary_key=True
+    )
+
+    to_email = Column(String(255), nullable=False)
+    subject = Column(String(300), nullable=False)
+    html_content = Column(Text, nullable=False)
+
+    status = Column(String(20), nullable=False, default="PENDING")   # PENDING, SENT, FAILED
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(String(500), nullable=True)
+
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # dispatcher: due mail, oldest first
+        Index(
+            "idx_email_outbox_pending_next_attempt",
+            "next_attempt_at",
+            postgresql_where=text("status = 'PENDING'"),
+        ),
+    )
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, BigInteger, String, Date, Numeric, SmallInteger
+
+from app.db.base import Base
+
+
+class OrderStat(Base):
+    """
+    Order counters per UTC day of order creation and (order_status,
+    payment_status), kept in step with the orders table by the same
+    transactions that create orders and change their status.
+
+    Each key is split over a few `shard` rows so concurrent checkouts
+    don't all queue on one row lock; readers SUM over the shards.
+    """
+    __tablename__ = "order_stats"
+
+    day = Column(Date, primary_key=True)
+    order_status = Column(String(50), primary_key=True)
+    payment_status = Column(String(50), primary_key=True)
+    shard = Column(SmallInteger, primary_key=True, default=0)
+
+    order_count = Column(BigInteger, nullable=False, default=0)
+    total_amount = Column(Numeric(14, 2), nullable=False, default=0)
@@ -7,6 +7,9 @@ from sqlalchemy import (
     ForeignKey,
     Integer,
     Text,
+    Sequence,
+    Index,
+    text,
 )
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -56,6 +59,24 @@ class Order(Base):
         cascade="all, delete-orphan"
     )
 
+    tracking = relationship(
+        "OrderTracking",
+        order_by="[OrderTracking.updated_at, OrderTracking.id]",
+        viewonly=True
+    )
+
+    __table_args__ = (
+        # user order history, newest first, keyset on (created_at, id)
+        Index("idx_orders_user_created", "user_id", text("created_at DESC"), text("id DESC")),
+        # admin order search
+        Index(
+            "idx_order_number_trgm",
+            "order_number",
+            postgresql_using="gin",
+            postgresql_ops={"order_number": "gin_trgm_ops"},
+        ),
+    )
+
 
 
 
@@ -63,10 +84,11 @@ class Order(Base):
 class OrderItem(Base):
     __tablename__ = "order_items"
 
+    # DB-side ids, so bulk INSERT ... RETURNING batches many rows at once
     id = Column(
         BigInteger,
-        primary_key=True,
-        default=generate_time_based_id
+        Sequence("order_items_id_seq"),
+        primary_key=True
     )
 
     order_id = Column(
@@ -93,6 +115,22 @@ class OrderItem(Base):
     # Relationship
     order = relationship("Order", back_populates="items")
 
+    __table_args__ = (
+        # admin order search by product
+        Index(
+            "idx_order_item_product_name_trgm",
+            "product_name",
+            postgresql_using="gin",
+            postgresql_ops={"product_name": "gin_trgm_ops"},
+        ),
+        Index(
+            "idx_order_item_sku_trgm",
+            "sku",
+            postgresql_using="gin",
+            postgresql_ops={"sku": "gin_trgm_ops"},
+        ),
+    )
+
 
 
 
@@ -101,17 +139,17 @@ class OrderItem(Base):
 class OrderTracking(Base):
     __tablename__ = "order_tracking"
 
+    # DB-side ids, so bulk INSERT ... RETURNING batches many rows at once
     id = Column(
         BigInteger,
-        primary_key=True,
-        default=generate_time_based_id
+        Sequence("order_tracking_id_seq"),
+        primary_key=True
     )
 
     order_id = Column(
         BigInteger,
         ForeignKey("orders.id"),
-        nullable=False,
-        index=True
+        nullable=False
     )
 
     status = Column(String(100), nullable=False)        # SHIPPED, OUT_FOR_DELIVERY, DELIVERED
@@ -124,4 +162,9 @@ class OrderTracking(Base):
     )
 
     # Relationship
-    order = relationship("Order")
\ No newline at end of file
+    order = relationship("Order")
+
+    __table_args__ = (
+        # one order's timeline in order; also serves order_id lookups
+        Index("idx_order_tracking_order_updated", "order_id", "updated_at"),
+    )
\ No newline at end of file
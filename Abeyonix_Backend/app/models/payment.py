@@ -7,6 +7,8 @@ from sqlalchemy import (
     ForeignKey,
     Integer,
     Text,
+    Index,
+    Sequence,
 )
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -18,10 +20,11 @@ from app.utils.id_generator import generate_time_based_id
 class Payment(Base):
     __tablename__ = "payments"
 
+    # DB-side ids, so bulk INSERT ... RETURNING batches many rows at once
     id = Column(
         BigInteger,
-        primary_key=True,
-        default=generate_time_based_id
+        Sequence("payments_id_seq"),
+        primary_key=True
     )
 
     order_id = Column(
@@ -64,6 +67,15 @@ class PaymentSession(Base):
     payload = Column(JSON)  # what to process after success
 
     amount = Column(Numeric(10,2))
-    status = Column(String(20), default="INITIATED")
+    status = Column(String(20), default="INITIATED")   # INITIATED, SUCCESS, FAILED, EXPIRED
+
+    # Outcome of the first callback, returned as-is to PhonePe retries
+    callback_result = Column(JSON, nullable=True)
+    processed_at = Column(DateTime(timezone=True), nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # reconciliation: stale INITIATED sessions, oldest first
+        Index("idx_payment_session_status_created", "status", "created_at"),
+    )
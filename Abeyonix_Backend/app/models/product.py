@@ -10,6 +10,7 @@ from sqlalchemy import (
     Numeric,
     Index
 )
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -49,6 +50,9 @@ class Product(Base):
 
     is_active = Column(Boolean, default=True)
 
+    # Maintained by app.services.product_search.refresh_product_search_vectors
+    search_vector = Column(TSVECTOR, nullable=True)
+
     created_at = Column(
         DateTime(timezone=True),
         server_default=func.now()
@@ -65,6 +69,18 @@ class Product(Base):
 
     __table_args__ = (
         Index("idx_product_slug_active", "slug", "is_active"),
+        # keyset pagination for the shop listing (WHERE ... AND id < :last_id ORDER BY id DESC)
+        Index("idx_product_active_id", "is_active", "id"),
+        Index("idx_product_active_category_id", "is_active", "category_id", "id"),
+        Index("idx_product_active_sub_category_id", "is_active", "sub_category_id", "id"),
+        # full-text + typo-tolerant search
+        Index("idx_product_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "idx_product_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
     )
 
     # ---------- Computed Properties ----------
@@ -87,6 +103,20 @@ class ProductAttributeValue(Base):
     attribute_id = Column(BigInteger, ForeignKey("attributes.id"), nullable=False)
     value = Column(String, nullable=False)
 
+    # Typed copies of `value`, filled from Attribute.data_type on write
+    # (app.services.attribute_values) so filters can use index scans
+    numeric_value = Column(Numeric(18, 6), nullable=True)
+    boolean_value = Column(Boolean, nullable=True)
+    text_value = Column(String(255), nullable=True)     # trimmed + lowercased
+
+    __table_args__ = (
+        Index("idx_pav_product_id", "product_id"),
+        # attribute filters and facet counts
+        Index("idx_pav_attribute_numeric", "attribute_id", "numeric_value"),
+        Index("idx_pav_attribute_text", "attribute_id", "text_value"),
+        Index("idx_pav_attribute_boolean", "attribute_id", "boolean_value"),
+    )
+
     
 
 class ProductMedia(Base):
@@ -111,6 +141,10 @@ class Pricing(Base):
     price = Column(Numeric(10, 2), nullable=False)
     discount_price = Column(Numeric(10, 2), nullable=True)
 
+    __table_args__ = (
+        Index("idx_pricing_product_id", "product_id"),
+    )
+
 
 class Inventory(Base):
     __tablename__ = "inventory"
@@ -120,5 +154,9 @@ class Inventory(Base):
     quantity = Column(BigInteger, nullable=False)
     low_quantity_alert_at = Column(Integer, nullable=False)
 
+    __table_args__ = (
+        Index("idx_inventory_product_id", "product_id"),
+    )
+
 
 
@@ -0,0 +1,59 @@
+from sqlalchemy import (
+    Column,
+    BigInteger,
+    Integer,
+    String,
+    DateTime,
+    ForeignKey,
+    Index,
+    text,
+)
+from sqlalchemy.sql import func
+
+from app.db.base import Base
+from app.utils.id_generator import generate_time_based_id
+
+
+class StockReservation(Base):
+    """
+    Quantity held for a PaymentSession while the customer is on the
+    payment page. HELD rows with expires_at in the future count against
+    available stock; the callback turns them into a real decrement
+    (CONVERTED) and the sweeper marks expired ones RELEASED.
+    """
+    __tablename__ = "stock_reservations"
+
+    id = Column(BigInteger, primary_key=True, default=generate_time_based_id)
+
+    product_id = Column(BigInteger, ForeignKey("products.id"), nullable=False)
+    payment_session_id = Column(
+        BigInteger,
+        ForeignKey("payment_sessions.id"),
+        nullable=False,
+        index=True
+    )
+
+    quantity = Column(Integer, nullable=False)
+    status = Column(String(20), nullable=False, default="HELD")   # HELD, CONVERTED, RELEASED
+
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        # SUM(quantity) of active holds per product, index-only
+        Index(
+            "idx_stock_reservation_held_product",
+            "product_id",
+            "expires_at",
+            postgresql_include=["quantity"],
+            postgresql_where=text("status = 'HELD'"),
+        ),
+        # sweeper: oldest expired holds first
+        Index(
+            "idx_stock_reservation_held_expires",
+            "expires_at",
+            postgresql_where=text("status = 'HELD'"),
+        ),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, Enum as SAEnum, Numeric, ForeignKey, Date, Time, DateTime, func, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Text, Boolean, Enum as SAEnum, Numeric, ForeignKey, Date, Time, DateTime, func, UniqueConstraint, Index, text
 from sqlalchemy.orm import relationship
 from app.db.base import Base
 from enum import Enum
@@ -76,6 +76,21 @@ class User(Base):
     # Relationship
     role = relationship("Role", backref="users")
 
+    __table_args__ = (
+        # admin order search by customer
+        Index(
+            "idx_user_email_trgm",
+            "email",
+            postgresql_using="gin",
+            postgresql_ops={"email": "gin_trgm_ops"},
+        ),
+        Index(
+            "idx_user_full_name_trgm",
+            text("(first_name || ' ' || last_name) gin_trgm_ops"),
+            postgresql_using="gin",
+        ),
+    )
+
     # ✅ Computed Property
     @property
     def role_name(self):
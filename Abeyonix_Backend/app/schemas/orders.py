@@ -1,7 +1,7 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import List, Optional
 from decimal import Decimal
-from datetime import datetime
+from datetime import date, datetime
 
 
 class CheckoutPageRequest(BaseModel):
@@ -17,6 +17,7 @@ class CheckoutProduct(BaseModel):
     quantity: int
     total_price: Decimal
     primary_image: Optional[str]
+    available_quantity: Optional[int] = None
 
     class Config:
         from_attributes = True
@@ -161,14 +162,19 @@ class UserOrderWithItems(BaseModel):
     payment_status: str
     total_amount: Decimal
     created_at: datetime
-    items: List[UserOrderItemInfo]
-    tracking: List[OrderTrackingInfo]
+
+    # None unless requested with ?expand= on the user order list
+    items: Optional[List[UserOrderItemInfo]] = None
+    tracking: Optional[List[OrderTrackingInfo]] = None
 
 
 class UserOrderListResponse(BaseModel):
-    total_orders: int
+    total_orders: int   # orders in this page
     orders: List[UserOrderWithItems]
 
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+
 class AdminOrderListResponse(BaseModel):
     total_orders: int
     page: int
@@ -181,9 +187,43 @@ class AdminOrderListResponse(BaseModel):
     orders: List[UserOrderWithItems]
 
 
+class AdminOrderSearchResponse(BaseModel):
+    orders: List[UserOrderWithItems]
+
+    next_cursor: Optional[str] = None
+    has_more: bool = False
+
+
+
+class OrderDailyStat(BaseModel):
+    day: date
+    order_status: str
+    payment_status: str
+    order_count: int
+    total_amount: Decimal
+
+
+class OrderStatsResponse(BaseModel):
+    date_from: date
+    date_to: date
+    widgets: dict
+    days: List[OrderDailyStat]
+
+
 
 class UpdateOrderTrackingRequest(BaseModel):
     order_id: int
     status: str
     description: Optional[str] = None
-    location: Optional[str] = None
\ No newline at end of file
+    location: Optional[str] = None
+
+
+class BatchOrderTrackingRequest(BaseModel):
+    # applied in order, all or nothing
+    events: List[UpdateOrderTrackingRequest] = Field(..., min_length=1, max_length=1000)
+
+
+class BatchOrderTrackingResponse(BaseModel):
+    message: str
+    events: int
+    orders: dict[int, str]   # order_id -> current order_status
@@ -57,10 +57,28 @@ class ShopProductResponse(BaseModel):
         from_attributes = True
 
 
+class ShopFacetValue(BaseModel):
+    value: str
+    count: int
+
+
+class ShopFacet(BaseModel):
+    attribute_id: int
+    attribute_name: str
+    unit: Optional[str]
+    data_type: Optional[str]
+    values: List[ShopFacetValue]
+
+    # numeric attributes only
+    min_value: Optional[float] = None
+    max_value: Optional[float] = None
+
+
 class ShopProductScrollResponse(BaseModel):
     items: List[ShopProductResponse]
     last_id: Optional[int]
     has_more: bool
+    facets: Optional[List[ShopFacet]] = None    # only on the first page
 
 
 class ProductSearchItem(BaseModel):
@@ -75,4 +93,15 @@ class ProductSearchItem(BaseModel):
 
 class ProductSearchResponse(BaseModel):
     next_cursor: Optional[int]
-    items: List[ProductSearchItem]
\ No newline at end of file
+    items: List[ProductSearchItem]
+
+
+class ProductSuggestItem(BaseModel):
+    type: str               # product, brand, category
+    text: str
+    id: Optional[int] = None
+    slug: Optional[str] = None
+
+
+class ProductSuggestResponse(BaseModel):
+    items: List[ProductSuggestItem]
@@ -0,0 +1,120 @@
+import re
+from decimal import ROUND_HALF_UP, Decimal
+
+from sqlalchemy import Numeric, case, cast, func, update
+from sqlalchemy.orm import Session
+
+from app.models.attributes import Attribute
+from app.models.product import ProductAttributeValue
+
+NUMERIC_TYPES = {"number"}
+BOOLEAN_TYPES = {"boolean"}
+
+TRUE_VALUES = {"true", "yes", "y", "1"}
+FALSE_VALUES = {"false", "no", "n", "0"}
+
+# leading number, so '2300', '2300 KV' and '5.5' all index as numbers.
+# Same pattern in Python and in Postgres (retype_attribute_values)
+LEADING_NUMBER_PATTERN = r"^\s*(-?\d+(?:\.\d+)?)"
+_leading_number_re = re.compile(LEADING_NUMBER_PATTERN)
+
+# numeric_value is Numeric(18, 6): 12 integer digits. Larger numbers are
+# kept as text only instead of failing the save. Compared after rounding to
+# 6 places, as Postgres rounds (half away from zero) before storing
+NUMERIC_VALUE_SCALE = 6
+NUMERIC_VALUE_LIMIT = Decimal(10) ** 12
+
+TEXT_VALUE_LENGTH = 255
+
+
+def normalize_text_value(value: str) -> str:
+    return value.strip().lower()[:TEXT_VALUE_LENGTH]
+
+
+def typed_values(data_type: str | None, value: str) -> dict:
+    """
+    Typed columns for one raw attribute value, according to the
+    attribute's data_type. `value` itself is always kept for display.
+    """
+    data_type = (data_type or "").lower()
+    value = str(value)
+
+    numeric_value = None
+    if data_type in NUMERIC_TYPES:
+        match = _leading_number_re.match(value)
+        if match:
+            number = Decimal(match.group(1))
+            if abs(number) < NUMERIC_VALUE_LIMIT:
+                number = number.quantize(Decimal(10) ** -NUMERIC_VALUE_SCALE, rounding=ROUND_HALF_UP)
+            if abs(number) < NUMERIC_VALUE_LIMIT:
+                numeric_value = number
+
+    boolean_value = None
+    if data_type in BOOLEAN_TYPES:
+        lowered = value.strip().lower()
+        if lowered in TRUE_VALUES:
+            boolean_value = True
+        elif lowered in FALSE_VALUES:
+            boolean_value = False
+
+    return {
+        "numeric_value": numeric_value,
+        "boolean_value": boolean_value,
+        "text_value": normalize_text_value(value),
+    }
+
+
+def build_attribute_values(db: Session, product_id: int, attribute_list: list[dict]) -> list[ProductAttributeValue]:
+    """
+    ProductAttributeValue rows for `[{"attribute_id": .., "value": ..}]`,
+    with typed columns filled in. Data types are loaded in one query.
+    """
+    attribute_ids = {attr["attribute_id"] for attr in attribute_list}
+    if not attribute_ids:
+        return []
+
+    data_types = dict(
+        db.query(Attribute.id, Attribute.data_type)
+        .filter(Attribute.id.in_(attribute_ids))
+        .all()
+    )
+
+    return [
+        ProductAttributeValue(
+            product_id=product_id,
+            attribute_id=attr["attribute_id"],
+            value=attr["value"],
+            **typed_values(data_types.get(attr["attribute_id"]), attr["value"]),
+        )
+        for attr in attribute_list
+    ]
+
+
+def retype_attribute_values(db: Session, attribute: Attribute) -> None:
+    """
+    Recomputes the typed columns of every value of `attribute`, e.g. after
+    its data_type changed. One UPDATE, parsed in SQL the same way as
+    typed_values.
+    """
+    data_type = (attribute.data_type or "").lower()
+    value = ProductAttributeValue.value
+
+    numeric_value = None
+    if data_type in NUMERIC_TYPES:
+        number = func.round(cast(func.substring(value, LEADING_NUMBER_PATTERN), Numeric), NUMERIC_VALUE_SCALE)
+        numeric_value = case((func.abs(number) < NUMERIC_VALUE_LIMIT, number))
+
+    boolean_value = None
+    if data_type in BOOLEAN_TYPES:
+        lowered = func.lower(func.btrim(value, " \t\r\n"))
+        boolean_value = case(
+            (lowered.in_(sorted(TRUE_VALUES)), True),
+            (lowered.in_(sorted(FALSE_VALUES)), False),
+        )
+
+    db.execute(
+        update(ProductAttributeValue)
+        .where(ProductAttributeValue.attribute_id == attribute.id)
+        .values(numeric_value=numeric_value, boolean_value=boolean_value)
+        .execution_options(synchronize_session=False)
+    )
@@ -0,0 +1,30 @@
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.models.cache_version import CacheVersion
+
+
+def get_cache_version(db: Session, name: str) -> int:
+    version = db.execute(
+        select(CacheVersion.version).where(CacheVersion.name == name)
+    ).scalar()
+    return version or 0
+
+
+def bump_cache_version(db: Session, name: str) -> int:
+    """
+    Increments the version for `name` and returns the new value. Runs in
+    the caller's transaction, so the bump becomes visible only when the
+    business change commits.
+    """
+    stmt = insert(CacheVersion).values(name=name, version=1)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[CacheVersion.name],
+        set_={
+            "version": CacheVersion.version + 1,
+            "updated_at": func.now(),
+        },
+    ).returning(CacheVersion.version)
+    return db.execute(stmt).scalar_one()
@@ -0,0 +1,124 @@
+import hashlib
+import threading
+from typing import List
+
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session
+
+from app.models.categories import Category
+from app.models.sub_categories import SubCategory
+from app.schemas.shop import CategoryTreeResponse
+from app.services.cache_version import get_cache_version, bump_cache_version
+
+CATEGORY_TREE_CACHE = "category_tree"
+
+_tree_adapter = TypeAdapter(List[CategoryTreeResponse])
+
+# Per-worker cache: {"version": int, "body": bytes, "etag": str}
+_cached_tree = None
+_lock = threading.Lock()
+
+
+def build_category_tree(db: Session) -> list:
+    categories = (
+        db.query(Category)
+        .filter(Category.is_active == True)
+        .all()
+    )
+
+    sub_categories = (
+        db.query(SubCategory)
+        .filter(SubCategory.is_active == True)
+        .all()
+    )
+
+    # ----------------------------
+    # Lookup maps
+    # ----------------------------
+    category_name_map = {cat.id: cat.name for cat in categories}
+    category_children_map = {}
+    subcategory_map = {}
+
+    for cat in categories:
+        category_children_map.setdefault(cat.parent_id, []).append(cat)
+
+    for sub in sub_categories:
+        subcategory_map.setdefault(sub.category_id, []).append(sub)
+
+    # ----------------------------
+    # Recursive tree builder
+    # ----------------------------
+    def build_node(category):
+        return {
+            "id": category.id,
+            "name": category.name,
+            "slug": category.slug,
+            "image_path": category.image_path,
+            "children": [
+                build_node(child)
+                for child in category_children_map.get(category.id, [])
+            ],
+            "sub_categories": [
+                {
+                    "id": sub.id,
+                    "name": sub.name,
+                    "slug": sub.slug,
+                    "image_path": sub.image_path,
+                    "category_name": category_name_map.get(sub.category_id),
+                }
+                for sub in subcategory_map.get(category.id, [])
+            ]
+        }
+
+    # ----------------------------
+    # Root categories
+    # ----------------------------
+    return [
+        build_node(cat)
+        for cat in category_children_map.get(None, [])
+    ]
+
+
+def get_category_tree_payload(db: Session) -> tuple[bytes, str]:
+    """
+    Returns the encoded tree and its ETag. The tree is only rebuilt when
+    the shared version has moved since this worker last built it.
+    """
+    global _cached_tree
+
+    version = get_cache_version(db, CATEGORY_TREE_CACHE)
+
+    cached = _cached_tree
+    if cached and cached["version"] == version:
+        return cached["body"], cached["etag"]
+
+    with _lock:
+        cached = _cached_tree
+        if cached and cached["version"] == version:
+            return cached["body"], cached["etag"]
+
+        tree = _tree_adapter.validate_python(build_category_tree(db))
+        body = _tree_adapter.dump_json(tree)
+        etag = f'"{hashlib.sha1(body).hexdigest()}"'
+
+        _cached_tree = {"version": version, "body": body, "etag": etag}
+
+    return body, etag
+
+
+def invalidate_category_tree(db: Session) -> None:
+    bump_cache_version(db, CATEGORY_TREE_CACHE)
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    candidates = [
+        tag.strip().removeprefix("W/")
+        for tag in if_none_match.split(",")
+    ]
+    return etag in candidates
@@ -0,0 +1,146 @@
+from decimal import Decimal, ROUND_HALF_UP
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.cart import CartItem
+from app.models.product import Inventory, Pricing, Product, ProductMedia
+from app.models.stock_reservation import StockReservation
+
+TAX_RATE = Decimal("0.00")
+SHIPPING_AMOUNT = Decimal("50.00")
+
+CENTS = Decimal("0.01")
+
+
+def _line_columns():
+    """
+    Per-product columns of a checkout line, as correlated scalar
+    subqueries so the whole checkout is one statement.
+    """
+    current_price = (
+        select(func.coalesce(Pricing.discount_price, Pricing.price))
+        .where(Pricing.product_id == Product.id)
+        .order_by(Pricing.id.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+
+    primary_image = (
+        select(ProductMedia.url)
+        .where(
+            ProductMedia.product_id == Product.id,
+            ProductMedia.is_primary == True
+        )
+        .limit(1)
+        .scalar_subquery()
+    )
+
+    on_hand = (
+        select(func.coalesce(func.sum(Inventory.quantity), 0))
+        .where(Inventory.product_id == Product.id)
+        .scalar_subquery()
+    )
+
+    held = (
+        select(func.coalesce(func.sum(StockReservation.quantity), 0))
+        .where(
+            StockReservation.product_id == Product.id,
+            StockReservation.status == "HELD",
+            StockReservation.expires_at > func.now(),
+        )
+        .scalar_subquery()
+    )
+
+    return (
+        Product.id.label("product_id"),
+        Product.name.label("product_name"),
+        Product.sku.label("sku"),
+        current_price.label("current_price"),
+        primary_image.label("primary_image"),
+        (on_hand - held).label("available_quantity"),
+    )
+
+
+def _line(row, unit_price, quantity: int) -> dict:
+    return {
+        "product_id": row.product_id,
+        "product_name": row.product_name,
+        "sku": row.sku,
+        "unit_price": unit_price,
+        "quantity": quantity,
+        "total_price": unit_price * quantity,
+        "primary_image": row.primary_image,
+        "available_quantity": max(int(row.available_quantity), 0),
+    }
+
+
+def load_cart_lines(db: Session, user_id: int) -> list[dict]:
+    """
+    Active cart lines with product, primary image, current price and
+    available stock, in one query. Lines are priced at the current
+    price, falling back to the price stored in the cart.
+    """
+    rows = (
+        db.query(*_line_columns(), CartItem.quantity, CartItem.unit_price)
+        .join(CartItem, CartItem.product_id == Product.id)
+        .filter(
+            CartItem.user_id == user_id,
+            CartItem.is_active == True
+        )
+        .order_by(CartItem.created_at, CartItem.id)
+        .all()
+    )
+
+    if not rows:
+        raise HTTPException(400, "Cart is empty")
+
+    return [
+        _line(row, row.current_price if row.current_price is not None else row.unit_price, row.quantity)
+        for row in rows
+    ]
+
+
+def load_buy_now_lines(db: Session, product_id: int, quantity: int) -> list[dict]:
+    """
+    The single line of a Buy Now checkout, same columns as a cart line.
+    """
+    row = (
+        db.query(*_line_columns())
+        .filter(Product.id == product_id)
+        .first()
+    )
+
+    if not row:
+        raise HTTPException(404, "Product not found")
+
+    if row.current_price is None:
+        raise HTTPException(400, "Pricing not found")
+
+    return [_line(row, row.current_price, quantity)]
+
+
+def load_checkout_lines(db: Session, user_id: int, product_id: int | None = None, quantity: int = 1) -> list[dict]:
+    if product_id is None:
+        return load_cart_lines(db, user_id)
+    return load_buy_now_lines(db, product_id, quantity)
+
+
+def calculate_totals(lines: list[dict], discount: Decimal = Decimal("0.00")) -> dict:
+    """
+    Order amounts for priced lines. Checkout, place-order and the payment
+    order creators all use this, so the page, the amount paid and the
+    stored order agree.
+    """
+    subtotal = sum((line["total_price"] for line in lines), Decimal("0.00"))
+    tax = (subtotal * TAX_RATE).quantize(CENTS, rounding=ROUND_HALF_UP)
+    shipping = SHIPPING_AMOUNT
+
+    return {
+        "subtotal": subtotal,
+        "discount": discount,
+        "tax": tax,
+        "shipping": shipping,
+        "total_amount": subtotal - discount + tax + shipping,
+    }
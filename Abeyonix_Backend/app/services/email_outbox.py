@@ -0,0 +1,40 @@
+from sqlalchemy import event, insert
+from sqlalchemy.orm import Session
+
+from app.models.email_outbox import EmailOutbox
+
+# set on a session that queued mail, checked when it commits
+_PENDING_KEY = "email_outbox_pending"
+
+
+def enqueue_email(db: Session, to_email: str, subject: str, html_content: str) -> None:
+    """
+    Queues one message in the caller's transaction; nothing goes out
+    unless it commits.
+    """
+    enqueue_emails(db, [{"to_email": to_email, "subject": subject, "html_content": html_content}])
+
+
+def enqueue_emails(db: Session, messages: list[dict]) -> None:
+    """
+    `messages` are (to_email, subject, html_content) dicts, queued with
+    one INSERT.
+    """
+    if not messages:
+        return
+
+    db.execute(insert(EmailOutbox), messages)
+    db.info[_PENDING_KEY] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_dispatcher(session):
+    # 📧 send now instead of at the next poll
+    if session.info.pop(_PENDING_KEY, False):
+        from app.workers.email_dispatcher import wake_email_dispatcher
+        wake_email_dispatcher()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_pending(session):
+    session.info.pop(_PENDING_KEY, None)
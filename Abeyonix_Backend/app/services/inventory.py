@@ -0,0 +1,243 @@
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException
+from sqlalchemy import BigInteger, column, func, select, update, values
+from sqlalchemy.orm import Session
+
+from app.models.product import Inventory
+from app.models.stock_reservation import StockReservation
+
+# How long stock stays held while the customer is on the PhonePe page
+RESERVATION_TTL = timedelta(minutes=15)
+
+# Expired holds released per UPDATE by the sweeper
+RELEASE_BATCH_SIZE = 500
+
+
+def _requested_quantities(lines: list[dict]) -> dict[int, int]:
+    """
+    Quantity per product. Every line must ask for at least one unit: a
+    negative quantity would add stock instead of taking it.
+    """
+    for line in lines:
+        if line["quantity"] < 1:
+            raise HTTPException(400, f"Invalid quantity for {line.get('product_name') or line['product_id']}")
+
+    requested = {}
+    for line in lines:
+        requested[line["product_id"]] = requested.get(line["product_id"], 0) + line["quantity"]
+    return requested
+
+
+def _insufficient_stock_error(lines: list[dict], requested: dict, available: dict):
+    names = {line["product_id"]: line.get("product_name") for line in lines}
+
+    short = [
+        f"{names[product_id] or product_id} (requested {quantity}, available {max(available.get(product_id, 0), 0)})"
+        for product_id, quantity in requested.items()
+        if available.get(product_id, 0) < quantity
+    ]
+
+    return HTTPException(400, f"Insufficient stock for {', '.join(short)}")
+
+
+def held_quantities(db: Session, product_ids, exclude_session_id: int | None = None) -> dict[int, int]:
+    """
+    Quantity held by unexpired reservations per product, from the partial
+    index idx_stock_reservation_held_product.
+    """
+    query = (
+        db.query(StockReservation.product_id, func.sum(StockReservation.quantity))
+        .filter(
+            StockReservation.product_id.in_(product_ids),
+            StockReservation.status == "HELD",
+            StockReservation.expires_at > func.now(),
+        )
+        .group_by(StockReservation.product_id)
+    )
+
+    if exclude_session_id is not None:
+        query = query.filter(StockReservation.payment_session_id != exclude_session_id)
+
+    return {product_id: int(quantity) for product_id, quantity in query.all()}
+
+
+def _lock_available(db: Session, product_ids: list[int], exclude_session_id: int | None = None):
+    """
+    Locks the inventory rows in product_id order and returns
+    (on_hand, available) where available = on hand - other active holds.
+    """
+    on_hand = dict(
+        db.query(Inventory.product_id, Inventory.quantity)
+        .filter(Inventory.product_id.in_(product_ids))
+        .order_by(Inventory.product_id)
+        .with_for_update()
+        .all()
+    )
+
+    held = held_quantities(db, product_ids, exclude_session_id)
+
+    available = {
+        product_id: quantity - held.get(product_id, 0)
+        for product_id, quantity in on_hand.items()
+    }
+    return on_hand, available
+
+
+def reserve_inventory(db: Session, lines: list[dict], payment_session_id: int | None = None) -> None:
+    """
+    Decrements stock for every order line, or for none of them.
+
+    `lines` are order-line dicts with product_id, quantity and (for the
+    error message) product_name; repeated products are summed.
+
+    1. All inventory rows are locked in one query, always in product_id
+       order, so concurrent orders over the same products cannot deadlock.
+    2. Every short line is reported in a single 400. Stock held for other
+       payment sessions is not available.
+    3. Stock is decremented with one conditional UPDATE ... RETURNING.
+
+    With `payment_session_id`, that session's own holds are converted:
+    they stop counting as held and are marked CONVERTED.
+
+    Runs in the caller's transaction; the locks are held until it commits.
+    """
+    requested = _requested_quantities(lines)
+    if not requested:
+        return
+
+    product_ids = sorted(requested)
+
+    # 1️⃣ Lock
+    on_hand, available = _lock_available(db, product_ids, payment_session_id)
+
+    # 2️⃣ Check every line
+    if any(available.get(product_id, 0) < quantity for product_id, quantity in requested.items()):
+        raise _insufficient_stock_error(lines, requested, available)
+
+    # 3️⃣ Decrement, keeping other sessions' holds covered
+    wanted = (
+        values(
+            column("product_id", BigInteger),
+            column("quantity", BigInteger),
+            column("required", BigInteger),
+            name="wanted",
+        )
+        .data([
+            (
+                product_id,
+                requested[product_id],
+                requested[product_id] + on_hand[product_id] - available[product_id],
+            )
+            for product_id in product_ids
+        ])
+    )
+
+    updated = db.execute(
+        update(Inventory)
+        .where(
+            Inventory.product_id == wanted.c.product_id,
+            Inventory.quantity >= wanted.c.required,
+        )
+        .values(quantity=Inventory.quantity - wanted.c.quantity)
+        .returning(Inventory.product_id)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+
+    # Rows are locked, so this only trips if inventory has duplicate rows
+    if len(set(updated)) != len(product_ids):
+        raise _insufficient_stock_error(lines, requested, available)
+
+    if payment_session_id is not None:
+        db.execute(
+            update(StockReservation)
+            .where(
+                StockReservation.payment_session_id == payment_session_id,
+                StockReservation.status == "HELD",
+            )
+            .values(status="CONVERTED")
+            .execution_options(synchronize_session=False)
+        )
+
+
+# ---------------- Soft holds (payment window) ----------------
+
+def hold_inventory(db: Session, lines: list[dict], payment_session_id: int) -> datetime:
+    """
+    Holds stock for a PaymentSession without decrementing it. Holds expire
+    after RESERVATION_TTL; returns the expiry. Same locking and error
+    reporting as reserve_inventory.
+    """
+    requested = _requested_quantities(lines)
+    if not requested:
+        raise HTTPException(400, "Nothing to reserve")
+
+    product_ids = sorted(requested)
+
+    _, available = _lock_available(db, product_ids)
+
+    if any(available.get(product_id, 0) < quantity for product_id, quantity in requested.items()):
+        raise _insufficient_stock_error(lines, requested, available)
+
+    expires_at = datetime.now(timezone.utc) + RESERVATION_TTL
+
+    db.add_all([
+        StockReservation(
+            product_id=product_id,
+            payment_session_id=payment_session_id,
+            quantity=requested[product_id],
+            expires_at=expires_at,
+        )
+        for product_id in product_ids
+    ])
+
+    return expires_at
+
+
+def release_holds(db: Session, payment_session_id: int) -> None:
+    """
+    Gives a session's held stock back, e.g. when the gateway call failed.
+    """
+    db.execute(
+        update(StockReservation)
+        .where(
+            StockReservation.payment_session_id == payment_session_id,
+            StockReservation.status == "HELD",
+        )
+        .values(status="RELEASED")
+        .execution_options(synchronize_session=False)
+    )
+
+
+def release_expired_holds(db: Session, batch_size: int = RELEASE_BATCH_SIZE) -> int:
+    """
+    Marks expired holds RELEASED, `batch_size` rows per statement and
+    commit. SKIP LOCKED lets several workers sweep at once. Returns the
+    number of holds released.
+    """
+    released = 0
+
+    while True:
+        expired = (
+            select(StockReservation.id)
+            .where(
+                StockReservation.status == "HELD",
+                StockReservation.expires_at <= func.now(),
+            )
+            .order_by(StockReservation.expires_at)
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+
+        count = db.execute(
+            update(StockReservation)
+            .where(StockReservation.id.in_(expired))
+            .values(status="RELEASED")
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.commit()
+
+        released += count
+        if count < batch_size:
+            return released
@@ -0,0 +1,121 @@
+from sqlalchemy import literal_column, or_, select, tuple_, union
+from sqlalchemy.orm import Session, selectinload
+
+from app.models.orders import Order, OrderItem
+from app.models.users import User
+from app.utils.cursor import decode_keyset_cursor, encode_keyset_cursor
+
+# trigram indexes only help from three characters on
+MIN_TERM_LENGTH = 3
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _full_name():
+    # same expression as idx_user_full_name_trgm
+    return User.first_name.op("||")(literal_column("' '")).op("||")(User.last_name)
+
+
+def _order_branches(term: str) -> list:
+    """
+    One SELECT (Order.id, Order.created_at) per way an order can match,
+    each answerable from its own index:
+
+    - order number           idx_order_number_trgm
+    - customer email / name  idx_user_email_trgm, idx_user_full_name_trgm,
+                             then idx_orders_user_created
+    - product name / SKU     idx_order_item_product_name_trgm,
+                             idx_order_item_sku_trgm, then the order_id index
+    - order id               primary key (numeric terms)
+    """
+    term = term.strip()
+    columns = (Order.id, Order.created_at)
+    branches = []
+
+    if term.isdigit():
+        branches.append(select(*columns).where(Order.id == int(term)))
+
+    if len(term) < MIN_TERM_LENGTH:
+        # too short for a trigram lookup: whole order number only
+        branches.append(
+            select(*columns).where(Order.order_number.ilike(_escape_like(term), escape="\\"))
+        )
+        return branches
+
+    pattern = f"%{_escape_like(term)}%"
+
+    branches.append(
+        select(*columns).where(Order.order_number.ilike(pattern, escape="\\"))
+    )
+
+    branches.append(
+        select(*columns)
+        .join(User, User.user_id == Order.user_id)
+        .where(or_(
+            User.email.ilike(pattern, escape="\\"),
+            _full_name().ilike(pattern, escape="\\"),
+        ))
+    )
+
+    branches.append(
+        select(*columns).where(
+            Order.id.in_(
+                select(OrderItem.order_id).where(or_(
+                    OrderItem.product_name.ilike(pattern, escape="\\"),
+                    OrderItem.sku.ilike(pattern, escape="\\"),
+                ))
+            )
+        )
+    )
+
+    return branches
+
+
+def matching_order_ids(term: str):
+    """
+    SELECT of the ids of every order matching `term`, for IN filters.
+    """
+    matches = union(*_order_branches(term)).subquery()
+    return select(matches.c.id)
+
+
+def search_orders(db: Session, term: str, cursor: str | None = None, limit: int = 20):
+    """
+    Orders matching `term` by order number, customer or product, newest
+    first, keyset-paginated on (created_at, id).
+
+    Every branch applies the cursor and its own LIMIT before the UNION, so
+    a page reads at most `limit + 1` rows per branch however many orders
+    match. Returns (orders, next_cursor).
+    """
+    after = decode_keyset_cursor(cursor) if cursor else None
+
+    branches = []
+    for branch in _order_branches(term):
+        if after is not None:
+            branch = branch.where(tuple_(Order.created_at, Order.id) < after)
+
+        branches.append(
+            branch
+            .order_by(Order.created_at.desc(), Order.id.desc())
+            .limit(limit + 1)
+        )
+
+    matches = union(*branches).subquery()
+
+    orders = (
+        db.query(Order)
+        .join(matches, matches.c.id == Order.id)
+        .options(selectinload(Order.items), selectinload(Order.tracking))
+        .order_by(Order.created_at.desc(), Order.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+
+    has_more = len(orders) > limit
+    orders = orders[:limit]
+
+    next_cursor = encode_keyset_cursor(orders[-1].created_at, orders[-1].id) if has_more else None
+    return orders, next_cursor
@@ -0,0 +1,194 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+from fastapi import HTTPException
+from sqlalchemy import insert, update
+from sqlalchemy.orm import Session
+
+from app.models.cart import CartItem
+from app.models.orders import Order, OrderItem, OrderTracking
+from app.models.payment import Payment, PaymentSession
+from app.services.checkout import calculate_totals, load_buy_now_lines, load_cart_lines
+from app.services.inventory import reserve_inventory
+from app.services.order_stats import record_order_created
+from app.utils.id_generator import generate_time_based_id
+from app.utils.order_no_generator import generate_order_number
+
+
+# ---------------- Bulk writes ----------------
+#
+# OrderItem, OrderTracking and Payment take their ids from DB sequences,
+# so these inserts need no per-row Python ids: SQLAlchemy sends all rows
+# as one multi-row INSERT ... RETURNING id (insertmanyvalues batching).
+
+def bulk_insert_order_items(db: Session, order_id: int, lines: list[dict]) -> list[int]:
+    if not lines:
+        return []
+
+    return db.scalars(
+        insert(OrderItem).returning(OrderItem.id, sort_by_parameter_order=True),
+        [
+            {
+                "order_id": order_id,
+                "product_id": line["product_id"],
+                "product_name": line["product_name"],
+                "sku": line["sku"],
+                "unit_price": line["unit_price"],
+                "quantity": line["quantity"],
+                "total_price": line["total_price"],
+            }
+            for line in lines
+        ],
+    ).all()
+
+
+def bulk_insert_tracking(db: Session, rows: list[dict]) -> list[int]:
+    """
+    `rows` are OrderTracking column dicts (order_id, status, description,
+    location).
+    """
+    if not rows:
+        return []
+
+    # render_nulls: rows with and without a description / location still
+    # go in one INSERT instead of one per set of non-null keys
+    return db.scalars(
+        insert(OrderTracking)
+        .returning(OrderTracking.id, sort_by_parameter_order=True)
+        .execution_options(render_nulls=True),
+        rows,
+    ).all()
+
+
+def bulk_insert_payments(db: Session, rows: list[dict]) -> list[int]:
+    if not rows:
+        return []
+
+    return db.scalars(
+        insert(Payment).returning(Payment.id, sort_by_parameter_order=True),
+        rows,
+    ).all()
+
+
+class OrderService:
+    """
+    The one order-creation path, used by place-order (COD) and by the
+    payment callback / reconciliation (PhonePe).
+
+    Everything runs in the caller's transaction and nothing is committed
+    here: stock, order, items, tracking, payment and cart clearing commit
+    (or roll back) together with whatever the caller does.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def create_order(
+        self,
+        user_id: int,
+        shipping_address_id: int,
+        lines: list[dict],
+        clear_cart: bool = False,
+        payment_session: PaymentSession | None = None,
+    ) -> Order:
+        """
+        `lines` come from load_cart_lines / load_buy_now_lines. With a
+        `payment_session` the order is paid: its held stock is converted
+        and a Payment row is recorded.
+        """
+        db = self.db
+
+        # 🔒 one ordered lock + one conditional UPDATE for every line
+        reserve_inventory(
+            db,
+            lines,
+            payment_session_id=payment_session.id if payment_session else None,
+        )
+
+        totals = calculate_totals(lines)
+
+        order = Order(
+            id=generate_time_based_id(),
+            user_id=user_id,
+            order_number=generate_order_number(),
+            subtotal_amount=totals["subtotal"],
+            discount_amount=totals["discount"],
+            tax_amount=totals["tax"],
+            shipping_amount=totals["shipping"],
+            total_amount=totals["total_amount"],
+            order_status="PLACED",
+            payment_status="SUCCESS" if payment_session else "PENDING",
+            shipping_address_id=shipping_address_id,
+        )
+        db.add(order)
+        db.flush()
+
+        # ⚡ one INSERT per table, whatever the number of lines
+        bulk_insert_order_items(db, order.id, lines)
+
+        bulk_insert_tracking(db, [{
+            "order_id": order.id,
+            "status": "PLACED",
+            "description": "Order successfully placed",
+        }])
+
+        if payment_session is not None:
+            bulk_insert_payments(db, [{
+                "order_id": order.id,
+                "payment_method": "UPI",
+                "payment_gateway": "PHONEPE",
+                "transaction_id": payment_session.transaction_id,
+                "amount": Decimal(payment_session.amount) / 100,   # session amount is in paise
+                "payment_status": "SUCCESS",
+                "paid_at": datetime.now(timezone.utc),
+            }])
+
+        if clear_cart:
+            db.execute(
+                update(CartItem)
+                .where(
+                    CartItem.user_id == user_id,
+                    CartItem.is_active == True
+                )
+                .values(is_active=False)
+                .execution_options(synchronize_session=False)
+            )
+
+        # 📊 dashboard counters; last, so the hot counter row is locked briefly
+        record_order_created(db, order)
+
+        db.flush()
+
+        return order
+
+    def create_from_payment_session(self, session: PaymentSession) -> Order:
+        """
+        Order for a paid PaymentSession, from the lines it was started for.
+        """
+        payload = session.payload or {}
+
+        if session.flow_type == "CART":
+            lines = load_cart_lines(self.db, session.user_id)
+            clear_cart = True
+
+        elif session.flow_type == "BUY_NOW":
+            lines = load_buy_now_lines(
+                self.db,
+                payload.get("product_id"),
+                int(payload.get("quantity") or 1),
+            )
+            clear_cart = False
+
+        else:
+            raise HTTPException(400, "Invalid flow type")
+
+        if not payload.get("shipping_address_id"):
+            raise HTTPException(400, "Shipping address is required")
+
+        return self.create_order(
+            user_id=session.user_id,
+            shipping_address_id=payload["shipping_address_id"],
+            lines=lines,
+            clear_cart=clear_cart,
+            payment_session=session,
+        )
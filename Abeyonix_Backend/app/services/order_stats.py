@@ -0,0 +1,177 @@
+import random
+from datetime import date, timezone
+
+from sqlalchemy import Date, cast, delete, func, literal, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.order_stats import OrderStat
+from app.models.orders import Order
+
+STATS_SHARDS = 4
+
+# statuses that no longer count as active on the admin widgets
+CLOSED_ORDER_STATUSES = ("DELIVERED", "CANCELLED")
+
+
+def _utc_day(timestamp):
+    return cast(func.timezone("UTC", timestamp), Date)
+
+
+def _add(db: Session, rows: list[dict]) -> None:
+    """
+    Adds order_count / total_amount deltas (day, order_status,
+    payment_status, order_count, total_amount) to their counters in one
+    upsert. Runs in the caller's transaction.
+
+    One shard is picked for the whole upsert and the rows are written in
+    (day, order_status, payment_status) order, so two transactions always
+    lock shared counter rows in the same order and can't deadlock.
+    """
+    shard = random.randrange(STATS_SHARDS)
+    rows = [
+        {**row, "shard": shard}
+        for row in sorted(rows, key=lambda row: (row["day"], row["order_status"], row["payment_status"]))
+    ]
+
+    stmt = insert(OrderStat).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[
+            OrderStat.day,
+            OrderStat.order_status,
+            OrderStat.payment_status,
+            OrderStat.shard,
+        ],
+        set_={
+            "order_count": OrderStat.order_count + stmt.excluded.order_count,
+            "total_amount": OrderStat.total_amount + stmt.excluded.total_amount,
+        },
+    )
+    db.execute(stmt)
+
+
+def record_order_created(db: Session, order: Order) -> None:
+    """
+    Counts a new order. now() is the transaction start, the same value
+    the order's created_at gets.
+    """
+    _add(db, [{
+        "day": _utc_day(func.now()),
+        "order_status": order.order_status,
+        "payment_status": order.payment_status,
+        "order_count": 1,
+        "total_amount": order.total_amount,
+    }])
+
+
+def record_status_changes(db: Session, changes: list[dict]) -> None:
+    """
+    Moves orders from their old (order_status, payment_status) counter to
+    the new one, on the day each was created. Each change has created_at,
+    total_amount and the "old" / "new" (order_status, payment_status).
+
+    Deltas are summed per counter first: one upsert can't touch the same
+    row twice.
+    """
+    deltas = {}
+
+    for change in changes:
+        if change["old"] == change["new"]:
+            continue
+
+        # same day as _utc_day(Order.created_at)
+        day = change["created_at"].astimezone(timezone.utc).date()
+
+        for (order_status, payment_status), sign in ((change["old"], -1), (change["new"], 1)):
+            key = (day, order_status, payment_status)
+            count, amount = deltas.get(key, (0, 0))
+            deltas[key] = (count + sign, amount + sign * change["total_amount"])
+
+    if not deltas:
+        return
+
+    _add(db, [
+        {
+            "day": day,
+            "order_status": order_status,
+            "payment_status": payment_status,
+            "order_count": count,
+            "total_amount": amount,
+        }
+        for (day, order_status, payment_status), (count, amount) in deltas.items()
+    ])
+
+
+def get_order_widgets(db: Session) -> dict:
+    """
+    Admin order-list widgets from the counters: the cost depends on the
+    number of days and statuses, not on the number of orders.
+    """
+    counts = dict(
+        db.query(OrderStat.order_status, func.sum(OrderStat.order_count))
+        .group_by(OrderStat.order_status)
+        .all()
+    )
+
+    total_orders = int(sum(counts.values(), 0))
+    closed = sum(int(counts.get(status) or 0) for status in CLOSED_ORDER_STATUSES)
+
+    return {
+        "total_orders": total_orders,
+        "active_orders": total_orders - closed,
+        "delivered_orders": int(counts.get("DELIVERED") or 0),
+    }
+
+
+def get_daily_order_stats(db: Session, date_from: date, date_to: date) -> list[dict]:
+    rows = (
+        db.query(
+            OrderStat.day,
+            OrderStat.order_status,
+            OrderStat.payment_status,
+            func.sum(OrderStat.order_count).label("order_count"),
+            func.sum(OrderStat.total_amount).label("total_amount"),
+        )
+        .filter(OrderStat.day.between(date_from, date_to))
+        .group_by(OrderStat.day, OrderStat.order_status, OrderStat.payment_status)
+        .having(func.sum(OrderStat.order_count) != 0)
+        .order_by(OrderStat.day, OrderStat.order_status, OrderStat.payment_status)
+        .all()
+    )
+
+    return [
+        {
+            "day": row.day,
+            "order_status": row.order_status,
+            "payment_status": row.payment_status,
+            "order_count": int(row.order_count),
+            "total_amount": row.total_amount,
+        }
+        for row in rows
+    ]
+
+
+def rebuild_order_stats(db: Session) -> None:
+    """
+    Recomputes every counter from the orders table, e.g. after a manual
+    data fix. Order writes wait on the table lock until the caller commits.
+    """
+    db.execute(text("LOCK TABLE order_stats IN SHARE ROW EXCLUSIVE MODE"))
+    db.execute(delete(OrderStat))
+    db.execute(
+        insert(OrderStat).from_select(
+            ["day", "order_status", "payment_status", "shard", "order_count", "total_amount"],
+            select(
+                _utc_day(Order.created_at),
+                Order.order_status,
+                Order.payment_status,
+                literal(0),
+                func.count(),
+                func.coalesce(func.sum(Order.total_amount), 0),
+            ).group_by(
+                _utc_day(Order.created_at),
+                Order.order_status,
+                Order.payment_status,
+            ),
+        )
+    )
@@ -0,0 +1,131 @@
+from fastapi import HTTPException
+from sqlalchemy import BigInteger, String, column, func, select, update, values
+from sqlalchemy.orm import Session
+
+from app.models.orders import Order
+from app.services.order_service import bulk_insert_tracking
+from app.services.order_stats import record_status_changes
+
+# Order lifecycle: status -> statuses it may move to next.
+# A status may follow itself while the parcel is moving (new location).
+ORDER_STATUS_TRANSITIONS = {
+    "PLACED": {"CONFIRMED", "PROCESSING", "SHIPPED", "CANCELLED"},
+    "CONFIRMED": {"PROCESSING", "SHIPPED", "CANCELLED"},
+    "PROCESSING": {"SHIPPED", "CANCELLED"},
+    "SHIPPED": {"SHIPPED", "OUT_FOR_DELIVERY", "DELIVERED", "RETURNED"},
+    "OUT_FOR_DELIVERY": {"OUT_FOR_DELIVERY", "SHIPPED", "DELIVERED", "RETURNED"},
+    "DELIVERED": {"RETURNED"},
+    "RETURNED": {"REFUNDED"},
+    "CANCELLED": {"REFUNDED"},
+    "REFUNDED": set(),
+}
+
+
+def check_transition(current: str, new: str) -> str | None:
+    """
+    Error message when an order in `current` can't move to `new`, else None.
+
+    Statuses outside the table (custom checkpoints like "ARRIVED_AT_HUB")
+    are timeline entries only and never change the order status. Orders
+    already in an unknown status (older data) are not checked.
+    """
+    if new not in ORDER_STATUS_TRANSITIONS:
+        return None
+
+    allowed = ORDER_STATUS_TRANSITIONS.get(current)
+    if allowed is None or new in allowed:
+        return None
+
+    return f"cannot move from {current} to {new}"
+
+
+def apply_tracking_events(db: Session, events: list[dict]) -> dict[int, str]:
+    """
+    Adds tracking events (order_id, status, description, location) and
+    moves each order to its latest lifecycle status, in the caller's
+    transaction.
+
+    Events apply in list order, so one batch may carry several steps of
+    the same order. Nothing is written unless every event is valid. The
+    orders are locked up front (in id order, so concurrent batches don't
+    deadlock); the writes are one bulk INSERT for the timeline and one
+    UPDATE ... FROM (VALUES ...) for the order statuses.
+
+    Returns {order_id: current order_status}.
+    """
+    order_ids = sorted({event["order_id"] for event in events})
+
+    orders = {
+        row.id: row
+        for row in db.execute(
+            select(Order.id, Order.order_status, Order.payment_status, Order.total_amount, Order.created_at)
+            .where(Order.id.in_(order_ids))
+            .order_by(Order.id)
+            .with_for_update()
+        )
+    }
+
+    missing = [str(order_id) for order_id in order_ids if order_id not in orders]
+    if missing:
+        raise HTTPException(404, f"Order not found: {', '.join(missing)}")
+
+    # ✅ walk the state machine in memory
+    current = {order_id: row.order_status for order_id, row in orders.items()}
+    errors = []
+
+    for index, event in enumerate(events):
+        order_id, new_status = event["order_id"], event["status"]
+
+        error = check_transition(current[order_id], new_status)
+        if error:
+            errors.append(f"#{index} order {order_id}: {error}")
+        elif new_status in ORDER_STATUS_TRANSITIONS:
+            current[order_id] = new_status
+
+    if errors:
+        raise HTTPException(400, "Invalid status change: " + "; ".join(errors))
+
+    # 📝 timeline
+    bulk_insert_tracking(db, [
+        {
+            "order_id": event["order_id"],
+            "status": event["status"],
+            "description": event.get("description"),
+            "location": event.get("location"),
+        }
+        for event in events
+    ])
+
+    # 🔄 latest status, one statement for every changed order
+    changed = {
+        order_id: status
+        for order_id, status in current.items()
+        if status != orders[order_id].order_status
+    }
+
+    if changed:
+        latest = values(
+            column("id", BigInteger),
+            column("order_status", String),
+            name="latest",
+        ).data(list(changed.items()))
+
+        db.execute(
+            update(Order)
+            .where(Order.id == latest.c.id)
+            .values(order_status=latest.c.order_status, updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+
+        # 📊 move the orders between dashboard counters
+        record_status_changes(db, [
+            {
+                "created_at": orders[order_id].created_at,
+                "total_amount": orders[order_id].total_amount,
+                "old": (orders[order_id].order_status, orders[order_id].payment_status),
+                "new": (status, orders[order_id].payment_status),
+            }
+            for order_id, status in changed.items()
+        ])
+
+    return current
@@ -0,0 +1,105 @@
+from fastapi import HTTPException
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import func
+
+from app.models.payment import PaymentSession
+from app.services.inventory import release_holds
+from app.services.order_service import OrderService
+
+
+def stored_callback_result(db: Session, transaction_id: str):
+    """
+    Outcome of an already processed session, by the unique
+    transaction_id index.
+    """
+    session = db.query(
+        PaymentSession.status,
+        PaymentSession.callback_result,
+    ).filter(
+        PaymentSession.transaction_id == transaction_id
+    ).first()
+
+    if not session:
+        raise HTTPException(404, "Session not found")
+
+    if session.status == "SUCCESS":
+        return session.callback_result or {"message": "Already processed"}
+
+    detail = (session.callback_result or {}).get("detail") or f"Payment session is {session.status}"
+    raise HTTPException(400, detail)
+
+
+def fail_payment_session(db: Session, session_id: int, detail, status: str = "FAILED") -> bool:
+    """
+    Moves an INITIATED session to FAILED (or EXPIRED) and gives its held
+    stock back. Returns False if the session was already processed.
+    """
+    failed = db.execute(
+        update(PaymentSession)
+        .where(
+            PaymentSession.id == session_id,
+            PaymentSession.status == "INITIATED",
+        )
+        .values(
+            status=status,
+            callback_result={"detail": detail},
+            processed_at=func.now(),
+        )
+    ).rowcount
+
+    if failed:
+        release_holds(db, session_id)
+    db.commit()
+
+    return bool(failed)
+
+
+def finalize_payment_session(db: Session, transaction_id: str) -> dict:
+    """
+    Creates the order for a paid session, exactly once. Used by the
+    PhonePe callback and by the reconciliation worker, so whichever sees
+    the payment first creates the order and the other gets the stored
+    result.
+    """
+
+    # ⚡ Claim the session: only one request moves it out of INITIATED.
+    # A concurrent retry blocks on the row lock until this transaction
+    # ends, then matches nothing and gets the stored result instead.
+    session_id = db.execute(
+        update(PaymentSession)
+        .where(
+            PaymentSession.transaction_id == transaction_id,
+            PaymentSession.status == "INITIATED",
+        )
+        .values(status="SUCCESS")
+        .returning(PaymentSession.id)
+    ).scalar()
+
+    if session_id is None:
+        db.rollback()
+        return stored_callback_result(db, transaction_id)
+
+    session = db.get(PaymentSession, session_id)
+
+    try:
+        order = OrderService(db).create_from_payment_session(session)
+
+        result = {
+            "message": "Order created",
+            "order_id": order.id,
+            "order_number": order.order_number,
+        }
+
+        session.callback_result = result
+        session.processed_at = func.now()
+
+        # order, payment and session state commit together
+        db.commit()
+
+    except HTTPException as e:
+        db.rollback()
+        fail_payment_session(db, session_id, e.detail)
+        raise
+
+    return result
@@ -0,0 +1,158 @@
+from sqlalchemy import func, literal_column, select
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.orm import Session
+
+from app.models.attributes import Attribute
+from app.models.categories import Category
+from app.models.sub_categories import SubCategory
+from app.models.product import (
+    Product,
+    ProductAttributeValue,
+    ProductMedia,
+    Pricing,
+    Inventory,
+)
+from app.utils.ttl_cache import TTLCache
+
+# Writes in this worker invalidate immediately; other workers pick up a
+# change once their copy expires.
+PRODUCT_DETAIL_TTL_SECONDS = 30
+
+product_detail_cache = TTLCache(ttl_seconds=PRODUCT_DETAIL_TTL_SECONDS, max_entries=2000)
+
+
+def _json_list(columns: dict, order_by, *conditions, join=None):
+    """
+    Correlated `SELECT coalesce(json_agg(json_build_object(..) ORDER BY ..), '[]')`
+    scalar subquery: one JSON array per product row.
+    """
+    fields = []
+    for name, column in columns.items():
+        fields.extend([name, column])
+
+    stmt = select(func.coalesce(
+        func.json_agg(aggregate_order_by(func.json_build_object(*fields), order_by)),
+        literal_column("'[]'::json"),
+    ))
+    if join is not None:
+        stmt = stmt.select_from(join)
+    return stmt.where(*conditions).scalar_subquery()
+
+
+def load_product_detail(db: Session, *conditions) -> dict | None:
+    """
+    Product with category names, pricing, inventory, media and attributes
+    in a single query (media and attributes are aggregated to JSON).
+    """
+    media = _json_list(
+        {
+            "id": ProductMedia.id,
+            "url": ProductMedia.url,
+            "media_type": ProductMedia.media_type,
+            "is_primary": ProductMedia.is_primary,
+        },
+        ProductMedia.id,
+        ProductMedia.product_id == Product.id,
+    )
+
+    attributes = _json_list(
+        {
+            "attribute_id": ProductAttributeValue.attribute_id,
+            "attribute_name": Attribute.name,
+            "unit": Attribute.unit,
+            "value": ProductAttributeValue.value,
+        },
+        ProductAttributeValue.id,
+        ProductAttributeValue.product_id == Product.id,
+        join=ProductAttributeValue.__table__.join(
+            Attribute, Attribute.id == ProductAttributeValue.attribute_id
+        ),
+    )
+
+    row = (
+        db.query(
+            Product,
+            Category.name.label("category_name"),
+            SubCategory.name.label("sub_category_name"),
+            Pricing.price,
+            Pricing.discount_price,
+            Inventory.quantity,
+            Inventory.low_quantity_alert_at,
+            media.label("media"),
+            attributes.label("attributes"),
+        )
+        .outerjoin(Category, Category.id == Product.category_id)
+        .outerjoin(SubCategory, SubCategory.id == Product.sub_category_id)
+        .outerjoin(Pricing, Pricing.product_id == Product.id)
+        .outerjoin(Inventory, Inventory.product_id == Product.id)
+        .filter(*conditions)
+        .first()
+    )
+
+    if not row:
+        return None
+
+    product = row.Product
+
+    return {
+        "id": product.id,
+        "name": product.name,
+        "sku": product.sku,
+        "slug": product.slug,
+
+        "category_id": product.category_id,
+        "category_name": row.category_name,
+
+        "sub_category_id": product.sub_category_id,
+        "sub_category_name": row.sub_category_name,
+
+        "brand": product.brand,
+        "short_description": product.short_description,
+        "long_description": product.long_description,
+
+        "is_active": product.is_active,
+        "created_at": product.created_at,
+        "updated_at": product.updated_at,
+
+        "pricing": {
+            "price": row.price,
+            "discount_price": row.discount_price,
+        } if row.price is not None else None,
+        "inventory": {
+            "quantity": row.quantity,
+            "low_quantity_alert_at": row.low_quantity_alert_at,
+        } if row.quantity is not None else None,
+        "attributes": row.attributes,
+        "media": row.media,
+    }
+
+
+def get_product_detail(db: Session, product_id: int) -> dict | None:
+    key = ("id", product_id)
+    detail = product_detail_cache.get(key)
+    if detail is None:
+        detail = load_product_detail(db, Product.id == product_id)
+        if detail is not None:
+            product_detail_cache.set(key, detail, tag=product_id)
+    return detail
+
+
+def get_product_detail_by_slug(db: Session, slug: str) -> dict | None:
+    """
+    Active products only, served by idx_product_slug_active.
+    """
+    key = ("slug", slug)
+    detail = product_detail_cache.get(key)
+    if detail is None:
+        detail = load_product_detail(db, Product.slug == slug, Product.is_active == True)
+        if detail is not None:
+            product_detail_cache.set(key, detail, tag=detail["id"])
+    return detail
+
+
+def invalidate_product_detail(product_id: int) -> None:
+    """
+    Call after the change is committed, so a concurrent read cannot cache
+    the old row again.
+    """
+    product_detail_cache.invalidate(product_id)
@@ -0,0 +1,229 @@
+import csv
+import io
+import json
+import tempfile
+from datetime import datetime
+from decimal import Decimal
+
+from openpyxl import Workbook
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal
+from app.models.attributes import Attribute
+from app.models.categories import Category
+from app.models.sub_categories import SubCategory
+from app.models.product import (
+    Product,
+    ProductAttributeValue,
+    ProductMedia,
+    Pricing,
+    Inventory,
+)
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+# Bytes per chunk when streaming a finished XLSX file
+FILE_CHUNK_SIZE = 64 * 1024
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "xlsx": ("application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "xlsx"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+}
+
+# Same names as the import columns, so an export can be edited and re-imported
+COLUMNS = [
+    "id",
+    "sku",
+    "name",
+    "slug",
+    "category_id",
+    "category_name",
+    "sub_category_id",
+    "sub_category_name",
+    "brand",
+    "short_description",
+    "long_description",
+    "is_active",
+    "price",
+    "discount_price",
+    "quantity",
+    "low_quantity_alert_at",
+    "primary_image",
+]
+
+
+def _export_query(filters: list):
+    primary_image = (
+        select(ProductMedia.url)
+        .where(
+            ProductMedia.product_id == Product.id,
+            ProductMedia.is_primary == True,
+        )
+        .order_by(ProductMedia.id)
+        .limit(1)
+        .scalar_subquery()
+    )
+
+    attributes = (
+        select(func.json_agg(func.json_build_object(
+            "attribute_id", ProductAttributeValue.attribute_id,
+            "attribute_name", Attribute.name,
+            "unit", Attribute.unit,
+            "value", ProductAttributeValue.value,
+        )))
+        .select_from(ProductAttributeValue)
+        .join(Attribute, Attribute.id == ProductAttributeValue.attribute_id)
+        .where(ProductAttributeValue.product_id == Product.id)
+        .scalar_subquery()
+    )
+
+    return (
+        select(
+            Product.id,
+            Product.sku,
+            Product.name,
+            Product.slug,
+            Product.category_id,
+            Category.name.label("category_name"),
+            Product.sub_category_id,
+            SubCategory.name.label("sub_category_name"),
+            Product.brand,
+            Product.short_description,
+            Product.long_description,
+            Product.is_active,
+            Pricing.price,
+            Pricing.discount_price,
+            Inventory.quantity,
+            Inventory.low_quantity_alert_at,
+            primary_image.label("primary_image"),
+            attributes.label("attributes"),
+        )
+        .outerjoin(Category, Category.id == Product.category_id)
+        .outerjoin(SubCategory, SubCategory.id == Product.sub_category_id)
+        .outerjoin(Pricing, Pricing.product_id == Product.id)
+        .outerjoin(Inventory, Inventory.product_id == Product.id)
+        .where(*filters)
+        .order_by(Product.id)
+    )
+
+
+def _iter_rows(filters: list):
+    """
+    Streams export rows from a server-side cursor, EXPORT_BATCH_SIZE at a
+    time. Uses its own session because the response outlives the request
+    handler.
+    """
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            _export_query(filters).execution_options(yield_per=EXPORT_BATCH_SIZE)
+        )
+        for row in result:
+            yield row
+    finally:
+        db.close()
+
+
+def _attribute_columns(db: Session, filters: list) -> list[tuple[int, str]]:
+    """
+    (attribute_id, "attr[<id>]") for every attribute used by the exported
+    products, so CSV / XLSX can have one column per attribute.
+    """
+    rows = (
+        db.query(ProductAttributeValue.attribute_id)
+        .join(Product, Product.id == ProductAttributeValue.product_id)
+        .filter(*filters)
+        .distinct()
+        .order_by(ProductAttributeValue.attribute_id)
+        .all()
+    )
+    return [(attribute_id, f"attr[{attribute_id}]") for (attribute_id,) in rows]
+
+
+def _flat_row(row, attribute_columns) -> list:
+    values = {a["attribute_id"]: a["value"] for a in row.attributes or []}
+    return [getattr(row, column) for column in COLUMNS] + [
+        values.get(attribute_id) for attribute_id, _ in attribute_columns
+    ]
+
+
+def _json_default(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+# ---------------- Writers ----------------
+
+def _stream_csv(filters: list, attribute_columns: list):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    # BOM so Excel opens UTF-8 correctly
+    buffer.write("\ufeff")
+    writer.writerow(COLUMNS + [name for _, name in attribute_columns])
+
+    for count, row in enumerate(_iter_rows(filters), start=1):
+        writer.writerow(_flat_row(row, attribute_columns))
+        if count % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue()
+
+
+def _stream_ndjson(filters: list):
+    batch = []
+    for row in _iter_rows(filters):
+        item = {column: getattr(row, column) for column in COLUMNS}
+        item["attributes"] = row.attributes or []
+        batch.append(json.dumps(item, default=_json_default))
+
+        if len(batch) >= EXPORT_BATCH_SIZE:
+            yield "\n".join(batch) + "\n"
+            batch = []
+
+    if batch:
+        yield "\n".join(batch) + "\n"
+
+
+def _stream_xlsx(filters: list, attribute_columns: list):
+    # write-only workbooks keep rows on disk, not in memory; the finished
+    # file is then streamed from a temp file
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Products")
+    sheet.append(COLUMNS + [name for _, name in attribute_columns])
+
+    for row in _iter_rows(filters):
+        sheet.append(_flat_row(row, attribute_columns))
+
+    with tempfile.TemporaryFile() as file:
+        workbook.save(file)
+        file.seek(0)
+        while chunk := file.read(FILE_CHUNK_SIZE):
+            yield chunk
+
+
+def stream_product_export(db: Session, export_format: str, filters: list):
+    """
+    Returns (chunks, media_type, filename) for a full catalog export.
+    `db` is only used up front; rows are read from a separate session.
+    """
+    media_type, extension = EXPORT_FORMATS[export_format]
+    filename = f"products-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.{extension}"
+
+    if export_format == "ndjson":
+        return _stream_ndjson(filters), media_type, filename
+
+    attribute_columns = _attribute_columns(db, filters)
+
+    if export_format == "xlsx":
+        return _stream_xlsx(filters, attribute_columns), media_type, filename
+
+    return _stream_csv(filters, attribute_columns), media_type, filename
@@ -0,0 +1,163 @@
+import re
+from decimal import Decimal, InvalidOperation
+
+from fastapi import HTTPException
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.attributes import Attribute
+from app.models.product import ProductAttributeValue
+from app.services.attribute_values import (
+    NUMERIC_TYPES,
+    BOOLEAN_TYPES,
+    TRUE_VALUES,
+    FALSE_VALUES,
+    normalize_text_value,
+)
+
+# ?attr[<attribute_id>]=<value>           equality, repeat the key for OR
+# ?attr[<attribute_id>]=<min>..<max>      numeric range, either side optional
+ATTR_PARAM_RE = re.compile(r"^attr\[(\d+)\]$")
+RANGE_SEPARATOR = ".."
+
+
+def parse_attribute_filters(query_params) -> dict[int, list[str]]:
+    filters = {}
+    for key, value in query_params.multi_items():
+        match = ATTR_PARAM_RE.match(key)
+        if match and value != "":
+            filters.setdefault(int(match.group(1)), []).append(value)
+    return filters
+
+
+def _parse_bound(raw: str, attribute_id: int) -> Decimal | None:
+    raw = raw.strip()
+    if not raw:
+        return None
+    try:
+        return Decimal(raw)
+    except InvalidOperation:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid range bound '{raw}' for attribute {attribute_id}"
+        )
+
+
+def _value_condition(attribute_id: int, raw: str, data_type: str):
+    # every branch is served by an (attribute_id, <typed column>) index
+    if data_type in NUMERIC_TYPES and RANGE_SEPARATOR in raw:
+        low, high = raw.split(RANGE_SEPARATOR, 1)
+        low = _parse_bound(low, attribute_id)
+        high = _parse_bound(high, attribute_id)
+
+        numeric_value = ProductAttributeValue.numeric_value
+        conditions = []
+        if low is not None:
+            conditions.append(numeric_value >= low)
+        if high is not None:
+            conditions.append(numeric_value <= high)
+        return and_(*conditions) if conditions else numeric_value.isnot(None)
+
+    if data_type in NUMERIC_TYPES:
+        return ProductAttributeValue.numeric_value == _parse_bound(raw, attribute_id)
+
+    if data_type in BOOLEAN_TYPES:
+        lowered = raw.strip().lower()
+        if lowered in TRUE_VALUES | FALSE_VALUES:
+            return ProductAttributeValue.boolean_value == (lowered in TRUE_VALUES)
+
+    return ProductAttributeValue.text_value == normalize_text_value(raw)
+
+
+def attribute_filter_clauses(db: Session, filters: dict[int, list[str]], product_id_column):
+    """
+    One `product_id IN (...)` clause per attribute: values of the same
+    attribute are OR'ed, different attributes are AND'ed.
+    """
+    if not filters:
+        return []
+
+    data_types = dict(
+        db.query(Attribute.id, Attribute.data_type)
+        .filter(Attribute.id.in_(filters.keys()))
+        .all()
+    )
+
+    missing = set(filters) - set(data_types)
+    if missing:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown attribute id(s): {sorted(missing)}"
+        )
+
+    clauses = []
+    for attribute_id, values in filters.items():
+        data_type = (data_types[attribute_id] or "").lower()
+
+        matching_products = (
+            select(ProductAttributeValue.product_id)
+            .where(
+                ProductAttributeValue.attribute_id == attribute_id,
+                or_(*[_value_condition(attribute_id, raw, data_type) for raw in values]),
+            )
+        )
+        clauses.append(product_id_column.in_(matching_products))
+
+    return clauses
+
+
+def compute_facets(db: Session, product_ids) -> list[dict]:
+    """
+    Value counts per attribute for the products selected by `product_ids`
+    (a SELECT of product ids), in one aggregated query.
+
+    Values are grouped on text_value, the normalized form filters match
+    on, so "Red" and "red " are one facet, shown in its most common
+    spelling.
+    """
+    rows = (
+        db.query(
+            ProductAttributeValue.attribute_id,
+            Attribute.name,
+            Attribute.unit,
+            Attribute.data_type,
+            func.mode().within_group(func.btrim(ProductAttributeValue.value)).label("value"),
+            func.min(ProductAttributeValue.numeric_value).label("numeric_value"),
+            func.count(func.distinct(ProductAttributeValue.product_id)).label("count"),
+        )
+        .join(Attribute, Attribute.id == ProductAttributeValue.attribute_id)
+        .filter(ProductAttributeValue.product_id.in_(product_ids))
+        .group_by(
+            ProductAttributeValue.attribute_id,
+            Attribute.name,
+            Attribute.unit,
+            Attribute.data_type,
+            ProductAttributeValue.text_value,
+        )
+        .all()
+    )
+
+    facets = {}
+    for row in rows:
+        facet = facets.setdefault(row.attribute_id, {
+            "attribute_id": row.attribute_id,
+            "attribute_name": row.name,
+            "unit": row.unit,
+            "data_type": row.data_type,
+            "values": [],
+            "min_value": None,
+            "max_value": None,
+        })
+        facet["values"].append({"value": row.value, "count": row.count})
+
+        if row.numeric_value is not None:
+            number = float(row.numeric_value)
+            if facet["min_value"] is None or number < facet["min_value"]:
+                facet["min_value"] = number
+            if facet["max_value"] is None or number > facet["max_value"]:
+                facet["max_value"] = number
+
+    for facet in facets.values():
+        facet["values"].sort(key=lambda v: (-v["count"], v["value"]))
+
+    return sorted(facets.values(), key=lambda f: f["attribute_name"])
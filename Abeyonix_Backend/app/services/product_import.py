@@ -0,0 +1,432 @@
+import csv
+import io
+from decimal import Decimal, InvalidOperation
+from zipfile import BadZipFile
+
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.attributes import Attribute
+from app.models.categories import Category
+from app.models.sub_categories import SubCategory
+from app.models.product import Product, ProductAttributeValue, Pricing, Inventory
+from app.services.attribute_values import typed_values
+from app.services.product_facets import ATTR_PARAM_RE
+from app.services.product_search import refresh_product_search_vectors
+from app.services.product_suggest import suggest_index, invalidate_product_suggestions
+from app.utils.id_generator import generate_time_based_ids
+from app.utils.slug import generate_slug, generate_sku
+
+# Rows validated, inserted and committed together
+IMPORT_CHUNK_SIZE = 500
+
+REQUIRED_COLUMNS = ["name", "category_id", "price", "quantity", "low_quantity_alert_at"]
+
+# Column sizes on Product, checked per row so one long value cannot fail a chunk
+MAX_LENGTHS = {"name": 150, "sku": 100, "brand": 150, "short_description": 500}
+
+# Attribute columns use the shop filter syntax: attr[<attribute_id>]
+
+
+class ImportFileError(ValueError):
+    pass
+
+
+# ---------------- Reading ----------------
+
+def _clean(value) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value).strip()
+
+
+def _iter_csv_rows(file):
+    reader = csv.reader(io.TextIOWrapper(file, encoding="utf-8-sig", newline=""))
+    try:
+        for row in reader:
+            yield [_clean(value) for value in row]
+    except (UnicodeDecodeError, csv.Error) as e:
+        raise ImportFileError(f"Could not read CSV file (UTF-8 expected): {e}")
+
+
+def _iter_xlsx_rows(file):
+    # read_only streams the sheet instead of loading it into memory
+    try:
+        workbook = load_workbook(file, read_only=True, data_only=True)
+    except (InvalidFileException, BadZipFile) as e:
+        raise ImportFileError(f"Could not read XLSX file: {e}")
+    try:
+        for row in workbook.active.iter_rows(values_only=True):
+            yield [_clean(value) for value in row]
+    finally:
+        workbook.close()
+
+
+def iter_import_chunks(file, filename: str, chunk_size: int = IMPORT_CHUNK_SIZE):
+    """
+    Yields lists of (row_number, {header: value}) from a CSV or XLSX file,
+    `chunk_size` rows at a time. Row numbers match the spreadsheet (header
+    is row 1); empty rows are skipped.
+    """
+    name = (filename or "").lower()
+    if name.endswith(".csv"):
+        rows = _iter_csv_rows(file)
+    elif name.endswith(".xlsx"):
+        rows = _iter_xlsx_rows(file)
+    else:
+        raise ImportFileError("Only .csv and .xlsx files are supported")
+
+    header = next(rows, None)
+    if not header:
+        raise ImportFileError("File is empty")
+
+    header = [column if ATTR_PARAM_RE.match(column) else column.lower() for column in header]
+
+    missing = [column for column in REQUIRED_COLUMNS if column not in header]
+    if missing:
+        raise ImportFileError(f"Missing column(s): {', '.join(missing)}")
+
+    chunk = []
+    for row_number, values in enumerate(rows, start=2):
+        if not any(values):
+            continue
+        chunk.append((row_number, dict(zip(header, values))))
+        if len(chunk) >= chunk_size:
+            yield header, chunk
+            chunk = []
+
+    if chunk:
+        yield header, chunk
+
+
+# ---------------- Validation ----------------
+
+def _parse_int(row: dict, column: str, errors: list, required: bool = True):
+    raw = row.get(column, "")
+    if raw == "":
+        if required:
+            errors.append(f"{column} is required")
+        return None
+    try:
+        value = Decimal(raw)
+        # "1.5" is an error, not 1; "2.0" (spreadsheet export) is fine
+        if value != value.to_integral_value():
+            raise ValueError
+        return int(value)
+    except (InvalidOperation, ValueError, OverflowError):
+        errors.append(f"{column} must be a whole number")
+        return None
+
+
+def _parse_decimal(row: dict, column: str, errors: list, required: bool = True):
+    raw = row.get(column, "")
+    if raw == "":
+        if required:
+            errors.append(f"{column} is required")
+        return None
+    try:
+        value = Decimal(raw)
+    except InvalidOperation:
+        value = None
+    if value is None or not value.is_finite():
+        errors.append(f"{column} must be a number")
+        return None
+    if value < 0:
+        errors.append(f"{column} cannot be negative")
+    return value
+
+
+def _load_attribute_types(db: Session, header: list) -> dict:
+    columns = {
+        column: int(ATTR_PARAM_RE.match(column).group(1))
+        for column in header
+        if ATTR_PARAM_RE.match(column)
+    }
+
+    data_types = dict(
+        db.query(Attribute.id, Attribute.data_type)
+        .filter(Attribute.id.in_(columns.values()))
+        .all()
+    )
+
+    missing = set(columns.values()) - set(data_types)
+    if missing:
+        raise ImportFileError(f"Unknown attribute id(s): {sorted(missing)}")
+
+    return {"columns": columns, "data_types": data_types}
+
+
+def _load_lookups(db: Session, chunk: list) -> dict:
+    """
+    Everything the chunk's rows are checked against, in one query per table.
+    """
+    category_ids = set()
+    sub_category_ids = set()
+    slugs = set()
+    skus = set()
+
+    for _, row in chunk:
+        if row.get("category_id", "").isdigit():
+            category_ids.add(int(row["category_id"]))
+        if row.get("sub_category_id", "").isdigit():
+            sub_category_ids.add(int(row["sub_category_id"]))
+        if row.get("name"):
+            slugs.add(generate_slug(row["name"]))
+        if row.get("sku"):
+            skus.add(row["sku"])
+
+    return {
+        "categories": {
+            id for (id,) in
+            db.query(Category.id).filter(Category.id.in_(category_ids)).all()
+        },
+        "sub_categories": dict(
+            db.query(SubCategory.id, SubCategory.category_id)
+            .filter(SubCategory.id.in_(sub_category_ids))
+            .all()
+        ),
+        "slugs": {
+            slug for (slug,) in
+            db.query(Product.slug).filter(Product.slug.in_(slugs)).all()
+        },
+        "skus": {
+            sku for (sku,) in
+            db.query(Product.sku).filter(Product.sku.in_(skus)).all()
+        },
+    }
+
+
+def _validate_row(row: dict, lookups: dict, seen: dict, attribute_types: dict):
+    """
+    Returns (values, errors) for one row. `seen` holds slugs / SKUs already
+    used earlier in the file.
+    """
+    errors = []
+
+    name = row.get("name", "")
+    if not name:
+        errors.append("name is required")
+
+    for column, max_length in MAX_LENGTHS.items():
+        if len(row.get(column, "")) > max_length:
+            errors.append(f"{column} is longer than {max_length} characters")
+
+    category_id = _parse_int(row, "category_id", errors)
+    sub_category_id = _parse_int(row, "sub_category_id", errors, required=False)
+
+    if category_id is not None and category_id not in lookups["categories"]:
+        errors.append(f"Unknown category_id {category_id}")
+
+    if sub_category_id is not None:
+        parent_id = lookups["sub_categories"].get(sub_category_id)
+        if parent_id is None:
+            errors.append(f"Unknown sub_category_id {sub_category_id}")
+        elif category_id is not None and parent_id != category_id:
+            errors.append(f"sub_category_id {sub_category_id} does not belong to category {category_id}")
+
+    price = _parse_decimal(row, "price", errors)
+    discount_price = _parse_decimal(row, "discount_price", errors, required=False)
+    if price is not None and discount_price is not None and discount_price > price:
+        errors.append("discount_price cannot be greater than price")
+
+    quantity = _parse_int(row, "quantity", errors)
+    if quantity is not None and quantity < 0:
+        errors.append("quantity cannot be negative")
+    low_quantity_alert_at = _parse_int(row, "low_quantity_alert_at", errors)
+
+    slug = generate_slug(name) if name else None
+    if name and not slug:
+        errors.append("name must contain letters or digits")
+    elif slug:
+        if slug in lookups["slugs"]:
+            errors.append(f"A product with slug '{slug}' already exists")
+        elif slug in seen["slugs"]:
+            errors.append(f"Duplicate of row {seen['slugs'][slug]} (same slug '{slug}')")
+
+    sku = row.get("sku") or None
+    if sku:
+        if sku in lookups["skus"]:
+            errors.append(f"A product with SKU '{sku}' already exists")
+        elif sku in seen["skus"]:
+            errors.append(f"Duplicate of row {seen['skus'][sku]} (same SKU '{sku}')")
+
+    attributes = []
+    for column, attribute_id in attribute_types["columns"].items():
+        value = row.get(column, "")
+        if value == "":
+            continue
+        attributes.append((attribute_id, value))
+
+    if errors:
+        return None, errors
+
+    return {
+        "name": name,
+        "slug": slug,
+        "sku": sku,
+        "category_id": category_id,
+        "sub_category_id": sub_category_id,
+        "brand": row.get("brand") or None,
+        "short_description": row.get("short_description") or None,
+        "long_description": row.get("long_description") or None,
+        "is_active": row.get("is_active", "").lower() not in ("false", "no", "0"),
+        "price": price,
+        "discount_price": discount_price,
+        "quantity": quantity,
+        "low_quantity_alert_at": low_quantity_alert_at,
+        "attributes": attributes,
+    }, []
+
+
+# ---------------- Insert ----------------
+
+def _assign_skus(db: Session, valid_rows: list, seen_skus: dict) -> None:
+    """
+    Generated SKUs for rows without one, unique within the file and
+    against the database.
+    """
+    pending = [values for values in valid_rows if not values["sku"]]
+
+    while pending:
+        candidates = {}
+        for values in pending:
+            sku = generate_sku()
+            while sku in seen_skus or sku in candidates:
+                sku = generate_sku()
+            candidates[sku] = values
+
+        taken = {
+            sku for (sku,) in
+            db.query(Product.sku).filter(Product.sku.in_(candidates)).all()
+        }
+
+        pending = []
+        for sku, values in candidates.items():
+            if sku in taken:
+                pending.append(values)
+            else:
+                values["sku"] = sku
+                seen_skus[sku] = values["row"]
+
+
+def _insert_chunk(db: Session, valid_rows: list, attribute_types: dict) -> list[int]:
+    """
+    One multi-row INSERT per table for the whole chunk.
+    """
+    product_ids = generate_time_based_ids(len(valid_rows))
+
+    products, pricing, inventory, attribute_values = [], [], [], []
+
+    for product_id, values in zip(product_ids, valid_rows):
+        products.append({
+            "id": product_id,
+            "name": values["name"],
+            "sku": values["sku"],
+            "slug": values["slug"],
+            "category_id": values["category_id"],
+            "sub_category_id": values["sub_category_id"],
+            "brand": values["brand"],
+            "short_description": values["short_description"],
+            "long_description": values["long_description"],
+            "is_active": values["is_active"],
+        })
+        pricing.append({
+            "product_id": product_id,
+            "price": values["price"],
+            "discount_price": values["discount_price"],
+        })
+        inventory.append({
+            "product_id": product_id,
+            "quantity": values["quantity"],
+            "low_quantity_alert_at": values["low_quantity_alert_at"],
+        })
+        for attribute_id, value in values["attributes"]:
+            attribute_values.append({
+                "product_id": product_id,
+                "attribute_id": attribute_id,
+                "value": value,
+                **typed_values(attribute_types["data_types"][attribute_id], value),
+            })
+
+    tables = [
+        (Product, products),
+        (Pricing, pricing),
+        (Inventory, inventory),
+        (ProductAttributeValue, attribute_values),
+    ]
+    for model, rows in tables:
+        if not rows:
+            continue
+        if model is not Product:
+            for row, row_id in zip(rows, generate_time_based_ids(len(rows))):
+                row["id"] = row_id
+        db.execute(insert(model), rows)
+
+    refresh_product_search_vectors(db, product_ids=product_ids)
+    return product_ids
+
+
+def import_products(db: Session, file, filename: str) -> dict:
+    """
+    Imports products from a CSV / XLSX upload, chunk by chunk.
+
+    Each chunk is validated against the database, bulk-inserted and
+    committed; invalid rows are skipped and reported with their row number.
+    """
+    total_rows = 0
+    imported = 0
+    errors = []
+    seen = {"slugs": {}, "skus": {}}
+    attribute_types = None
+
+    for header, chunk in iter_import_chunks(file, filename):
+        if attribute_types is None:
+            attribute_types = _load_attribute_types(db, header)
+
+        total_rows += len(chunk)
+        lookups = _load_lookups(db, chunk)
+
+        valid_rows = []
+        for row_number, row in chunk:
+            values, row_errors = _validate_row(row, lookups, seen, attribute_types)
+            if row_errors:
+                errors.append({"row": row_number, "errors": row_errors})
+                continue
+
+            values["row"] = row_number
+            seen["slugs"][values["slug"]] = row_number
+            if values["sku"]:
+                seen["skus"][values["sku"]] = row_number
+            valid_rows.append(values)
+
+        if not valid_rows:
+            continue
+
+        try:
+            _assign_skus(db, valid_rows, seen["skus"])
+            _insert_chunk(db, valid_rows, attribute_types)
+            db.commit()
+            imported += len(valid_rows)
+        except Exception as e:
+            db.rollback()
+            print(f"Product import chunk failed: {getattr(e, 'orig', e)}")
+            errors.extend(
+                {"row": values["row"], "errors": [f"Not imported: {e.__class__.__name__}"]}
+                for values in valid_rows
+            )
+
+    if imported:
+        invalidate_product_suggestions(db)
+        db.commit()
+        suggest_index.mark_stale()
+
+    return {
+        "total_rows": total_rows,
+        "imported": imported,
+        "failed": total_rows - imported,
+        "errors": errors,
+    }
@@ -0,0 +1,139 @@
+import re
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.models.categories import Category
+from app.models.sub_categories import SubCategory
+from app.models.product import Product, ProductAttributeValue
+
+# 'simple' keeps part numbers, brands and units ("2205", "t-motor", "kv")
+# intact instead of stemming them as English words.
+SEARCH_CONFIG = "simple"
+
+_token_re = re.compile(r"\w+", re.UNICODE)
+
+
+def _weighted(text, weight: str):
+    return func.setweight(
+        func.to_tsvector(SEARCH_CONFIG, func.coalesce(text, "")),
+        weight
+    )
+
+
+def _search_document():
+    """
+    tsvector for one product row:
+    A = name, B = brand, C = category / sub-category names,
+    D = short description + attribute values.
+    """
+    category_name = (
+        select(Category.name)
+        .where(Category.id == Product.category_id)
+        .scalar_subquery()
+    )
+
+    sub_category_name = (
+        select(SubCategory.name)
+        .where(SubCategory.id == Product.sub_category_id)
+        .scalar_subquery()
+    )
+
+    attribute_values = (
+        select(func.string_agg(ProductAttributeValue.value, " "))
+        .where(ProductAttributeValue.product_id == Product.id)
+        .scalar_subquery()
+    )
+
+    return (
+        _weighted(Product.name, "A")
+        .op("||")(_weighted(Product.brand, "B"))
+        .op("||")(_weighted(
+            func.concat_ws(" ", category_name, sub_category_name), "C"
+        ))
+        .op("||")(_weighted(
+            func.concat_ws(" ", Product.short_description, attribute_values), "D"
+        ))
+    )
+
+
+def refresh_product_search_vectors(
+    db: Session,
+    product_ids: list[int] | None = None,
+    category_id: int | None = None,
+    sub_category_id: int | None = None,
+) -> None:
+    """
+    Rebuilds `Product.search_vector` with one set-based UPDATE for the given
+    products, or for every product in a category / sub-category (after a
+    rename). Runs in the caller's transaction.
+    """
+    conditions = []
+
+    if product_ids is not None:
+        if not product_ids:
+            return
+        conditions.append(Product.id.in_(product_ids))
+
+    if category_id is not None:
+        conditions.append(Product.category_id == category_id)
+
+    if sub_category_id is not None:
+        conditions.append(Product.sub_category_id == sub_category_id)
+
+    if not conditions:
+        return
+
+    # pending attribute rows must be visible to the UPDATE
+    db.flush()
+
+    db.execute(
+        update(Product)
+        .where(*conditions)
+        .values(search_vector=_search_document())
+        .execution_options(synchronize_session=False)
+    )
+
+
+def build_prefix_tsquery(term: str) -> str | None:
+    """
+    'motor 22' -> 'motor:* & 22:*' so every word also matches as a prefix
+    while the user is still typing.
+    """
+    tokens = _token_re.findall(term.lower())
+    if not tokens:
+        return None
+    return " & ".join(f"{token}:*" for token in tokens)
+
+
+def product_search_clause(term: str):
+    """
+    Returns (filter, rank) for a search term.
+
+    A row matches when the full-text prefix query hits the search vector
+    (idx_product_search_vector) or the term is trigram-similar to a word in
+    the product name (idx_product_name_trgm), which covers typos.
+    """
+    term = term.strip()
+
+    # `name %> term` is word_similarity(term, name) >= threshold
+    fuzzy = Product.name.op("%>")(term)
+    fuzzy_rank = func.word_similarity(term, Product.name)
+
+    tsquery_text = build_prefix_tsquery(term)
+    if not tsquery_text:
+        return fuzzy, fuzzy_rank
+
+    tsquery = func.to_tsquery(SEARCH_CONFIG, tsquery_text)
+
+    search_filter = or_(
+        Product.search_vector.op("@@")(tsquery),
+        fuzzy,
+    )
+
+    rank = func.greatest(
+        func.ts_rank_cd(Product.search_vector, tsquery),
+        fuzzy_rank,
+    )
+
+    return search_filter, rank
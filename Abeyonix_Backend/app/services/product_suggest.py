@@ -0,0 +1,238 @@
+import re
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+
+from sqlalchemy.orm import Session
+
+from app.models.categories import Category
+from app.models.product import Product
+from app.services.cache_version import get_cache_version, bump_cache_version
+
+PRODUCT_SUGGEST_CACHE = "product_suggest"
+
+# How often a worker asks the database whether another worker changed the
+# catalog. Between checks suggestions are served purely from memory.
+VERSION_CHECK_SECONDS = 30
+
+# Shown first for the same prefix
+KIND_ORDER = {"category": 0, "brand": 1, "product": 2}
+
+_non_word_re = re.compile(r"[^\w]+", re.UNICODE)
+
+
+def normalize(text: str | None) -> str:
+    """
+    'Motor 2205 – 2300KV' -> 'motor 2205 2300kv'
+    """
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _non_word_re.sub(" ", text.lower()).strip()
+
+
+def _word_suffixes(normalized: str) -> list[str]:
+    """
+    'motor 2205 2300kv' -> ['motor 2205 2300kv', '2205 2300kv', '2300kv']
+    so typing any word of a name finds it.
+    """
+    words = normalized.split()
+    return [" ".join(words[i:]) for i in range(len(words))]
+
+
+class SuggestIndex:
+    """
+    Per-worker prefix index over product names, brands and category names.
+
+    `_keys` is a sorted list of (key, kind, ref) tuples; a lookup is one
+    bisect plus a forward scan over the keys sharing the prefix.
+    `_entries` maps (kind, ref) to what is returned to the client.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._keys = []
+        self._entries = {}
+        self._product_keys = {}
+        self._brand_products = {}
+        self._version = None
+        self._checked_at = 0.0
+        # during a full load keys are appended and sorted once at the end
+        self._bulk = False
+
+    # ---------------- Building ----------------
+
+    def _add_entry(self, kind, ref, text, keys, **extra):
+        self._entries[(kind, ref)] = {"type": kind, "text": text, **extra}
+        for key in keys:
+            if self._bulk:
+                self._keys.append((key, kind, ref))
+            else:
+                insort(self._keys, (key, kind, ref))
+
+    def _remove_entry(self, kind, ref, keys):
+        self._entries.pop((kind, ref), None)
+        for key in keys:
+            index = bisect_left(self._keys, (key, kind, ref))
+            if index < len(self._keys) and self._keys[index] == (key, kind, ref):
+                del self._keys[index]
+
+    def _add_brand(self, brand, product_id):
+        key = normalize(brand)
+        if not key:
+            return
+        products = self._brand_products.setdefault(key, set())
+        if not products:
+            self._add_entry("brand", key, brand, [key])
+        products.add(product_id)
+
+    def _remove_brand(self, brand, product_id):
+        key = normalize(brand)
+        products = self._brand_products.get(key)
+        if not products:
+            return
+        products.discard(product_id)
+        if not products:
+            del self._brand_products[key]
+            self._remove_entry("brand", key, [key])
+
+    def _add_product(self, product_id, name, slug, brand):
+        keys = _word_suffixes(normalize(name))
+        self._add_entry("product", product_id, name, keys, id=product_id, slug=slug)
+        self._add_brand(brand, product_id)
+        self._product_keys[product_id] = (keys, brand)
+
+    def _remove_product(self, product_id):
+        indexed = self._product_keys.pop(product_id, None)
+        if not indexed:
+            return
+        keys, brand = indexed
+        self._remove_entry("product", product_id, keys)
+        self._remove_brand(brand, product_id)
+
+    def load(self, db: Session) -> None:
+        """
+        Full rebuild from the database (first use, or another worker
+        changed the catalog).
+        """
+        version = get_cache_version(db, PRODUCT_SUGGEST_CACHE)
+
+        products = (
+            db.query(Product.id, Product.name, Product.slug, Product.brand)
+            .filter(Product.is_active == True)
+            .all()
+        )
+
+        categories = (
+            db.query(Category.id, Category.name, Category.slug)
+            .filter(Category.is_active == True)
+            .all()
+        )
+
+        # build aside and swap, so lookups never see a half-built index
+        fresh = SuggestIndex()
+        fresh._bulk = True
+
+        for category in categories:
+            fresh._add_entry(
+                "category",
+                category.id,
+                category.name,
+                _word_suffixes(normalize(category.name)),
+                id=category.id,
+                slug=category.slug,
+            )
+
+        for product in products:
+            fresh._add_product(product.id, product.name, product.slug, product.brand)
+
+        fresh._keys.sort()
+
+        with self._lock:
+            self._keys = fresh._keys
+            self._entries = fresh._entries
+            self._product_keys = fresh._product_keys
+            self._brand_products = fresh._brand_products
+            self._version = version
+            self._checked_at = time.monotonic()
+
+    def ensure_fresh(self, db: Session) -> None:
+        if self._version is not None and (
+            time.monotonic() - self._checked_at < VERSION_CHECK_SECONDS
+        ):
+            return
+
+        if self._version is None or get_cache_version(db, PRODUCT_SUGGEST_CACHE) != self._version:
+            self.load(db)
+        else:
+            self._checked_at = time.monotonic()
+
+    def mark_stale(self) -> None:
+        self._checked_at = 0.0
+
+    # ---------------- Incremental updates ----------------
+
+    def apply_product(self, product: Product, version: int) -> None:
+        """
+        Applies one committed product change. `version` is the value
+        returned by `invalidate_product_suggestions` for that change.
+        """
+        with self._lock:
+            if self._version is None:
+                return
+
+            self._remove_product(product.id)
+            if product.is_active:
+                self._add_product(product.id, product.name, product.slug, product.brand)
+
+            # Only this change happened since our snapshot: stay current.
+            # Otherwise another worker wrote in between, reload on next use.
+            if self._version == version - 1:
+                self._version = version
+            else:
+                self._checked_at = 0.0
+
+    # ---------------- Lookup ----------------
+
+    def suggest(self, prefix: str, limit: int = 8) -> list[dict]:
+        prefix = normalize(prefix)
+        if not prefix:
+            return []
+
+        seen = set()
+        matches = []
+
+        # apply_product edits _keys / _entries in place; the scan is at
+        # most limit * 4 keys, so hold the lock for it
+        with self._lock:
+            keys = self._keys
+            entries = self._entries
+
+            index = bisect_left(keys, (prefix,))
+            while index < len(keys) and len(matches) < limit * 4:
+                key, kind, ref = keys[index]
+                if not key.startswith(prefix):
+                    break
+                index += 1
+
+                entry = entries.get((kind, ref))
+                if entry is None or (kind, ref) in seen:
+                    continue
+                seen.add((kind, ref))
+                matches.append(entry)
+
+        matches.sort(key=lambda e: (
+            KIND_ORDER[e["type"]],
+            not normalize(e["text"]).startswith(prefix),
+            len(e["text"]),
+        ))
+        return matches[:limit]
+
+
+suggest_index = SuggestIndex()
+
+
+def invalidate_product_suggestions(db: Session) -> int:
+    return bump_cache_version(db, PRODUCT_SUGGEST_CACHE)
@@ -1,13 +1,56 @@
+import threading
+
 from sqlalchemy.orm import Session
 from app.models.users import *
+from app.services.cache_version import get_cache_version, bump_cache_version
+
+ADMIN_ROLE_ID = 1
+
+ADMIN_EMAILS_CACHE = "admin_emails"
+
+# Per-worker cache: {"version": int, "emails": tuple}
+_cached_admin_emails = None
+_lock = threading.Lock()
 
-def get_admin_emails(db: Session):
-    return [
-        user.email
-        for user in db.query(User)
+
+def _load_admin_emails(db: Session) -> tuple:
+    return tuple(
+        email
+        for (email,) in db.query(User.email)
         .filter(
-            User.role_id == 1,   # ✅ Admin role_id
+            User.role_id == ADMIN_ROLE_ID,   # ✅ Admin role_id
             User.is_active == True
         )
+        .order_by(User.user_id)
         .all()
-    ]
\ No newline at end of file
+    )
+
+
+def get_admin_emails(db: Session) -> list[str]:
+    """
+    Active admins' emails. Reloaded only when the shared version has moved
+    since this worker last loaded them; see invalidate_admin_emails.
+    """
+    global _cached_admin_emails
+
+    version = get_cache_version(db, ADMIN_EMAILS_CACHE)
+
+    cached = _cached_admin_emails
+    if cached and cached["version"] == version:
+        return list(cached["emails"])
+
+    with _lock:
+        cached = _cached_admin_emails
+        if not cached or cached["version"] != version:
+            cached = {"version": version, "emails": _load_admin_emails(db)}
+            _cached_admin_emails = cached
+
+    return list(cached["emails"])
+
+
+def invalidate_admin_emails(db: Session) -> None:
+    """
+    Call in the transaction that creates, changes or deletes an admin, or
+    moves a user into or out of the admin role.
+    """
+    bump_cache_version(db, ADMIN_EMAILS_CACHE)
@@ -0,0 +1,21 @@
+import base64
+from datetime import datetime
+
+from fastapi import HTTPException
+
+
+def encode_keyset_cursor(created_at: datetime, row_id: int) -> str:
+    """
+    Opaque cursor for (created_at, id) keyset pagination.
+    """
+    raw = f"{created_at.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_keyset_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.split("|")
+        return datetime.fromisoformat(created_at), int(row_id)
+    except ValueError:
+        raise HTTPException(400, "Invalid cursor")
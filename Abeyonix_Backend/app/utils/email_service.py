@@ -1,38 +1,105 @@
 import smtplib
+import time
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from app.core.config import settings
 # import resend
 
+# servers drop idle clients; close ours first and reconnect on demand
+SMTP_IDLE_TIMEOUT_SECONDS = 30
+
+
+def build_message(to_email: str, subject: str, html_content: str) -> MIMEMultipart:
+    msg = MIMEMultipart("alternative")
+    msg["From"] = f"Abeyonix <{settings.FROM_EMAIL}>"
+    msg["To"] = to_email
+    msg["Subject"] = subject
+    msg["Reply-To"] = settings.FROM_EMAIL
+
+    text_content = (
+        "Verify Your Account\n\n"
+        "Use the OTP sent to your email.\n"
+        "This OTP is valid for 10 minutes.\n\n"
+        "Regards,\nAbeyonix Team"
+    )
+
+    msg.attach(MIMEText(text_content, "plain"))  # ✅ IMPORTANT
+    msg.attach(MIMEText(html_content, "html"))
+    return msg
+
+
+class SMTPSession:
+    """
+    One SMTP connection, opened (STARTTLS + login) on first use and reused
+    for every message after that. Not thread-safe: one per sender thread.
+    """
+
+    def __init__(self, idle_timeout: float = SMTP_IDLE_TIMEOUT_SECONDS):
+        self.idle_timeout = idle_timeout
+        self._server = None
+        self._last_used = 0.0
+
+    def _connect(self):
+        server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=30)
+        try:
+            if settings.SMTP_STARTTLS:
+                server.starttls()
+            if settings.SMTP_USER:
+                server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+
+    def send(self, to_email: str, subject: str, html_content: str) -> None:
+        """
+        Sends one message, raising on failure. A connection the server
+        dropped is reopened once.
+        """
+        msg = build_message(to_email, subject, html_content).as_string()
+
+        if self._server is None:
+            self._connect()
+
+        try:
+            self._server.sendmail(settings.FROM_EMAIL, to_email, msg)
+        except smtplib.SMTPServerDisconnected:
+            self._server = None
+            self._connect()
+            self._server.sendmail(settings.FROM_EMAIL, to_email, msg)
+
+        self._last_used = time.monotonic()
+
+    def close_if_idle(self) -> None:
+        if self._server is not None and time.monotonic() - self._last_used > self.idle_timeout:
+            self.close()
+
+    def close(self) -> None:
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except Exception:
+            self._server.close()
+        self._server = None
+
 
 def send_email(to_email: str, subject: str, html_content: str) -> bool:
+    """
+    Sends right away on a connection of its own. Request handlers queue
+    mail with app.services.email_outbox.enqueue_email instead.
+    """
+    smtp = SMTPSession()
     try:
-        msg = MIMEMultipart("alternative")
-        msg["From"] = f"Abeyonix <{settings.FROM_EMAIL}>"
-        msg["To"] = to_email
-        msg["Subject"] = subject
-        msg["Reply-To"] = settings.FROM_EMAIL
-
-        text_content = (
-            "Verify Your Account\n\n"
-            "Use the OTP sent to your email.\n"
-            "This OTP is valid for 10 minutes.\n\n"
-            "Regards,\nAbeyonix Team"
-        )
-
-        msg.attach(MIMEText(text_content, "plain"))  # ✅ IMPORTANT
-        msg.attach(MIMEText(html_content, "html"))
-
-        with smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT) as server:
-            server.starttls()
-            server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-            server.sendmail(settings.FROM_EMAIL, to_email, msg.as_string())
+        smtp.send(to_email, subject, html_content)
         print ("Email sent successfully to:", to_email)  # for logging
         return True
 
     except Exception as e:
         print("Email send failed:", e)
         return False
+    finally:
+        smtp.close()
 
 
 
@@ -1,7 +1,217 @@
+import os
+import threading
 import time
-import random
+
+# Ids are decimal-packed so they keep the old `timestamp_ms + 3 digits`
+# shape and stay below 2**53 (safe as JS numbers in the frontend):
+#
+#     id = timestamp_ms * 1000 + worker_id * 100 + sequence
+#
+# 10 workers, 100 ids per worker per millisecond. A worker that uses up a
+# millisecond moves on to the next one, so ids only ever increase.
+WORKER_COUNT = 10
+SEQUENCE_SIZE = 100
+
+# worker_id = pod * PROCESS_SLOTS + slot. ID_WORKER_ID is the pod (e.g. the
+# StatefulSet ordinal); each process of the pod (gunicorn --workers 2 in
+# the Dockerfile) claims one of its PROCESS_SLOTS slots.
+PROCESS_SLOTS = 2
+POD_COUNT = WORKER_COUNT // PROCESS_SLOTS
+
+# pg_try_advisory_lock(WORKER_LOCK_KEY, worker_id) claims a worker id
+WORKER_LOCK_KEY = 7_310_019
+
+# how often id generation re-checks that the lock is still held
+LOCK_CHECK_SECONDS = 5
+
+
+_worker_connection = None
+
+
+def _candidate_worker_ids() -> range:
+    """
+    Worker ids this process may claim: its pod's slots when ID_WORKER_ID
+    is set, else any of them.
+    """
+    from app.core.config import settings
+
+    raw = settings.ID_WORKER_ID
+    if raw in (None, ""):
+        return range(WORKER_COUNT)
+
+    try:
+        pod = int(raw)
+    except ValueError:
+        pod = -1
+
+    if not 0 <= pod < POD_COUNT:
+        raise RuntimeError(f"ID_WORKER_ID must be between 0 and {POD_COUNT - 1}, got {raw!r}")
+
+    return range(pod * PROCESS_SLOTS, (pod + 1) * PROCESS_SLOTS)
+
+
+def _claim_worker_id() -> int:
+    """
+    First candidate worker id no other process holds, claimed with a
+    session advisory lock on a connection kept open for the process
+    lifetime; the lock goes away with the process. Two processes can only
+    ever hold different worker ids, so there is no fallback: without a
+    free slot the process must not generate ids.
+    """
+    global _worker_connection
+
+    from app.db.session import engine
+
+    candidates = _candidate_worker_ids()
+
+    connection = engine.raw_connection()
+    connection.detach()   # ours for good, not returned to the pool
+
+    # on the psycopg2 connection itself, not the pool proxy: otherwise the
+    # SELECT leaves the session idle in transaction, and a killed session
+    # takes the lock with it
+    connection.dbapi_connection.autocommit = True
+
+    cursor = connection.cursor()
+    for worker_id in candidates:
+        cursor.execute("SELECT pg_try_advisory_lock(%s, %s)", (WORKER_LOCK_KEY, worker_id))
+        if cursor.fetchone()[0]:
+            cursor.close()
+            _worker_connection = connection
+            return worker_id
+
+    cursor.close()
+    connection.close()
+    raise RuntimeError(
+        f"No free id worker slot among {candidates.start}-{candidates.stop - 1}: "
+        "more processes than slots for this ID_WORKER_ID"
+    )
+
+
+def _holds_worker_id(worker_id: int) -> bool:
+    """
+    True while the lock connection is up and still holds `worker_id`.
+    """
+    try:
+        cursor = _worker_connection.cursor()
+        cursor.execute(
+            """
+            SELECT EXISTS (
+                SELECT 1 FROM pg_locks
+                WHERE locktype = 'advisory'
+                  AND pid = pg_backend_pid()
+                  AND classid = %s AND objid = %s AND objsubid = 2
+                  AND granted
+            )
+            """,
+            (WORKER_LOCK_KEY, worker_id),
+        )
+        held = cursor.fetchone()[0]
+        cursor.close()
+        return held
+    except Exception:
+        return False
+
+
+def _drop_worker_connection() -> None:
+    global _worker_connection
+
+    # the driver connection: the pool proxy would try to roll back first
+    try:
+        _worker_connection.dbapi_connection.close()
+    except Exception:
+        pass
+    _worker_connection = None
+
+
+class IdGenerator:
+    """
+    Snowflake-style ids: unique across processes (one worker id each),
+    increasing within a process, so inserts append to the primary key
+    btree instead of landing on random pages.
+
+    The worker id is a slot claimed through a Postgres advisory lock,
+    within the pod's range when ID_WORKER_ID is set. It is claimed at app
+    startup (claim_id_worker) and again after a fork. Every
+    LOCK_CHECK_SECONDS the lock is checked before handing out ids; if its
+    session was killed, a slot is claimed again (or RuntimeError raised).
+    """
+
+    def __init__(self, worker_id: int | None = None):
+        self._fixed_worker_id = worker_id
+        self._worker_id = worker_id
+        self._pid = os.getpid() if worker_id is not None else None
+        self._checked_at = 0.0
+
+        self._last_ms = 0
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    def _current_worker_id(self) -> int:
+        if self._fixed_worker_id is not None:
+            return self._fixed_worker_id
+
+        if self._pid != os.getpid():
+            # the parent's lock connection is not ours: drop it unclosed
+            self._worker_id = _claim_worker_id()
+            self._pid = os.getpid()
+            self._checked_at = time.monotonic()
+
+        elif time.monotonic() - self._checked_at >= LOCK_CHECK_SECONDS:
+            if not _holds_worker_id(self._worker_id):
+                print(f"Lost id worker slot {self._worker_id}, claiming a new one")
+                _drop_worker_connection()
+                self._worker_id = _claim_worker_id()
+            self._checked_at = time.monotonic()
+
+        return self._worker_id
+
+    def _next(self, worker_id: int) -> int:
+        now_ms = int(time.time() * 1000)
+
+        if now_ms > self._last_ms:
+            self._last_ms = now_ms
+            self._sequence = 0
+        else:
+            # same millisecond, or the clock went back: keep counting
+            self._sequence += 1
+            if self._sequence == SEQUENCE_SIZE:
+                self._last_ms += 1
+                self._sequence = 0
+
+        return self._last_ms * 1000 + worker_id * SEQUENCE_SIZE + self._sequence
+
+    def next_id(self) -> int:
+        with self._lock:
+            return self._next(self._current_worker_id())
+
+    def next_ids(self, count: int) -> list[int]:
+        """
+        `count` increasing ids in one call, for bulk inserts.
+        """
+        with self._lock:
+            worker_id = self._current_worker_id()
+            return [self._next(worker_id) for _ in range(count)]
+
+
+_generator = IdGenerator()
+
+
+def claim_id_worker() -> int:
+    """
+    Claims this process's worker id now, so a missing slot or a bad
+    ID_WORKER_ID stops the app at startup instead of failing an insert.
+    """
+    with _generator._lock:
+        return _generator._current_worker_id()
+
 
 def generate_time_based_id() -> int:
-    timestamp_ms = int(time.time() * 1000)
-    random_suffix = random.randint(100, 999)
-    return int(f"{timestamp_ms}{random_suffix}")
+    return _generator.next_id()
+
+
+def generate_time_based_ids(count: int) -> list[int]:
+    """
+    `count` distinct, increasing ids, for bulk inserts.
+    """
+    return _generator.next_ids(count)
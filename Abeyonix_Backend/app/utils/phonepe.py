@@ -1,9 +1,16 @@
+import asyncio
 import base64
 import hashlib
 import json
+import random
+import uuid
+from abc import ABC, abstractmethod
+
+import httpx
 
 PHONEPE_BASE_URL = "https://api-preprod.phonepe.com/apis/pg-sandbox"
 PAY_ENDPOINT = "/pg/v1/pay"
+STATUS_ENDPOINT = "/pg/v1/status"
 
 MERCHANT_ID = "PGTESTPAYUAT86"
 SALT_KEY = "96434309-7796-489d-8924-ab56988a6076"
@@ -20,3 +27,187 @@ def generate_x_verify(payload: dict) -> tuple[str, str]:
     x_verify = sha256 + "###" + SALT_INDEX
 
     return base64_payload, x_verify
+
+
+def generate_status_x_verify(transaction_id: str) -> str:
+    path = f"{STATUS_ENDPOINT}/{MERCHANT_ID}/{transaction_id}"
+    sha256 = hashlib.sha256((path + SALT_KEY).encode()).hexdigest()
+    return sha256 + "###" + SALT_INDEX
+
+
+class PaymentGatewayError(Exception):
+    pass
+
+
+class PaymentGateway(ABC):
+    """
+    Interface the payment routes talk to. `pay` returns PhonePe's pay
+    response, `check_status` its status response. A gateway missing either
+    fails when it is created, not halfway through a payment.
+    """
+
+    async def start(self) -> None:
+        pass
+
+    async def close(self) -> None:
+        pass
+
+    @abstractmethod
+    async def pay(self, payload: dict) -> dict:
+        ...
+
+    @abstractmethod
+    async def check_status(self, transaction_id: str) -> dict:
+        ...
+
+
+class PhonePeGateway(PaymentGateway):
+    """
+    One pooled, keep-alive httpx.AsyncClient per app worker, created at
+    startup, so checkouts reuse TCP/TLS connections to PhonePe.
+
+    Failed calls are retried MAX_RETRIES times with exponential backoff
+    and full jitter. `pay` is only retried when the request surely did
+    not reach PhonePe (connect errors) or PhonePe answered 429 / 5xx.
+    """
+
+    TIMEOUT = httpx.Timeout(10.0, connect=5.0)
+    LIMITS = httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=60)
+
+    MAX_RETRIES = 3
+    BACKOFF_BASE_SECONDS = 0.2
+    BACKOFF_MAX_SECONDS = 2.0
+
+    RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+    def __init__(self, base_url: str = PHONEPE_BASE_URL):
+        self.base_url = base_url
+        self._client = None
+
+    async def start(self) -> None:
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.TIMEOUT,
+                limits=self.LIMITS,
+            )
+
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.BACKOFF_MAX_SECONDS, self.BACKOFF_BASE_SECONDS * 2 ** attempt))
+
+    async def _request(self, method: str, url: str, idempotent: bool, **kwargs) -> dict:
+        if self._client is None:
+            await self.start()
+
+        retryable_errors = (httpx.TransportError,) if idempotent else (httpx.ConnectError, httpx.ConnectTimeout)
+
+        for attempt in range(self.MAX_RETRIES + 1):
+            last_attempt = attempt == self.MAX_RETRIES
+            try:
+                response = await self._client.request(method, url, **kwargs)
+            except retryable_errors as e:
+                if last_attempt:
+                    raise PaymentGatewayError(f"PhonePe unreachable: {e}") from e
+            except httpx.HTTPError as e:
+                raise PaymentGatewayError(f"PhonePe request failed: {e}") from e
+            else:
+                if response.status_code not in self.RETRY_STATUS_CODES or last_attempt:
+                    try:
+                        return response.json()
+                    except ValueError as e:
+                        raise PaymentGatewayError(
+                            f"Invalid PhonePe response ({response.status_code})"
+                        ) from e
+
+            await asyncio.sleep(self._backoff(attempt))
+
+    async def pay(self, payload: dict) -> dict:
+        base64_payload, x_verify = generate_x_verify(payload)
+
+        return await self._request(
+            "POST",
+            PAY_ENDPOINT,
+            idempotent=False,
+            json={"request": base64_payload},
+            headers={
+                "Content-Type": "application/json",
+                "X-VERIFY": x_verify,
+            },
+        )
+
+    async def check_status(self, transaction_id: str) -> dict:
+        return await self._request(
+            "GET",
+            f"{STATUS_ENDPOINT}/{MERCHANT_ID}/{transaction_id}",
+            idempotent=True,
+            headers={
+                "Content-Type": "application/json",
+                "X-VERIFY": generate_status_x_verify(transaction_id),
+                "X-MERCHANT-ID": MERCHANT_ID,
+            },
+        )
+
+
+class FakePaymentGateway(PaymentGateway):
+    """
+    In-memory gateway for local runs (PAYMENT_GATEWAY=fake): every payment
+    gets a local pay URL, and `check_status` reports `status_code`
+    (PAYMENT_SUCCESS by default).
+    """
+
+    def __init__(self, pay_url: str = "http://localhost:8080/payment-status", status_code: str = "PAYMENT_SUCCESS"):
+        self.pay_url = pay_url
+        self.status_code = status_code
+        self.transactions = {}
+
+    async def pay(self, payload: dict) -> dict:
+        transaction_id = payload["merchantTransactionId"]
+        self.transactions[transaction_id] = {"payload": payload, "code": self.status_code}
+
+        return {
+            "success": True,
+            "code": "PAYMENT_INITIATED",
+            "data": {
+                "merchantId": payload.get("merchantId"),
+                "merchantTransactionId": transaction_id,
+                "instrumentResponse": {
+                    "type": "PAY_PAGE",
+                    "redirectInfo": {"url": f"{self.pay_url}?transactionId={transaction_id}", "method": "GET"},
+                },
+            },
+        }
+
+    async def check_status(self, transaction_id: str) -> dict:
+        transaction = self.transactions.get(transaction_id)
+        if transaction is None:
+            return {"success": False, "code": "TRANSACTION_NOT_FOUND", "data": {}}
+
+        payload = transaction.get("payload", {})
+        return {
+            "success": transaction["code"] == "PAYMENT_SUCCESS",
+            "code": transaction["code"],
+            "data": {
+                "merchantId": payload.get("merchantId"),
+                "merchantTransactionId": transaction_id,
+                "transactionId": f"FAKE{uuid.uuid4().hex[:16].upper()}",
+                "amount": payload.get("amount"),
+                "state": "COMPLETED" if transaction["code"] == "PAYMENT_SUCCESS" else "FAILED",
+            },
+        }
+
+
+_gateway: PaymentGateway | None = None
+
+
+def get_payment_gateway() -> PaymentGateway:
+    global _gateway
+    if _gateway is None:
+        from app.core.config import settings
+        _gateway = FakePaymentGateway() if (settings.PAYMENT_GATEWAY or "").lower() == "fake" else PhonePeGateway()
+    return _gateway
+
@@ -0,0 +1,65 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    Small in-process cache whose entries expire after `ttl_seconds`.
+
+    Every entry can carry a tag (e.g. a product id) so all keys derived
+    from the same row - by id, by slug - are dropped together. Oldest
+    entries are evicted first once `max_entries` is reached.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> (expires_at, tag, value)
+        self._tags = {}                 # tag -> {key, ...}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, tag, value = entry
+            if expires_at <= time.monotonic():
+                self._pop(key)
+                return None
+            return value
+
+    def set(self, key, value, tag=None) -> None:
+        with self._lock:
+            self._pop(key)
+
+            while len(self._entries) >= self.max_entries:
+                self._pop(next(iter(self._entries)))
+
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, tag, value)
+            if tag is not None:
+                self._tags.setdefault(tag, set()).add(key)
+
+    def invalidate(self, tag) -> None:
+        with self._lock:
+            for key in list(self._tags.get(tag, ())):
+                self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def _pop(self, key) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+
+        tag = entry[1]
+        keys = self._tags.get(tag)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._tags[tag]
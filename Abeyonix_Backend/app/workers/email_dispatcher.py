@@ -0,0 +1,134 @@
+import random
+import smtplib
+import threading
+from datetime import timedelta
+
+from sqlalchemy import func
+
+from app.db.session import session_scope
+from app.models.email_outbox import EmailOutbox
+from app.utils.email_service import SMTPSession
+
+POLL_INTERVAL_SECONDS = 5
+
+BATCH_SIZE = 50
+
+# after this many failed attempts a message is marked FAILED
+MAX_ATTEMPTS = 8
+RETRY_BASE_SECONDS = 30
+RETRY_MAX_SECONDS = 3600
+
+_stop = threading.Event()
+_wake = threading.Event()
+_thread = None
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    # exponential backoff with jitter, so a recovering server isn't hit all at once
+    seconds = min(RETRY_MAX_SECONDS, RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+    return timedelta(seconds=seconds * random.uniform(0.8, 1.2))
+
+
+def _is_permanent(error: Exception) -> bool:
+    # 5xx for this message: retrying won't help
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(code >= 500 for code, _ in error.recipients.values())
+    return isinstance(error, smtplib.SMTPDataError) and error.smtp_code >= 500
+
+
+def _is_message_error(error: Exception) -> bool:
+    # rejected recipient or content: only this message is affected. Anything
+    # else (connect, TLS, login, timeouts) would fail the rest of the batch too
+    return isinstance(error, (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError))
+
+
+def dispatch_once(smtp: SMTPSession) -> int:
+    """
+    Sends up to BATCH_SIZE due messages over `smtp` and records the
+    outcome of each. Returns the number of messages handled.
+
+    Rows are claimed with SKIP LOCKED, so every app worker can run a
+    dispatcher. Delivery is at least once: a crash between sending and the
+    commit sends those messages again.
+    """
+    try:
+        with session_scope() as db:
+            rows = (
+                db.query(EmailOutbox)
+                .filter(
+                    EmailOutbox.status == "PENDING",
+                    EmailOutbox.next_attempt_at <= func.now(),
+                )
+                .order_by(EmailOutbox.next_attempt_at)
+                .limit(BATCH_SIZE)
+                .with_for_update(skip_locked=True)
+                .all()
+            )
+
+            handled = 0
+            for row in rows:
+                handled += 1
+                try:
+                    smtp.send(row.to_email, row.subject, row.html_content)
+                except Exception as e:
+                    row.attempts += 1
+                    row.last_error = str(e)[:500]
+
+                    if row.attempts >= MAX_ATTEMPTS or _is_permanent(e):
+                        row.status = "FAILED"
+                        print(f"Email to {row.to_email} failed for good: {e}")
+                    else:
+                        row.next_attempt_at = func.now() + _retry_delay(row.attempts)
+
+                    if _is_message_error(e):
+                        continue
+
+                    # leave the rest of the batch for the next poll
+                    smtp.close()
+                    break
+
+                row.status = "SENT"
+                row.sent_at = func.now()
+
+        return handled
+    except Exception as e:
+        print(f"Email dispatch failed: {e}")
+        return 0
+
+
+def _run():
+    smtp = SMTPSession()
+    try:
+        while not _stop.is_set():
+            # a full batch means more is probably waiting
+            if dispatch_once(smtp) == BATCH_SIZE:
+                continue
+
+            smtp.close_if_idle()
+            _wake.wait(POLL_INTERVAL_SECONDS)
+            _wake.clear()
+    finally:
+        smtp.close()
+
+
+def wake_email_dispatcher():
+    _wake.set()
+
+
+def start_email_dispatcher():
+    """
+    Background thread draining the email outbox over one kept-alive SMTP
+    connection. Every app worker runs one.
+    """
+    global _thread
+    if _thread and _thread.is_alive():
+        return
+
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="email-dispatcher", daemon=True)
+    _thread.start()
+
+
+def stop_email_dispatcher():
+    _stop.set()
+    _wake.set()
@@ -0,0 +1,226 @@
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+from fastapi import HTTPException
+from sqlalchemy import func, tuple_
+from starlette.concurrency import run_in_threadpool
+
+from app.db.session import session_scope
+from app.models.payment import PaymentSession
+from app.services.payment_sessions import fail_payment_session, finalize_payment_session
+from app.utils.phonepe import PaymentGatewayError, get_payment_gateway
+
+RECONCILE_INTERVAL_SECONDS = 60
+
+# INITIATED sessions older than this are polled (the callback is late)
+STALE_AFTER = timedelta(minutes=10)
+
+# Still pending at PhonePe after this long: give up and expire
+EXPIRE_AFTER = timedelta(hours=1)
+
+BATCH_SIZE = 100
+MAX_CONCURRENT_STATUS_CHECKS = 10
+
+# PhonePe status codes that end a payment without money moving
+FAILED_CODES = {
+    "PAYMENT_ERROR",
+    "PAYMENT_DECLINED",
+    "TIMED_OUT",
+    "AUTHORIZATION_FAILED",
+    "TRANSACTION_NOT_FOUND",
+}
+
+_task = None
+
+_metrics = {
+    "runs": 0,
+    "checked": 0,
+    "finalized": 0,
+    "failed": 0,
+    "expired": 0,
+    "pending": 0,
+    "gateway_errors": 0,
+    "errors": 0,
+    "last_run_at": None,
+    "last_run_seconds": 0.0,
+    "last_run_throughput": 0.0,   # sessions checked per second
+    "lag_seconds": 0.0,           # age of the oldest INITIATED session
+}
+
+
+def reconciler_metrics() -> dict:
+    return dict(_metrics)
+
+
+def _stale_batch(after, cutoff: datetime):
+    """
+    Next BATCH_SIZE stale sessions, oldest first, by the
+    (status, created_at) index. `after` is the (created_at, id) keyset of
+    the previous batch, so pending sessions are not rescanned.
+    """
+    with session_scope() as db:
+        query = (
+            db.query(
+                PaymentSession.id,
+                PaymentSession.transaction_id,
+                PaymentSession.created_at,
+            )
+            .filter(
+                PaymentSession.status == "INITIATED",
+                PaymentSession.created_at < cutoff,
+            )
+        )
+
+        if after is not None:
+            query = query.filter(
+                tuple_(PaymentSession.created_at, PaymentSession.id) > after
+            )
+
+        return (
+            query
+            .order_by(PaymentSession.created_at, PaymentSession.id)
+            .limit(BATCH_SIZE)
+            .all()
+        )
+
+
+def _oldest_initiated():
+    with session_scope() as db:
+        return db.query(func.min(PaymentSession.created_at)).filter(
+            PaymentSession.status == "INITIATED"
+        ).scalar()
+
+
+def _apply_status(row, data: dict, now: datetime) -> str:
+    """
+    Settles one session from its PhonePe status through the same path as
+    the callback. Returns the outcome for the metrics.
+    """
+    code = data.get("code")
+
+    with session_scope() as db:
+        if code == "PAYMENT_SUCCESS":
+            try:
+                finalize_payment_session(db, row.transaction_id)
+            except HTTPException:
+                # paid but the order could not be created; recorded as FAILED
+                return "failed"
+            return "finalized"
+
+        if code in FAILED_CODES:
+            fail_payment_session(db, row.id, f"Payment {code}")
+            return "failed"
+
+        if now - row.created_at > EXPIRE_AFTER:
+            fail_payment_session(db, row.id, "Payment session expired", status="EXPIRED")
+            return "expired"
+
+        return "pending"
+
+
+async def _reconcile_session(gateway, semaphore: asyncio.Semaphore, row, now: datetime) -> str:
+    async with semaphore:
+        try:
+            data = await gateway.check_status(row.transaction_id)
+        except PaymentGatewayError as e:
+            print(f"Status check failed for {row.transaction_id}: {e}")
+            return "gateway_errors"
+
+    try:
+        return await run_in_threadpool(_apply_status, row, data, now)
+    except Exception as e:
+        print(f"Reconciling {row.transaction_id} failed: {e}")
+        return "errors"
+
+
+async def reconcile_once() -> dict:
+    """
+    Polls PhonePe for every stale INITIATED session, in batches, with at
+    most MAX_CONCURRENT_STATUS_CHECKS status calls in flight. Returns the
+    outcome counts of this run.
+
+    Several app workers may poll the same session; finalizing is claimed
+    with a conditional UPDATE, so only one of them creates the order.
+    """
+    started = time.monotonic()
+    now = datetime.now(timezone.utc)
+    cutoff = now - STALE_AFTER
+
+    gateway = get_payment_gateway()
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_STATUS_CHECKS)
+
+    counts = {"checked": 0, "finalized": 0, "failed": 0, "expired": 0, "pending": 0, "gateway_errors": 0, "errors": 0}
+
+    oldest = await run_in_threadpool(_oldest_initiated)
+
+    after = None
+    while True:
+        rows = await run_in_threadpool(_stale_batch, after, cutoff)
+        if not rows:
+            break
+
+        outcomes = await asyncio.gather(*[
+            _reconcile_session(gateway, semaphore, row, now) for row in rows
+        ])
+
+        counts["checked"] += len(rows)
+        for outcome in outcomes:
+            counts[outcome] += 1
+
+        if len(rows) < BATCH_SIZE:
+            break
+        after = (rows[-1].created_at, rows[-1].id)
+
+    elapsed = time.monotonic() - started
+
+    # 📈 metrics
+    _metrics["runs"] += 1
+    for key, value in counts.items():
+        _metrics[key] += value
+    _metrics["last_run_at"] = now.isoformat()
+    _metrics["last_run_seconds"] = round(elapsed, 3)
+    _metrics["last_run_throughput"] = round(counts["checked"] / elapsed, 2) if elapsed else 0.0
+    _metrics["lag_seconds"] = round((now - oldest).total_seconds(), 1) if oldest else 0.0
+
+    if counts["checked"]:
+        print(
+            f"Payment reconciliation: {counts} in {elapsed:.2f}s "
+            f"({_metrics['last_run_throughput']}/s), lag {_metrics['lag_seconds']}s"
+        )
+
+    return counts
+
+
+async def _run():
+    while True:
+        await asyncio.sleep(RECONCILE_INTERVAL_SECONDS)
+        try:
+            await reconcile_once()
+        except Exception as e:
+            print(f"Payment reconciliation failed: {e}")
+
+
+def start_payment_reconciler():
+    """
+    Background task on the app's event loop, so status checks share the
+    pooled gateway client. DB work runs in the threadpool.
+    """
+    global _task
+    if _task and not _task.done():
+        return
+
+    _task = asyncio.get_running_loop().create_task(_run())
+
+
+async def stop_payment_reconciler():
+    global _task
+    if _task is None:
+        return
+
+    _task.cancel()
+    try:
+        await _task
+    except asyncio.CancelledError:
+        pass
+    _task = None
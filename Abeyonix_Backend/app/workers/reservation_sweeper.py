@@ -0,0 +1,43 @@
+import threading
+
+from app.db.session import session_scope
+from app.services.inventory import release_expired_holds
+
+SWEEP_INTERVAL_SECONDS = 60
+
+_stop = threading.Event()
+_thread = None
+
+
+def sweep_once() -> int:
+    try:
+        with session_scope() as db:
+            return release_expired_holds(db)
+    except Exception as e:
+        print(f"Reservation sweep failed: {e}")
+        return 0
+
+
+def _run():
+    while not _stop.wait(SWEEP_INTERVAL_SECONDS):
+        released = sweep_once()
+        if released:
+            print(f"Released {released} expired stock reservations")
+
+
+def start_reservation_sweeper():
+    """
+    Background thread releasing expired stock holds. Every app worker runs
+    one; they split the work through SKIP LOCKED.
+    """
+    global _thread
+    if _thread and _thread.is_alive():
+        return
+
+    _stop.clear()
+    _thread = threading.Thread(target=_run, name="reservation-sweeper", daemon=True)
+    _thread.start()
+
+
+def stop_reservation_sweeper():
+    _stop.set()
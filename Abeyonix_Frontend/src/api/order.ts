@@ -5,7 +5,8 @@ import {
   InitiatePaymentResponse, 
   PlaceOrderRequest, 
   PlaceOrderResponse ,
-  UserOrderListResponse 
+  UserOrderListResponse,
+  AdminOrderSearchResponse
 } from "@/types/order";
 
 
@@ -44,12 +45,29 @@ export const placeOrder = async (
 
 
 
+/**
+ * User order history, newest first, one page at a time
+ * - pass the previous response's next_cursor to get the next page
+ * - expand: "items", "tracking" or "items,tracking"
+ */
 export const getUserOrders = async (
-  userId: number
+  userId: number,
+  params?: {
+    cursor?: string | null;
+    limit?: number;
+    expand?: string;
+  }
 ): Promise<UserOrderListResponse> => {
   try {
     const response = await api.get<UserOrderListResponse>(
-      `/orders/user/${userId}`
+      `/orders/user/${userId}`,
+      {
+        params: {
+          limit: params?.limit || 20,
+          ...(params?.cursor && { cursor: params.cursor }),
+          ...(params?.expand && { expand: params.expand }),
+        },
+      }
     )
 
     return response.data
@@ -84,6 +102,30 @@ export const getAdminOrders = async (params?: {
 };
 
 
+export const searchAdminOrders = async (params: {
+  q: string;
+  cursor?: string | null;
+  limit?: number;
+}): Promise<AdminOrderSearchResponse> => {
+  try {
+    const response = await api.get<AdminOrderSearchResponse>(
+      "/orders/admin/search",
+      {
+        params: {
+          q: params.q,
+          limit: params.limit || 20,
+          ...(params.cursor && { cursor: params.cursor }),
+        },
+      }
+    );
+
+    return response.data;
+  } catch (error: any) {
+    throw error?.response?.data?.detail || "Failed to search orders";
+  }
+};
+
+
 
 
 export const updateOrderTracking = async (payload: {
@@ -107,6 +149,31 @@ export const updateOrderTracking = async (payload: {
   }
 };
 
+
+// events apply in order; if any is invalid nothing is saved
+export const updateOrderTrackingBatch = async (
+  events: {
+    order_id: number;
+    status: string;
+    description?: string;
+    location?: string;
+  }[]
+): Promise<any> => {
+  try {
+    const response = await api.post(
+      "/orders/update-tracking/batch",
+      { events }
+    );
+
+    return response.data;
+  } catch (error: any) {
+    throw (
+      error?.response?.data?.detail ||
+      "Failed to update order tracking"
+    );
+  }
+};
+
 // --------------------------------------------------------
 
 
@@ -11,6 +11,16 @@ export const getProductById = async (
   return data;
 };
 
+export const getProductBySlug = async (
+  slug: string
+): Promise<ProductDetailResponse> => {
+  const { data } = await api.get<ProductDetailResponse>(
+    `/products/by-slug/${encodeURIComponent(slug)}`
+  );
+
+  return data;
+};
+
 
 
 
@@ -78,6 +88,39 @@ export const createProduct = async (
 
 
 
+export interface ProductImportResponse {
+  message: string;
+  total_rows: number;
+  imported: number;
+  failed: number;
+  errors: { row: number; errors: string[] }[];
+}
+
+export const importProducts = async (
+  file: File
+): Promise<ProductImportResponse> => {
+  try {
+    const formData = new FormData();
+    formData.append("file", file);
+
+    const response = await api.post<ProductImportResponse>(
+      "/products/import",
+      formData,
+      {
+        headers: {
+          "Content-Type": "multipart/form-data",
+        },
+      }
+    );
+
+    return response.data;
+  } catch (error: any) {
+    throw error?.response?.data?.detail || "Failed to import products";
+  }
+};
+
+
+
 
 export const getProducts = async (params?: {
   category_id?: number;
@@ -222,4 +265,22 @@ export const updateProductStatus = async (
       "Failed to update product status"
     );
   }
-};
\ No newline at end of file
+};
+
+
+export const exportProducts = async (params?: {
+  format?: "csv" | "xlsx" | "ndjson";
+  is_active?: boolean;
+  category_id?: number;
+}): Promise<Blob> => {
+  try {
+    const response = await api.get("/products/export", {
+      params,
+      responseType: "blob",
+    });
+
+    return response.data;
+  } catch (error: any) {
+    throw error?.response?.data?.detail || "Failed to export products";
+  }
+};
@@ -60,6 +60,8 @@ const Account = () => {
     useState<UserAddressResponse | null>(null);
   const [orders, setOrders] = useState<UserOrderWithItems[]>([]);
   const [loadingOrders, setLoadingOrders] = useState(false);
+  const [ordersCursor, setOrdersCursor] = useState<string | null>(null);
+  const [loadingMoreOrders, setLoadingMoreOrders] = useState(false);
   const [selectedOrder, setSelectedOrder] = useState<UserOrderWithItems | null>(
     null,
   );
@@ -200,19 +202,33 @@ const Account = () => {
 
     setLoadingOrders(true);
 
-    getUserOrders(user.user_id)
+    // Newest first from backend, one page at a time
+    getUserOrders(user.user_id, { expand: "items,tracking" })
       .then((res) => {
-        // Already sorted DESC from backend, but safe:
-        const sorted = res.orders.sort(
-          (a, b) =>
-            new Date(b.created_at).getTime() - new Date(a.created_at).getTime(),
-        );
-
-        setOrders(sorted);
+        setOrders(res.orders);
+        setOrdersCursor(res.next_cursor);
       })
       .finally(() => setLoadingOrders(false));
   }, [user?.user_id]);
 
+  const loadMoreOrders = async () => {
+    if (!user?.user_id || !ordersCursor) return;
+
+    setLoadingMoreOrders(true);
+
+    try {
+      const res = await getUserOrders(user.user_id, {
+        cursor: ordersCursor,
+        expand: "items,tracking",
+      });
+
+      setOrders((prev) => [...prev, ...res.orders]);
+      setOrdersCursor(res.next_cursor);
+    } finally {
+      setLoadingMoreOrders(false);
+    }
+  };
+
   const toggleSection = (section: Section) => {
     setActiveSection((prev) => (prev === section ? null : section));
   };
@@ -483,6 +499,16 @@ const Account = () => {
                     </div>
                   </div>
                 ))}
+
+                {ordersCursor && (
+                  <button
+                    onClick={loadMoreOrders}
+                    disabled={loadingMoreOrders}
+                    className="w-full py-2 border rounded-lg text-sm font-medium hover:bg-gray-50 transition disabled:opacity-50"
+                  >
+                    {loadingMoreOrders ? "Loading..." : "Load more orders"}
+                  </button>
+                )}
               </div>
             )}
 
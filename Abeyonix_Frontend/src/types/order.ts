@@ -89,6 +89,14 @@ export interface UserOrderWithItems {
 export interface UserOrderListResponse {
   total_orders: number
   orders: UserOrderWithItems[]
+  next_cursor: string | null
+  has_more: boolean
+}
+
+export interface AdminOrderSearchResponse {
+  orders: UserOrderWithItems[]
+  next_cursor: string | null
+  has_more: boolean
 }
 // ----------------------------------------
 